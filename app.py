@@ -1,21 +1,27 @@
 import os
 import sys
+import atexit
+import json
 import logging
 import tempfile  # Importar módulo para directorios temporales
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request
 
 # Configuración de paths
 BASE_DIR = Path(__file__).resolve().parent
 sys.path.append(str(BASE_DIR / 'backend'))
 
 # Importaciones del backend
-from backend.database import DBManager, Article
-from backend.scraper import ContentScraper
-from backend.organizers import ContentOrganizer
+from backend.config import EDUCATIONAL_STRUCTURE, SELECTORS, JANITOR_CONFIG, METRICS_CONFIG
+from backend.jobs import JobStore, JobQueue
+from backend.pipeline import run_generation
+from backend.browser_pool import get_browser_pool
+from backend.book_cache import BookCache
+from backend.janitor import Janitor
 from backend.generators import BookGenerator
-from backend.config import EDUCATIONAL_STRUCTURE, SELECTORS
+from backend.metrics import render_metrics
 
 # Inicialización de Flask
 app = Flask(__name__,
@@ -40,16 +46,42 @@ logger.info(f"Template folder: {app.template_folder}")
 app.config.update({
     'SECRET_KEY': os.getenv('SECRET_KEY', 'dev-key-123'),
     'DATABASE_DIR': str(BASE_DIR / 'backend/user_dbs'),
+    'CORPUS_DB_NAME': 'corpus.db',  # Corpus de artículos compartido entre trabajos
     'UPLOAD_FOLDER': str(BASE_DIR / 'frontend/static/books'),
-    'MAX_CONTENT_AGE': timedelta(hours=24),
-    'MAX_CONTENT_LENGTH': 15 * 1024 * 1024  # 15MB
+    'BOOK_CACHE_SUBDIR': 'cache',  # Libros direccionados por contenido, dentro de UPLOAD_FOLDER
+    'MAX_CONTENT_AGE': timedelta(seconds=JANITOR_CONFIG['pdf_ttl']),  # PDFs sin usar, borrados por el Janitor
+    'MAX_CONTENT_LENGTH': 15 * 1024 * 1024,  # 15MB
+    'JOBS_DIR': str(BASE_DIR / 'backend/job_states'),
+    'JOB_WORKERS': int(os.getenv('JOB_WORKERS', '2')),
+    'JOB_EXECUTOR': os.getenv('JOB_EXECUTOR', 'thread'),  # 'thread' o 'process'
+    'SSE_RETRY_MS': int(os.getenv('SSE_RETRY_MS', '1500'))  # Reconexión del EventSource entre entregas
 })
 
+# Cola de trabajos (se crea de forma perezosa, después del fork de gunicorn)
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """Obtener la cola de trabajos del proceso actual"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            ensure_directories()
+            _job_queue = JobQueue(
+                JobStore(app.config['JOBS_DIR']),
+                max_workers=app.config['JOB_WORKERS'],
+                mode=app.config['JOB_EXECUTOR']
+            )
+            # Sin esto un pool de procesos mantiene vivo el proceso al terminar
+            atexit.register(_job_queue.shutdown)
+        return _job_queue
+
 def setup_directories():
     """Crear directorios necesarios"""
     required_dirs = [
         app.config['DATABASE_DIR'],
         app.config['UPLOAD_FOLDER'],
+        app.config['JOBS_DIR'],
         BASE_DIR / 'frontend/static/css',
         BASE_DIR / 'frontend/templates'
     ]
@@ -71,19 +103,38 @@ def setup_directories():
             logger.error(f"Error creando directorio {directory}: {str(e)}")
             raise
 
-def clean_old_files():
-    """Limpiar archivos antiguos"""
-    now = datetime.now()
-    try:
-        for filename in os.listdir(app.config['UPLOAD_FOLDER']):
-            file_path = Path(app.config['UPLOAD_FOLDER']) / filename
-            if file_path.is_file():
-                file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                if (now - file_time) > app.config['MAX_CONTENT_AGE']:
-                    file_path.unlink()
-                    logger.info(f"Archivo eliminado: {filename}")
-    except Exception as e:
-        logger.error(f"Error limpiando archivos: {str(e)}")
+_directories_ready = False
+_directories_lock = threading.Lock()
+
+def ensure_directories():
+    """Crear los directorios una vez por proceso (no en cada petición)"""
+    global _directories_ready
+    with _directories_lock:
+        if not _directories_ready:
+            setup_directories()
+            _directories_ready = True
+
+# Mantenimiento de archivos en segundo plano (un hilo por proceso, coordinados con flock)
+_janitor = None
+_janitor_lock = threading.Lock()
+
+def get_janitor():
+    """Obtener el Janitor del proceso actual, arrancándolo la primera vez"""
+    global _janitor
+    with _janitor_lock:
+        if _janitor is None:
+            ensure_directories()
+            _janitor = Janitor(
+                books_dir=app.config['UPLOAD_FOLDER'],
+                book_cache_dir=Path(app.config['UPLOAD_FOLDER']) / app.config['BOOK_CACHE_SUBDIR'],
+                db_dir=app.config['DATABASE_DIR'],
+                jobs_dir=app.config['JOBS_DIR'],
+                corpus_db_name=app.config['CORPUS_DB_NAME'],
+                pdf_ttl=app.config['MAX_CONTENT_AGE'].total_seconds()
+            )
+            if JANITOR_CONFIG['enabled']:
+                _janitor.start()
+        return _janitor
 
 # Rutas principales
 @app.route('/')
@@ -97,13 +148,22 @@ def home():
 
 @app.route('/health')
 def health_check():
-    return jsonify({"status": "ok", "timestamp": datetime.now().isoformat()})
+    return jsonify({
+        "status": "ok",
+        "timestamp": datetime.now().isoformat(),
+        "browser_pool": get_browser_pool().stats(),
+        "janitor": get_janitor().stats()
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Métricas del proceso en formato de texto de Prometheus"""
+    if not METRICS_CONFIG['enabled']:
+        return jsonify({'error': 'Métricas desactivadas'}), 404
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
 
 @app.route('/generate', methods=['POST'])
 def generate_book():
-    setup_directories()
-    clean_old_files()
-    
     try:
         data = request.get_json()
         if not data:
@@ -113,42 +173,85 @@ def generate_book():
         if not blog_url or not isinstance(blog_url, str):
             return jsonify({'error': 'URL inválida'}), 400
 
-        session_id = os.urandom(16).hex()
-        db_path = Path(app.config['DATABASE_DIR']) / f'{session_id}.db'
-        output_file = Path(app.config['UPLOAD_FOLDER']) / f'book_{session_id}.pdf'
+        queue = get_job_queue()
+        get_janitor()
+        job = queue.store.create(url=blog_url)
+        session_id = job['id']
+        db_path = Path(app.config['DATABASE_DIR']) / app.config['CORPUS_DB_NAME']
+        book_cache = BookCache(
+            Path(app.config['UPLOAD_FOLDER']) / app.config['BOOK_CACHE_SUBDIR'],
+            render_version=BookGenerator.render_signature()
+        )
 
-        # Proceso de generación
-        with DBManager(str(db_path)) as db:
-            scraper = ContentScraper(db)
-            
-            logger.info(f"🚀 Iniciando scraping en: {blog_url}")
-            if not scraper.scrape(blog_url):
-                logger.error("❌ Error durante el scraping. No se pudo obtener contenido.")
-                return jsonify({'error': 'No se encontraron artículos en el blog o el scraping falló.'}), 404
-
-            articles = db.get_all_articles()
-            if not articles:
-                logger.warning("⚠️ No se encontraron artículos en el blog.")
-                return jsonify({'error': 'No se encontraron artículos en el blog proporcionado'}), 404
-
-            organizer = ContentOrganizer(articles)
-            book_structure = organizer.structure_content()
-
-            generator = BookGenerator(str(output_file))
-            if generator.generate_book(book_structure):
-                logger.info(f"✅ Libro generado exitosamente: {output_file}")
-                return jsonify({
-                    'download_url': f"/static/books/book_{session_id}.pdf",
-                    'filename': f'Libro_{datetime.now().strftime("%Y%m%d")}.pdf'
-                })
-
-        logger.error("❌ Error generando el libro PDF.")
-        return jsonify({'error': 'Error generando el libro PDF'}), 500
+        queue.submit(
+            session_id, run_generation,
+            blog_url, str(db_path), book_cache,
+            f"/static/books/{app.config['BOOK_CACHE_SUBDIR']}"
+        )
+        logger.info(f"📋 Trabajo {session_id} encolado para: {blog_url}")
+        return jsonify({
+            'job_id': session_id,
+            'status_url': f"/jobs/{session_id}",
+            'events_url': f"/jobs/{session_id}/events",
+            'state': job['state']
+        }), 202
 
     except Exception as e:
         logger.error(f"Error en generación: {str(e)}", exc_info=True)
         return jsonify({'error': 'Error interno del servidor'}), 500
 
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = get_job_queue().store.get(job_id)
+    if not job:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+
+    response = {
+        'job_id': job['id'],
+        'state': job['state'],
+        'created_at': job.get('created_at'),
+        'updated_at': job.get('updated_at')
+    }
+    if job['state'] == 'done':
+        response['download_url'] = job.get('download_url')
+        response['filename'] = f'Libro_{job["created_at"][:10].replace("-", "")}.pdf'
+    elif job['state'] == 'failed':
+        response['error'] = job.get('error')
+    # Desglose de tiempos por etapa, a petición (?timings=1)
+    if request.args.get('timings') in ('1', 'true') and job.get('timings'):
+        response['timings'] = job['timings']
+    return jsonify(response)
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Progreso del trabajo como Server-Sent Events.
+
+    Cada respuesta entrega los eventos pendientes y se cierra: el navegador
+    vuelve a conectar tras `retry` enviando Last-Event-ID, así que ningún
+    worker queda ocupado por cada cliente mientras el trabajo avanza.
+    """
+    store = get_job_queue().store
+    # El estado se lee antes que los eventos: si ya había terminado, su evento final está en el registro
+    job = store.get(job_id)
+    if not job:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or '0'
+    try:
+        after = int(last_event_id)
+    except ValueError:
+        after = 0
+
+    chunks = [f"retry: {app.config['SSE_RETRY_MS']}\n\n"]
+    for event_id, event in store.events(job_id, after):
+        chunks.append(f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n")
+    if job['state'] in ('done', 'failed'):
+        chunks.append("event: end\ndata: {}\n\n")  # El cliente cierra el EventSource
+    return Response(''.join(chunks), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/test-static')
 def test_static():
     try:
@@ -0,0 +1,65 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+from backend.config import EDUCATIONAL_STRUCTURE
+
+logger = logging.getLogger(__name__)
+
+
+class BookCache:
+    """Caché de PDFs direccionada por contenido.
+
+    La clave es un hash de la estructura organizada (hash del contenido de cada
+    artículo, orden de capítulos y secciones) más la versión de estilos/config,
+    así que un mismo conjunto de artículos nunca se vuelve a renderizar.
+    La fecha de modificación de cada PDF se usa como reloj LRU: se actualiza en
+    cada acierto, lo que funciona igual entre varios procesos. La expulsión por
+    antigüedad y por espacio la hace el Janitor en segundo plano.
+    """
+
+    def __init__(self, directory, render_version=1):
+        self.directory = Path(directory)
+        self.render_version = render_version
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key_for(self, structure) -> str:
+        """Hash estable de la estructura del libro y de la configuración de render"""
+        digest = hashlib.sha256()
+        digest.update(f'render:{self.render_version}\n'.encode('utf-8'))
+        digest.update(json.dumps(EDUCATIONAL_STRUCTURE, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        for chapter_title, sections in structure.items():
+            digest.update(f'\nchapter:{chapter_title}\n'.encode('utf-8'))
+            for section_name in sorted(sections):
+                digest.update(f'section:{section_name}\n'.encode('utf-8'))
+                for item in sections[section_name]:
+                    item_json = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+                    digest.update(hashlib.sha256(item_json.encode('utf-8')).digest())
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f'book_{key}.pdf'
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """PDF ya generado para esta clave, marcándolo como usado recientemente"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        logger.info(f"📚 Libro servido desde caché: {path.name}")
+        return path
+
+    def temp_path_for(self, key: str) -> Path:
+        """Ruta temporal donde renderizar antes de publicar el PDF con `commit`"""
+        return self.directory / f'.book_{key}.{os.getpid()}.{threading.get_ident()}.tmp.pdf'
+
+    def commit(self, key: str, temp_path) -> Path:
+        """Publicar de forma atómica un PDF recién generado"""
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        return path
@@ -0,0 +1,157 @@
+import time
+import atexit
+import logging
+import threading
+import contextlib
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+
+from backend.config import BROWSER_POOL_CONFIG
+
+try:
+    import psutil
+except ImportError:  # Opcional: sin psutil solo se recicla por número de páginas
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+def create_chrome_driver():
+    """Chrome headless configurado como fallback para sitios con JavaScript"""
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    driver = webdriver.Chrome(options=options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+class _PooledBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+
+class BrowserPool:
+    """Pool de navegadores headless compartido por todo el proceso.
+
+    Limita cuántos Chrome hay vivos a la vez, los presta a los scrapers y los
+    recicla tras `max_pages` páginas o si superan `max_memory_mb` de RSS.
+    """
+
+    def __init__(self, size=2, max_pages=50, max_memory_mb=1024, factory=create_chrome_driver):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.factory = factory
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._in_use = 0
+        self._counters = {'created': 0, 'recycled': 0, 'leases': 0, 'pages': 0, 'errors': 0}
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        """Prestar un navegador; se devuelve al pool al salir del bloque"""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No hay navegadores libres en el pool")
+        browser = None
+        try:
+            with self._lock:
+                browser = self._idle.pop() if self._idle else None
+                self._in_use += 1
+                self._counters['leases'] += 1
+            if browser is None:
+                browser = _PooledBrowser(self.factory())
+                with self._lock:
+                    self._counters['created'] += 1
+                logger.info("🌐 Nuevo navegador headless en el pool")
+            
+            yield browser.driver
+        except TimeoutException:
+            # La página no cargó a tiempo, pero el navegador sigue sano
+            raise
+        except Exception:
+            # Un navegador que ha fallado puede quedar en mal estado: no se reutiliza
+            if browser is not None:
+                self._quit(browser)
+                with self._lock:
+                    self._counters['errors'] += 1
+                browser = None
+            raise
+        finally:
+            if browser is not None:
+                browser.pages += 1
+                with self._lock:
+                    self._counters['pages'] += 1
+                if self._should_recycle(browser):
+                    self._quit(browser)
+                    with self._lock:
+                        self._counters['recycled'] += 1
+                else:
+                    with self._lock:
+                        self._idle.append(browser)
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def _should_recycle(self, browser):
+        if self.max_pages and browser.pages >= self.max_pages:
+            return True
+        if self.max_memory_mb and psutil is not None:
+            return self._memory_mb(browser) > self.max_memory_mb
+        return False
+
+    @staticmethod
+    def _memory_mb(browser):
+        """RSS del chromedriver y todos sus procesos hijos (Chrome, renderers)"""
+        try:
+            process = psutil.Process(browser.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    @staticmethod
+    def _quit(browser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error cerrando navegador: {str(e)}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'max_pages': self.max_pages,
+                'max_memory_mb': self.max_memory_mb,
+                **self._counters
+            }
+
+    def shutdown(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._quit(browser)
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def get_browser_pool():
+    """Pool de navegadores del proceso (los navegadores se crean bajo demanda)"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(
+                size=BROWSER_POOL_CONFIG['size'],
+                max_pages=BROWSER_POOL_CONFIG['max_pages'],
+                max_memory_mb=BROWSER_POOL_CONFIG['max_memory_mb']
+            )
+            atexit.register(_shared_pool.shutdown)
+        return _shared_pool
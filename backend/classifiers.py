@@ -0,0 +1,90 @@
+import pickle
+import logging
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from backend.config import CLASSIFIER_KEYWORDS, CLASSIFIER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordClassifier:
+    """Clasificador vectorizado por matriz de palabras clave.
+
+    Cada texto se convierte en conteos de las palabras clave (una sola pasada
+    de CountVectorizer para todo el lote) y se puntúa contra cada etiqueta con
+    un producto de matrices.
+    """
+
+    def __init__(self, keywords=CLASSIFIER_KEYWORDS,
+                 default_category=CLASSIFIER_CONFIG['default_category'],
+                 default_level=CLASSIFIER_CONFIG['default_level']):
+        self.defaults = {'category': default_category, 'level': default_level}
+        self.labels = {task: list(groups) for task, groups in keywords.items()}
+        vocabulary = sorted({term.lower() for groups in keywords.values()
+                             for terms in groups.values() for term in terms})
+        index = {term: position for position, term in enumerate(vocabulary)}
+        
+        self.vectorizer = CountVectorizer(
+            vocabulary=vocabulary,
+            ngram_range=(1, max(len(term.split()) for term in vocabulary)),
+            token_pattern=r'(?u)\b\w+\b',
+            lowercase=True
+        )
+        # Matriz términos x etiquetas de cada tarea
+        self.weights = {}
+        for task, groups in keywords.items():
+            matrix = np.zeros((len(vocabulary), len(groups)), dtype=np.float32)
+            for column, terms in enumerate(groups.values()):
+                for term in terms:
+                    matrix[index[term.lower()], column] = 1.0
+            self.weights[task] = matrix
+
+    def predict(self, texts: List[str]) -> Tuple[List[str], List[str]]:
+        """Categorías y niveles de todo el lote en una sola pasada"""
+        if not texts:
+            return [], []
+        counts = self.vectorizer.transform(texts).astype(np.float32)
+        counts.data = 1.0 + np.log(counts.data)  # Frecuencia sublineal
+        
+        results = {}
+        for task, matrix in self.weights.items():
+            scores = np.asarray(counts @ matrix)
+            best = scores.argmax(axis=1)
+            labels = self.labels[task]
+            results[task] = [labels[column] if scores[row, column] > 0 else self.defaults[task]
+                             for row, column in enumerate(best)]
+        return results['category'], results['level']
+
+
+@lru_cache(maxsize=1)
+def get_classifier():
+    """Clasificador del worker, cargado una sola vez"""
+    model_path = CLASSIFIER_CONFIG['model_path']
+    if model_path:
+        try:
+            with open(model_path, 'rb') as fh:
+                model = pickle.load(fh)
+            logger.info(f"🧠 Modelo de clasificación cargado: {model_path}")
+            return model
+        except Exception as e:
+            logger.error(f"Error cargando modelo de clasificación {model_path}: {str(e)}")
+    return KeywordClassifier()
+
+
+def classify_articles(articles: List[dict]) -> List[dict]:
+    """Rellenar 'category' y 'level' de un lote de artículos (in situ)"""
+    pending = [article for article in articles if not (article.get('category') and article.get('level'))]
+    if not pending:
+        return articles
+    texts = [f"{article.get('title', '')}\n{article.get('content', '')}" for article in pending]
+    categories, levels = get_classifier().predict(texts)
+    for article, category, level in zip(pending, categories, levels):
+        article.setdefault('category', None)
+        article.setdefault('level', None)
+        article['category'] = article['category'] or category
+        article['level'] = article['level'] or level
+    return articles
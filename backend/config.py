@@ -1,3 +1,8 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
 SELECTORS = {
     'articles': [
         'article', 'div.post', '.post', '.entry', '.blog-post', '.post-item',
@@ -88,4 +93,181 @@ EDUCATIONAL_STRUCTURE = {
         "questions_per_chapter": 3,
         "question_types": ["selección múltiple", "verdadero/falso", "relacionar columnas"]
     }
-}
\ No newline at end of file
+}
+
+# Configuración del scraper (ajustable por variables de entorno)
+SCRAPER_CONFIG = {
+    # Peticiones simultáneas en total por scraper
+    "max_workers": int(os.getenv("SCRAPER_MAX_WORKERS", "4")),
+    # Peticiones simultáneas contra un mismo host
+    "max_per_host": int(os.getenv("SCRAPER_MAX_PER_HOST", "2")),
+    # Reintentos de una petición a la que el servidor respondió 429/503
+    "max_retries": int(os.getenv("SCRAPER_MAX_RETRIES", "2")),
+    # En un re-crawl, volver a pedir (GET condicional) los artículos sin lastmod en sitemap/feed
+    # y comparar el hash del contenido; con 0 se reutilizan sin comprobar si cambiaron
+    "revalidate_without_lastmod": os.getenv("SCRAPER_REVALIDATE", "1") == "1",
+}
+
+# Ritmo de peticiones por host (cubo de tokens adaptativo, compartido en el proceso)
+RATE_LIMIT_CONFIG = {
+    # 0 = sin límite (p. ej. en benchmarks contra un servidor local)
+    "enabled": os.getenv("RATE_LIMIT_ENABLED", "1") == "1",
+    # Peticiones/s iniciales si robots.txt no indica Crawl-delay, y límites del ajuste
+    "default_rate": float(os.getenv("RATE_LIMIT_DEFAULT_RATE", "1")),
+    "max_rate": float(os.getenv("RATE_LIMIT_MAX_RATE", "5")),
+    "min_rate": float(os.getenv("RATE_LIMIT_MIN_RATE", "0.05")),
+    # Peticiones seguidas que se permiten tras un rato sin actividad
+    "burst": float(os.getenv("RATE_LIMIT_BURST", "2")),
+    # AIMD: +increase pet/s por respuesta sana, ×decrease en cada 429/503
+    "increase": float(os.getenv("RATE_LIMIT_INCREASE", "0.2")),
+    "decrease": 0.5,
+    # Retroceso exponencial (segundos) ante 429/503, acotado también para Retry-After
+    "backoff_base": float(os.getenv("RATE_LIMIT_BACKOFF_BASE", "2")),
+    "max_backoff": float(os.getenv("RATE_LIMIT_MAX_BACKOFF", "120")),
+    # Segundos durante los que se reutiliza el Crawl-delay leído de robots.txt
+    "robots_ttl": int(os.getenv("RATE_LIMIT_ROBOTS_TTL", "3600")),
+}
+
+# Caché HTTP persistente del scraper
+HTTP_CACHE_CONFIG = {
+    "enabled": os.getenv("HTTP_CACHE_ENABLED", "1") == "1",
+    "path": os.getenv("HTTP_CACHE_PATH", str(BASE_DIR / "cache" / "http_cache.db")),
+    # Segundos durante los que una respuesta se sirve sin revalidar
+    "ttl": int(os.getenv("HTTP_CACHE_TTL", "3600")),
+    "max_bytes": int(os.getenv("HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024,
+}
+
+# Corpus de artículos
+DB_CONFIG = {
+    # Artículos por transacción en las inserciones en bloque
+    "chunk_size": int(os.getenv("DB_CHUNK_SIZE", "100")),
+}
+
+# Memoria por dominio (estrategia de descarga que funcionó, etc.)
+DOMAIN_MEMORY_CONFIG = {
+    "path": os.getenv("DOMAIN_MEMORY_PATH", str(BASE_DIR / "cache" / "domains.json")),
+}
+
+# Pool de navegadores headless para el fallback de Selenium
+BROWSER_POOL_CONFIG = {
+    "size": int(os.getenv("BROWSER_POOL_SIZE", "2")),
+    # Reciclar cada navegador tras N páginas o al superar este RSS
+    "max_pages": int(os.getenv("BROWSER_MAX_PAGES", "50")),
+    "max_memory_mb": int(os.getenv("BROWSER_MAX_MEMORY_MB", "1024")),
+}
+
+# Parser HTML: 'auto' (lxml si está instalado), 'lxml', 'html5lib' o 'html.parser'
+PARSER_CONFIG = {
+    "backend": os.getenv("HTML_PARSER", "auto"),
+}
+
+# Mantenimiento en segundo plano de PDFs, bases de datos de sesión y estados de trabajos
+JANITOR_CONFIG = {
+    "enabled": os.getenv("JANITOR_ENABLED", "1") == "1",
+    # Segundos entre barridos
+    "interval": int(os.getenv("JANITOR_INTERVAL", "600")),
+    # Antigüedad máxima (segundos desde el último uso) de cada tipo de archivo
+    "pdf_ttl": int(os.getenv("JANITOR_PDF_TTL", str(24 * 3600))),
+    "session_db_ttl": int(os.getenv("JANITOR_SESSION_DB_TTL", str(24 * 3600))),
+    "job_ttl": int(os.getenv("JANITOR_JOB_TTL", str(48 * 3600))),
+    # Restos de renders o escrituras interrumpidas (PDFs .tmp, directorios book_parts_*)
+    "temp_ttl": int(os.getenv("JANITOR_TEMP_TTL", "3600")),
+    # Espacio total para PDFs y bases de sesión; por encima se borra lo usado hace más tiempo (LRU)
+    "disk_budget": int(os.getenv("JANITOR_DISK_BUDGET_MB", "1024")) * 1024 * 1024,
+}
+
+# Generación de PDF
+GENERATOR_CONFIG = {
+    # 'single': un único doc.build; 'parallel': un proceso por capítulo y unión final
+    "render_mode": os.getenv("RENDER_MODE", "single"),
+    # Procesos para el modo paralelo (0 = número de CPUs)
+    "render_workers": int(os.getenv("RENDER_WORKERS", "0")),
+    # Índice de capítulos (solo en modo paralelo)
+    "toc": os.getenv("RENDER_TOC", "1") == "1",
+    # Longitud máxima de cada párrafo maquetado (los artículos se trocean)
+    "max_paragraph_chars": int(os.getenv("RENDER_MAX_PARAGRAPH_CHARS", "1500")),
+}
+
+# Palabras clave para clasificar artículos (categoría y nivel) en bloque
+CLASSIFIER_KEYWORDS = {
+    "category": {
+        "teoría": [
+            "concepto", "conceptos", "definición", "definiciones", "principio", "principios",
+            "fundamentos", "teoría", "qué es", "por qué", "historia", "características",
+            "tipos de", "funciona", "ciclo", "introducción", "significa"
+        ],
+        "práctica": [
+            "paso a paso", "cómo", "tutorial", "guía", "ejemplo", "ejemplos", "ejercicio",
+            "ejercicios", "demostración", "instrucciones", "materiales", "necesitas",
+            "primero", "después", "truco", "trucos", "consejos", "hazlo"
+        ],
+        "caso_real": [
+            "caso", "casos", "caso de estudio", "experiencia", "resultados", "análisis",
+            "implementación", "contexto", "nuestro", "mi huerto", "proyecto", "testimonio",
+            "cosechamos", "aprendimos", "diario"
+        ],
+    },
+    "level": {
+        "básico": [
+            "principiantes", "básico", "básicos", "fácil", "sencillo", "empezar", "primeros pasos",
+            "introducción", "iniciación", "novato", "desde cero"
+        ],
+        "intermedio": [
+            "mejorar", "optimizar", "técnica", "técnicas", "control", "problemas comunes",
+            "mantenimiento", "planificación", "intermedio"
+        ],
+        "experto": [
+            "avanzado", "avanzada", "avanzadas", "experto", "profesional", "hidroponía", "conductividad",
+            "ph", "genética", "optimización", "automatización", "sensor", "sensores", "rendimiento"
+        ],
+    },
+}
+
+CLASSIFIER_CONFIG = {
+    # Modelo entrenado opcional (pickle con predict(textos) -> (categorías, niveles))
+    "model_path": os.getenv("CLASSIFIER_MODEL_PATH", ""),
+    "default_category": "teoría",
+    "default_level": "básico",
+}
+
+# Organización en capítulos
+ORGANIZER_CONFIG = {
+    # 'auto': agrupar por temas si los artículos no traen capítulo; 'cluster' siempre; 'chapter' nunca
+    "mode": os.getenv("ORGANIZER_MODE", "auto"),
+    "min_articles_to_cluster": 6,
+    "max_chapters": int(os.getenv("ORGANIZER_MAX_CHAPTERS", "12")),
+    "terms_per_chapter_title": 3,
+}
+
+# Palabras vacías en español para nombrar capítulos por sus términos principales
+SPANISH_STOP_WORDS = [
+    "a", "al", "algo", "algunas", "algunos", "ante", "antes", "como", "con", "contra", "cual", "cuando",
+    "de", "del", "desde", "donde", "durante", "e", "el", "ella", "ellas", "ellos", "en", "entre", "era",
+    "es", "esa", "esas", "ese", "eso", "esos", "esta", "estas", "este", "esto", "estos", "fue", "ha",
+    "hay", "la", "las", "le", "les", "lo", "los", "más", "mas", "me", "mi", "mis", "muy", "nada", "ni",
+    "no", "nos", "o", "otra", "otras", "otro", "otros", "para", "pero", "poco", "por", "porque", "que",
+    "qué", "se", "ser", "si", "sí", "sin", "sobre", "son", "su", "sus", "también", "tan", "te", "tiene",
+    "todo", "todos", "tu", "tus", "un", "una", "uno", "unos", "y", "ya", "yo", "puede", "pueden", "hacer",
+    "así", "cada", "bien", "solo", "sólo", "tener", "vez", "dos", "hasta", "les", "está", "están"
+]
+
+# Deduplicación de artículos casi idénticos y de párrafos repetidos (menús, pies, barras laterales)
+DEDUP_CONFIG = {
+    "enabled": os.getenv("DEDUP_ENABLED", "1") == "1",
+    # Similitud de Jaccard estimada (MinHash) a partir de la cual dos artículos son el mismo
+    "similarity": float(os.getenv("DEDUP_SIMILARITY", "0.85")),
+    "num_perm": 64,
+    "bands": 16,
+    "shingle_size": 5,
+    # Un párrafo es repetitivo si aparece en esta fracción de las páginas del dominio...
+    "boilerplate_ratio": float(os.getenv("DEDUP_BOILERPLATE_RATIO", "0.5")),
+    # ...y en al menos este número de páginas
+    "boilerplate_min_pages": 3,
+    # Distancia de Hamming máxima entre SimHash de párrafos equivalentes
+    "simhash_distance": 3,
+}
+
+# Métricas internas (/metrics en formato Prometheus y desglose de tiempos por trabajo)
+METRICS_CONFIG = {
+    "enabled": os.getenv("METRICS_ENABLED", "1") == "1",
+}
@@ -1,12 +1,22 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Index, Enum
+from sqlalchemy import create_engine, event, select, func, Column, Integer, String, Text, DateTime, Index, Enum, ForeignKey
 from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
 import contextlib
 import logging
+from urllib.parse import urlsplit
+
+from backend.config import DB_CONFIG
+from backend.utils import normalize_url, content_hash
 
 logger = logging.getLogger(__name__)
 Base = declarative_base()
 
+# Columnas que necesita el organizador de capítulos
+ORGANIZER_COLUMNS = ('id', 'title', 'content', 'category', 'chapter')
+# Contenido que guarda el scraper cuando no pudo extraer el texto de una página
+PLACEHOLDER_CONTENT = "Contenido no disponible"
+
 class Article(Base):
     __tablename__ = 'articles'
     id = Column(Integer, primary_key=True)
@@ -17,19 +27,49 @@ class Article(Base):
     category = Column(Enum('teoría', 'práctica', 'caso_real', name='category_types'))
     level = Column(Enum('básico', 'intermedio', 'experto', name='level_types'))
     chapter = Column(String(50))
+    content_hash = Column(String(64))
 
     __table_args__ = (
         Index('ix_url', 'url'),
         Index('ix_chapter_level', 'chapter', 'level'),
+        Index('ix_content_hash', 'content_hash'),
     )
 
+class JobArticle(Base):
+    """Artículos del corpus compartido que usa cada libro generado"""
+    __tablename__ = 'job_articles'
+    job_id = Column(String(32), primary_key=True)
+    article_id = Column(Integer, ForeignKey('articles.id', ondelete='CASCADE'), primary_key=True)
+
+class CrawlState(Base):
+    """Estado del último crawl de cada blog para re-crawls incrementales"""
+    __tablename__ = 'crawl_state'
+    blog = Column(String(2000), primary_key=True)
+    url = Column(String(2000), primary_key=True)
+    article_id = Column(Integer, ForeignKey('articles.id', ondelete='SET NULL'))
+    content_hash = Column(String(64))
+    lastmod = Column(DateTime)
+    last_seen = Column(DateTime)
+    last_fetched = Column(DateTime)
+
 class DBManager:
-    def __init__(self, db_path):
+    def __init__(self, db_path, chunk_size=None):
         self.db_path = db_path
+        self.chunk_size = max(1, chunk_size or DB_CONFIG['chunk_size'])
         self.engine = create_engine(f'sqlite:///{db_path}', connect_args={'timeout': 15})
+        event.listen(self.engine, 'connect', self._configure_sqlite)
         self.Session = scoped_session(sessionmaker(bind=self.engine))
         self._create_tables()
     
+    @staticmethod
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # WAL permite lectores concurrentes mientras otro worker escribe
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA busy_timeout=15000')
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+    
     def _create_tables(self):
         try:
             Base.metadata.create_all(self.engine)
@@ -56,24 +96,224 @@ class DBManager:
             self.Session.remove()
     
     def article_exists(self, url):
-        return self.session.query(Article).filter_by(url=url).first() is not None
+        return self.find_article_id(url) is not None
+    
+    def find_article_id(self, url):
+        """ID del artículo del corpus con esta URL (normalizada), o None"""
+        return self.existing_article_ids([url]).get(url)
+    
+    def existing_article_ids(self, urls):
+        """Comprobar en bloque qué URLs ya están en el corpus: {url: id}"""
+        normalized = {}
+        for url in urls:
+            normalized.setdefault(normalize_url(url), []).append(url)
+        
+        found = {}
+        keys = list(normalized)
+        # Trocear el IN para respetar el límite de variables de SQLite
+        for start in range(0, len(keys), 500):
+            rows = self.session.execute(
+                select(Article.url, Article.id).where(Article.url.in_(keys[start:start + 500]))
+            )
+            for url, article_id in rows:
+                for original in normalized[url]:
+                    found[original] = article_id
+        return found
     
     def save_article(self, article_data):
-        try:
-            article = Article(
-                title=article_data['title'][:500],
-                content=article_data['content'],
-                url=article_data['url'],
-                date=article_data.get('date'),
-                category=article_data.get('category'),
-                level=article_data.get('level'),
-                chapter=article_data.get('chapter')
+        """Guardar un artículo en el corpus compartido y devolver su ID"""
+        return self.bulk_upsert_articles([article_data])[0]
+    
+    def bulk_upsert_articles(self, articles, chunk_size=None):
+        """Insertar o actualizar artículos en bloque, confirmando cada `chunk_size` filas.
+
+        Devuelve los IDs en el mismo orden que `articles` (None si el bloque falló).
+        Un contenido ya presente bajo otra URL del mismo sitio reutiliza el artículo existente.
+        Confirmar por bloques conserva el trabajo hecho si el proceso cae y evita
+        bloquear a los demás escritores durante todo el scraping.
+        """
+        chunk_size = max(1, chunk_size or self.chunk_size)
+        ids = []
+        for start in range(0, len(articles), chunk_size):
+            chunk = articles[start:start + chunk_size]
+            for attempt in range(2):
+                try:
+                    ids.extend(self._upsert_chunk(chunk))
+                    break
+                except (IntegrityError, OperationalError) as e:
+                    # Carrera con otro worker: reintentar una vez tras el rollback
+                    self.session.rollback()
+                    if attempt:
+                        logger.error(f"Error guardando bloque de artículos: {str(e)}")
+                        ids.extend([None] * len(chunk))
+                except Exception as e:
+                    self.session.rollback()
+                    logger.error(f"Error guardando bloque de artículos: {str(e)}")
+                    ids.extend([None] * len(chunk))
+                    break
+        return ids
+    
+    def _upsert_chunk(self, chunk):
+        rows = {}
+        for article_data in chunk:
+            url = normalize_url(article_data['url'])
+            rows[url] = {
+                'title': article_data['title'][:500],
+                'content': article_data['content'],
+                'url': url,
+                'date': article_data.get('date'),
+                'category': article_data.get('category'),
+                'level': article_data.get('level'),
+                'chapter': article_data.get('chapter'),
+                'content_hash': content_hash(article_data['content'])
+            }
+        
+        # Contenido idéntico publicado bajo otra URL del mismo sitio: reutilizar el artículo existente.
+        # Nunca entre sitios distintos ni para páginas sin contenido (todas comparten el texto de relleno)
+        reusable = {row['content_hash'] for row in rows.values()
+                    if row['content'].strip() and row['content'].strip() != PLACEHOLDER_CONTENT}
+        by_hash = {}  # (host, hash) -> artículo
+        for row_hash, article_id, url in self.session.execute(
+            select(Article.content_hash, Article.id, Article.url)
+            .where(Article.content_hash.in_(reusable))
+            .order_by(Article.id)
+        ):
+            by_hash.setdefault((urlsplit(url).netloc, row_hash), article_id)
+        by_url = dict(self.session.execute(
+            select(Article.url, Article.id).where(Article.url.in_(list(rows)))
+        ).all())
+
+        def shared(url):
+            """Artículo de este sitio con el mismo contenido, o None"""
+            row_hash = rows[url]['content_hash']
+            return by_hash.get((urlsplit(url).netloc, row_hash)) if row_hash in reusable else None
+
+        to_write = [row for url, row in rows.items() if url in by_url or not shared(url)]
+        
+        if to_write:
+            stmt = sqlite_insert(Article)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Article.url],
+                set_={column: stmt.excluded[column]
+                      for column in ('title', 'content', 'date', 'category', 'level', 'chapter', 'content_hash')}
             )
-            self.session.add(article)
-            return True
-        except Exception as e:
-            logger.error(f"Error guardando artículo: {str(e)}")
-            return False
+            self.session.execute(stmt, to_write)
+            by_url.update(self.session.execute(
+                select(Article.url, Article.id).where(Article.url.in_([row['url'] for row in to_write]))
+            ).all())
+        self.session.commit()
+        
+        return [by_url.get(url) or shared(url) for url in (normalize_url(a['url']) for a in chunk)]
+    
+    def link_job_articles(self, job_id, article_ids):
+        """Registrar qué artículos del corpus usa un trabajo"""
+        try:
+            known = {row[0] for row in self.session.query(JobArticle.article_id).filter_by(job_id=job_id)}
+            for article_id in dict.fromkeys(article_ids):
+                if article_id not in known:
+                    self.session.add(JobArticle(job_id=job_id, article_id=article_id))
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Error enlazando artículos del trabajo {job_id}: {str(e)}")
+            raise
+    
+    def get_job_articles(self, job_id):
+        try:
+            return (self.session.query(Article)
+                    .join(JobArticle, JobArticle.article_id == Article.id)
+                    .filter(JobArticle.job_id == job_id)
+                    .order_by(Article.id)
+                    .all())
+        except SQLAlchemyError as e:
+            logger.error(f"Error obteniendo artículos del trabajo {job_id}: {str(e)}")
+            return []
+    
+    def unlink_jobs(self, job_ids):
+        """Olvidar qué artículos usaban trabajos ya purgados (el corpus se conserva)"""
+        job_ids = list(job_ids)
+        try:
+            removed = 0
+            for start in range(0, len(job_ids), 500):
+                removed += self.session.query(JobArticle).filter(
+                    JobArticle.job_id.in_(job_ids[start:start + 500])
+                ).delete(synchronize_session=False)
+            self.session.commit()
+            return removed
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Error desenlazando trabajos purgados: {str(e)}")
+            return 0
+    
+    def count_job_articles(self, job_id):
+        try:
+            return self.session.execute(
+                select(func.count()).select_from(JobArticle).where(JobArticle.job_id == job_id)
+            ).scalar_one()
+        except SQLAlchemyError as e:
+            logger.error(f"Error contando artículos del trabajo {job_id}: {str(e)}")
+            return 0
+    
+    def iter_job_articles(self, job_id, columns=ORGANIZER_COLUMNS, batch_size=None):
+        """Artículos de un trabajo como filas ligeras (solo `columns`), leídas por lotes.
+
+        A diferencia de get_job_articles no se cargan objetos ORM ni el resultado
+        completo: el cursor se recorre de `batch_size` en `batch_size` filas.
+        """
+        stmt = (select(*(getattr(Article, column) for column in columns))
+                .join(JobArticle, JobArticle.article_id == Article.id)
+                .where(JobArticle.job_id == job_id)
+                .order_by(Article.id)
+                .execution_options(yield_per=batch_size or self.chunk_size))
+        try:
+            yield from self.session.execute(stmt)
+        except SQLAlchemyError as e:
+            logger.error(f"Error leyendo artículos del trabajo {job_id}: {str(e)}")
+    
+    def iter_articles(self, article_ids, columns=('id', 'url', 'title', 'content')):
+        """Filas ligeras (solo `columns`) de los artículos con estos IDs"""
+        article_ids = list(dict.fromkeys(article_ids))
+        try:
+            for start in range(0, len(article_ids), 500):
+                yield from self.session.execute(
+                    select(*(getattr(Article, column) for column in columns))
+                    .where(Article.id.in_(article_ids[start:start + 500]))
+                )
+        except SQLAlchemyError as e:
+            logger.error(f"Error leyendo artículos del corpus: {str(e)}")
+    
+    def get_crawl_state(self, blog):
+        """Estado conocido de un blog: {url normalizada: CrawlState}"""
+        try:
+            rows = self.session.query(CrawlState).filter_by(blog=normalize_url(blog))
+            return {row.url: row for row in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Error leyendo estado de crawl de {blog}: {str(e)}")
+            return {}
+    
+    def update_crawl_state(self, blog, entries):
+        """Insertar o actualizar en bloque el estado de las URLs vistas en un crawl.
+
+        Cada entrada es un dict con 'url' y cualquiera de: article_id, content_hash,
+        lastmod, last_seen, last_fetched. Los campos ausentes conservan su valor.
+        """
+        blog = normalize_url(blog)
+        try:
+            for start in range(0, len(entries), self.chunk_size):
+                for entry in entries[start:start + self.chunk_size]:
+                    values = {key: value for key, value in entry.items() if value is not None}
+                    values['url'] = normalize_url(entry['url'])
+                    stmt = sqlite_insert(CrawlState).values(blog=blog, **values)
+                    updates = {key: stmt.excluded[key] for key in values if key != 'url'}
+                    if updates:
+                        stmt = stmt.on_conflict_do_update(index_elements=['blog', 'url'], set_=updates)
+                    else:
+                        stmt = stmt.on_conflict_do_nothing()
+                    self.session.execute(stmt)
+                self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Error guardando estado de crawl de {blog}: {str(e)}")
     
     def get_all_articles(self):
         try:
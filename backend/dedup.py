@@ -0,0 +1,207 @@
+import re
+import zlib
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+from backend.config import DEDUP_CONFIG
+from backend.utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'\w+')
+_DIGITS_RE = re.compile(r'\d+')
+_SIMHASH_BANDS = 4  # 4 bandas de 16 bits: distancia <= 3 implica una banda idéntica
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def simhash(text: str) -> int:
+    """Huella SimHash de 64 bits (bigramas de palabras; números normalizados).
+
+    Textos casi iguales ("© 2023" / "© 2024", un enlace distinto) quedan a
+    pocos bits de distancia.
+    """
+    tokens = _tokens(_DIGITS_RE.sub('0', text))
+    features = [' '.join(pair) for pair in zip(tokens, tokens[1:])] or tokens or ['']
+    hashes = np.array([int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+                       for feature in features], dtype=np.uint64)
+    bits = (hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    votes = (2 * bits.astype(np.int64) - 1).sum(axis=0)
+    return sum(1 << int(position) for position in np.flatnonzero(votes > 0))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class MinHasher:
+    """Firmas MinHash sobre shingles de palabras, vectorizadas con numpy"""
+
+    def __init__(self, num_perm: int = DEDUP_CONFIG['num_perm'],
+                 shingle_size: int = DEDUP_CONFIG['shingle_size'], seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # Multiply-shift: (a * x + b) mod 2^64 (el desbordamiento de uint64) y los 32 bits altos.
+        # Con a impar aleatorio cada permutación es independiente de las demás
+        self.a = rng.randint(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.randint(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)
+        self.shingle_size = shingle_size
+
+    def signature(self, text: str) -> np.ndarray:
+        tokens = _tokens(text)
+        size = self.shingle_size
+        shingles = {' '.join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((hashes[:, None] * self.a + self.b) >> np.uint64(32)).min(axis=0)
+
+
+class _ParagraphIndex:
+    """Párrafos de un dominio agrupados por SimHash, con el número de páginas en que aparece cada uno"""
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self.fingerprints = []  # id de grupo -> SimHash representativo
+        self.page_counts = []  # id de grupo -> páginas en las que aparece
+        self.pages = 0
+        self.boilerplate = set()  # Grupos ya identificados como repetitivos (en este crawl o en anteriores)
+        self._buckets = [defaultdict(list) for _ in range(_SIMHASH_BANDS)]
+
+    def _group(self, fingerprint: int) -> int:
+        keys = [(fingerprint >> (16 * band)) & 0xFFFF for band in range(_SIMHASH_BANDS)]
+        for band, key in enumerate(keys):
+            for group in self._buckets[band].get(key, ()):
+                if hamming(fingerprint, self.fingerprints[group]) <= self.max_distance:
+                    return group
+        group = len(self.fingerprints)
+        self.fingerprints.append(fingerprint)
+        self.page_counts.append(0)
+        for band, key in enumerate(keys):
+            self._buckets[band][key].append(group)
+        return group
+
+    def add_page(self, paragraphs: List[str]) -> List[int]:
+        """Registrar los párrafos de una página; devuelve el grupo de cada uno"""
+        groups = [self._group(simhash(paragraph)) for paragraph in paragraphs]
+        for group in set(groups):
+            self.page_counts[group] += 1
+        self.pages += 1
+        return groups
+
+
+class Deduplicator:
+    """Deduplicación de los artículos de un crawl antes de guardarlos.
+
+    1. Párrafos repetitivos: los que aparecen (casi iguales, por SimHash) en la
+       mayoría de las páginas de un dominio se eliminan del contenido.
+    2. Artículos casi duplicados: firmas MinHash con LSH por bandas; si la
+       similitud estimada supera el umbral se conserva solo el primero.
+
+    El estado se acumula entre lotes, así que los lotes posteriores se comparan
+    también con lo ya guardado en el mismo crawl. En un re-crawl, `seed` carga
+    los artículos guardados del blog y `learn_boilerplate` los párrafos
+    repetitivos de crawls anteriores (que ya no están en lo guardado).
+    """
+
+    def __init__(self, config: dict = DEDUP_CONFIG):
+        self.config = config
+        self.minhash = MinHasher(config['num_perm'], config['shingle_size'])
+        self.rows = config['num_perm'] // config['bands']
+        self._paragraphs = defaultdict(lambda: _ParagraphIndex(config['simhash_distance']))
+        self._signatures = []
+        self._urls = []
+        self._stored = {}  # URL normalizada -> posición de la versión guardada (cargada con `seed`)
+        self._buckets = [defaultdict(list) for _ in range(config['bands'])]
+        self.stripped_paragraphs = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def _split(content: str) -> List[str]:
+        return [line.strip() for line in (content or '').split('\n') if line.strip()]
+
+    def seed(self, articles: Iterable[Tuple[str, str, str]]):
+        """Registrar artículos ya guardados (url, título, contenido) sin modificarlos"""
+        for url, title, content in articles:
+            self._paragraphs[urlparse(url).netloc.lower()].add_page(self._split(content))
+            self._stored[normalize_url(url)] = len(self._signatures)
+            self._add(url, self.minhash.signature(f"{title or ''}\n{content or ''}"))
+
+    def learn_boilerplate(self, domain: str, fingerprints: Iterable[int]):
+        """Párrafos repetitivos de un dominio identificados en crawls anteriores"""
+        index = self._paragraphs[domain]
+        index.boilerplate.update(index._group(fingerprint) for fingerprint in fingerprints)
+
+    def boilerplate(self) -> Dict[str, List[int]]:
+        """{dominio: SimHash de sus párrafos repetitivos}, para recordarlos en el próximo crawl"""
+        return {domain: sorted(index.fingerprints[group] for group in index.boilerplate)
+                for domain, index in self._paragraphs.items() if index.boilerplate}
+
+    def _strip_boilerplate(self, articles: List[dict]):
+        """Quitar del contenido los párrafos que se repiten en la mayoría de páginas del dominio"""
+        pages = []
+        for article in articles:
+            index = self._paragraphs[urlparse(article['url']).netloc.lower()]
+            paragraphs = self._split(article.get('content'))
+            pages.append((index, paragraphs, index.add_page(paragraphs)))
+
+        for article, (index, paragraphs, groups) in zip(articles, pages):
+            if index.pages >= self.config['boilerplate_min_pages']:
+                threshold = max(self.config['boilerplate_min_pages'], self.config['boilerplate_ratio'] * index.pages)
+                index.boilerplate.update(group for group in groups if index.page_counts[group] >= threshold)
+            kept = [paragraph for paragraph, group in zip(paragraphs, groups) if group not in index.boilerplate]
+            # Si todo el texto es repetitivo se deja como estaba
+            if kept and len(kept) < len(paragraphs):
+                self.stripped_paragraphs += len(paragraphs) - len(kept)
+                article['content'] = '\n'.join(kept)
+
+    def _find_duplicate(self, url: str, signature: np.ndarray):
+        """URL del artículo ya visto casi idéntico a esta firma, o None.
+
+        La versión guardada de la misma URL (artículo editado) no cuenta como duplicado.
+        """
+        candidates = set()
+        for band, bucket in enumerate(self._buckets):
+            candidates.update(bucket.get(signature[band * self.rows:(band + 1) * self.rows].tobytes(), ()))
+        candidates.discard(self._stored.get(normalize_url(url)))
+        for candidate in sorted(candidates):
+            if np.mean(self._signatures[candidate] == signature) >= self.config['similarity']:
+                return self._urls[candidate]
+        return None
+
+    def _add(self, url: str, signature: np.ndarray):
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        self._urls.append(url)
+        for band, bucket in enumerate(self._buckets):
+            bucket[signature[band * self.rows:(band + 1) * self.rows].tobytes()].append(position)
+
+    def process(self, articles: List[dict]) -> Tuple[List[dict], Dict[str, str]]:
+        """Limpiar un lote de artículos.
+
+        Devuelve los artículos a guardar (con el contenido ya limpio) y
+        {url descartada: url del artículo equivalente que se conserva}.
+        """
+        self._strip_boilerplate(articles)
+
+        # Entre duplicados del lote se prefiere la URL sin parámetros y más corta
+        order = sorted(range(len(articles)), key=lambda i: (bool(urlparse(articles[i]['url']).query),
+                                                            len(articles[i]['url'])))
+        duplicates = {}
+        for i in order:
+            article = articles[i]
+            signature = self.minhash.signature(f"{article.get('title') or ''}\n{article.get('content') or ''}")
+            original = self._find_duplicate(article['url'], signature)
+            if original:
+                duplicates[article['url']] = original
+                logger.info(f"♻️ Artículo casi duplicado descartado: {article['url']} (igual que {original})")
+            else:
+                self._add(article['url'], signature)
+
+        self.duplicates += len(duplicates)
+        return [article for article in articles if article['url'] not in duplicates], duplicates
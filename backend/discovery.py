@@ -0,0 +1,218 @@
+import io
+import re
+import logging
+import posixpath
+from collections import namedtuple
+from datetime import datetime
+from typing import Callable, List, Optional
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import iterparse, ParseError
+
+from backend.utils import parse_date
+
+logger = logging.getLogger(__name__)
+
+DiscoveredURL = namedtuple('DiscoveredURL', ['url', 'lastmod'])
+
+# Rutas por defecto, solo si robots.txt / la portada no anuncian nada (cada intento es una petición)
+SITEMAP_PATHS = ('/sitemap.xml',)
+FEED_PATHS = ('/feed',)
+FEED_TYPES = ('application/rss+xml', 'application/atom+xml')
+# Sitemaps hijos que no contienen entradas de blog (WordPress, Yoast, Rank Math, ...), por las
+# palabras del nombre del archivo: page-sitemap.xml, post_tag-sitemap.xml, wp-sitemap-users-1.xml...
+SKIPPED_SITEMAPS = {'page', 'category', 'tag', 'author', 'taxonomies', 'users', 'attachment'}
+POST_SITEMAPS = {'post', 'posts'}
+_NAME_SPLIT_RE = re.compile(r'[-_.]+')
+MAX_CHILD_SITEMAPS = 20
+# Segmentos de ruta de páginas que no son artículos (archivos, páginas fijas, tienda...)
+NON_ARTICLE_SEGMENTS = {
+    'tag', 'tags', 'etiqueta', 'etiquetas', 'category', 'categoria', 'categorias', 'author', 'autor',
+    'page', 'pagina', 'search', 'buscar', 'feed', 'comments', 'wp-content', 'wp-json', 'wp-admin',
+    'about', 'about-us', 'acerca', 'acerca-de', 'sobre', 'sobre-mi', 'sobre-nosotros', 'quienes-somos',
+    'contact', 'contacto', 'privacy', 'privacy-policy', 'privacidad', 'politica-de-privacidad',
+    'aviso-legal', 'legal', 'terms', 'terminos', 'cookies', 'politica-de-cookies',
+    'shop', 'tienda', 'cart', 'carrito', 'checkout', 'login', 'account', 'mi-cuenta',
+}
+NON_ARTICLE_EXTENSIONS = ('.xml', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.pdf', '.zip', '.mp3', '.mp4')
+
+
+def _local(tag: str) -> str:
+    """Nombre del elemento sin el espacio de nombres XML"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """Fechas ISO 8601 (sitemaps, Atom) o RFC 822 (RSS), normalizadas a UTC sin zona"""
+    return parse_date(value.strip()) if value else None
+
+
+def _sitemap_words(url: str) -> set:
+    """Palabras del nombre de archivo de un sitemap (sin el host ni los directorios)"""
+    return set(_NAME_SPLIT_RE.split(posixpath.basename(urlparse(url).path.rstrip('/')).lower()))
+
+
+def is_article_url(url: str) -> bool:
+    """Heurística para las URLs de un sitemap: descarta archivos de etiquetas,
+    categorías, autores y paginación, páginas fijas (contacto, aviso legal...) y adjuntos"""
+    path = urlparse(url).path.lower()
+    if path.endswith(NON_ARTICLE_EXTENSIONS):
+        return False
+    return not any(segment in NON_ARTICLE_SEGMENTS for segment in path.split('/') if segment)
+
+
+def iter_sitemap(document: bytes):
+    """Recorrer un sitemap ya descargado de forma incremental: ('sitemap'|'url', loc, lastmod).
+
+    Cada entrada se descarta del árbol en cuanto se procesa, así que la memoria
+    del parseo no crece con el número de entradas (el documento sí está entero en memoria).
+    Solo cuentan <loc>/<lastmod> hijos directos de la entrada y del espacio de nombres
+    del sitemap: las extensiones (<image:loc>, <video:...>) se ignoran.
+    """
+    loc = lastmod = root = None
+    namespace = ''
+    depth = 0  # Nivel del elemento en curso (la raíz es el 1)
+    for event, elem in iterparse(io.BytesIO(document), events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if root is None:
+                root = elem
+                namespace = elem.tag[:len(elem.tag) - len(_local(elem.tag))]
+            continue
+        level, depth = depth, depth - 1
+        name = _local(elem.tag)
+        if level == 3 and elem.tag == namespace + 'loc':
+            loc = (elem.text or '').strip()
+        elif level == 3 and elem.tag == namespace + 'lastmod':
+            lastmod = parse_feed_date(elem.text)
+        elif level == 2 and name in ('url', 'sitemap'):
+            if loc:
+                yield name, loc, lastmod
+            loc = lastmod = None
+            root.clear()  # Soltar las entradas ya procesadas (urlset/sitemapindex son planos)
+
+
+def iter_feed(document: bytes):
+    """Recorrer un feed RSS o Atom ya descargado de forma incremental: (link, fecha)"""
+    link = date = None
+    for event, elem in iterparse(io.BytesIO(document), events=('start', 'end')):
+        name = _local(elem.tag)
+        if event == 'start':
+            if name in ('item', 'entry'):
+                link = date = None  # Ignorar el <link> del propio canal
+            continue
+        if name == 'link':
+            href = elem.get('href')
+            if href and elem.get('rel', 'alternate') == 'alternate':
+                link = href  # Atom
+            elif not href and elem.text:
+                link = elem.text.strip()  # RSS
+        elif name in ('pubDate', 'published', 'updated', 'date') and date is None:
+            date = parse_feed_date(elem.text)
+        elif name in ('item', 'entry'):
+            if link:
+                yield link, date
+            link = date = None
+            elem.clear()
+
+
+class ArticleDiscovery:
+    """Descubrir artículos por sitemaps y feeds antes de recorrer la paginación HTML"""
+
+    def __init__(self, fetch: Callable[[str], Optional[bytes]], max_articles: int = 50):
+        self.fetch = fetch
+        self.max_articles = max_articles
+
+    def discover(self, base_url: str, get_homepage: Optional[Callable] = None) -> List[DiscoveredURL]:
+        """Artículos del blog más recientes primero; lista vacía si no hay sitemap ni feed"""
+        origin = '{0.scheme}://{0.netloc}'.format(urlparse(base_url))
+        
+        for sitemap_url in self._sitemap_candidates(origin):
+            found = self._from_sitemap(sitemap_url, base_url)
+            if found:
+                logger.info(f"🗺️ {len(found)} artículos descubiertos en {sitemap_url}")
+                return found
+        
+        for feed_url in self._feed_candidates(origin, base_url, get_homepage):
+            found = self._from_feed(feed_url, base_url)
+            if found:
+                logger.info(f"📡 {len(found)} artículos descubiertos en {feed_url}")
+                return found
+        
+        return []
+
+    def _sitemap_candidates(self, origin):
+        candidates = []
+        robots = self.fetch(f'{origin}/robots.txt')
+        if robots:
+            for line in robots.decode('utf-8', errors='replace').splitlines():
+                key, _, value = line.partition(':')
+                if key.strip().lower() == 'sitemap' and value.strip():
+                    candidates.append(value.strip())
+        if not candidates:
+            candidates = [origin + path for path in SITEMAP_PATHS]
+        return list(dict.fromkeys(candidates))
+
+    def _feed_candidates(self, origin, base_url, get_homepage):
+        candidates = []
+        soup = get_homepage() if get_homepage else None
+        if soup is not None:
+            for link in soup.select('link[rel="alternate"][href]'):
+                if link.get('type') in FEED_TYPES:
+                    candidates.append(urljoin(base_url, link['href']))
+        if not candidates:
+            base = base_url if base_url.endswith('/') else base_url + '/'
+            candidates = [urljoin(base, path.lstrip('/')) for path in FEED_PATHS]
+            candidates += [origin + path for path in FEED_PATHS]
+        return list(dict.fromkeys(candidates))
+
+    def _from_sitemap(self, sitemap_url, base_url):
+        found = {}
+        pending = [sitemap_url]
+        visited = 0
+        while pending and visited < MAX_CHILD_SITEMAPS:
+            url = pending.pop(0)
+            visited += 1
+            document = self.fetch(url)
+            if not document:
+                continue
+            children = []
+            try:
+                for kind, loc, lastmod in iter_sitemap(document):
+                    if kind == 'sitemap':
+                        if not _sitemap_words(loc) & SKIPPED_SITEMAPS:
+                            children.append(loc)
+                    elif self._in_scope(loc, base_url) and is_article_url(loc):
+                        found[loc] = lastmod
+            except ParseError as e:
+                logger.debug(f"Sitemap inválido {url}: {str(e)}")
+            # Si el índice tiene sitemaps de entradas (post-sitemap.xml, wp-sitemap-posts-post-1.xml), solo esos
+            posts = [loc for loc in children if _sitemap_words(loc) & POST_SITEMAPS]
+            pending.extend(posts or children)
+        return self._newest_first(found)
+
+    def _from_feed(self, feed_url, base_url):
+        document = self.fetch(feed_url)
+        if not document:
+            return []
+        found = {}
+        try:
+            for link, date in iter_feed(document):
+                if self._in_scope(link, base_url):
+                    found[link] = date
+        except ParseError as e:
+            logger.debug(f"Feed inválido {feed_url}: {str(e)}")
+        return self._newest_first(found)
+
+    @staticmethod
+    def _in_scope(url, base_url):
+        """Misma web y dentro de la ruta del blog, sin contar la propia portada"""
+        candidate, base = urlparse(url), urlparse(base_url)
+        if candidate.netloc.lower().removeprefix('www.') != base.netloc.lower().removeprefix('www.'):
+            return False
+        base_path = base.path.rstrip('/') + '/'
+        return candidate.path.startswith(base_path) and candidate.path.rstrip('/') != base.path.rstrip('/')
+
+    def _newest_first(self, found):
+        entries = [DiscoveredURL(url, lastmod) for url, lastmod in found.items()]
+        entries.sort(key=lambda entry: entry.lastmod or datetime.min, reverse=True)
+        return entries[:self.max_articles]
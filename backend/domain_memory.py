@@ -0,0 +1,83 @@
+import os
+import json
+import logging
+import threading
+
+from backend.config import DOMAIN_MEMORY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class DomainMemory:
+    """Memoria persistente por dominio (estrategia de descarga, selectores, ...).
+
+    Se guarda en un JSON compartido; los cambios de otros procesos se recargan
+    cuando cambia la fecha de modificación del archivo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        self._mtime = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _reload(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as fh:
+                self._data = json.load(fh)
+            self._mtime = mtime
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error leyendo memoria de dominios: {str(e)}")
+
+    def _save(self):
+        tmp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                json.dump(self._data, fh, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            logger.error(f"Error guardando memoria de dominios: {str(e)}")
+
+    def get(self, domain, key, default=None):
+        with self._lock:
+            self._reload()
+            return self._data.get(domain, {}).get(key, default)
+
+    def set(self, domain, key, value):
+        with self._lock:
+            self._reload()
+            entry = self._data.setdefault(domain, {})
+            if entry.get(key) == value:
+                return
+            entry[key] = value
+            self._save()
+
+    def set_item(self, domain, key, item, value):
+        """Actualizar una entrada de un diccionario guardado bajo `key`"""
+        with self._lock:
+            self._reload()
+            mapping = self._data.setdefault(domain, {}).setdefault(key, {})
+            if mapping.get(item) == value:
+                return
+            mapping[item] = value
+            self._save()
+
+
+_shared_memory = None
+_shared_memory_lock = threading.Lock()
+
+def get_domain_memory():
+    """Memoria de dominios compartida del proceso"""
+    global _shared_memory
+    with _shared_memory_lock:
+        if _shared_memory is None:
+            _shared_memory = DomainMemory(DOMAIN_MEMORY_CONFIG['path'])
+        return _shared_memory
@@ -0,0 +1,259 @@
+import re
+import json
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+from typing import Dict, List
+
+import soupsieve
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from backend.parsing import make_soup
+
+# Resultado de extraer un artículo: selector ganador de cada campo en `selectors`
+Extraction = namedtuple('Extraction', ['title', 'paragraphs', 'date', 'selectors'])
+
+# Campos leídos de metadatos estructurados y fuente de cada campo ('json-ld', 'microdata', 'opengraph')
+Metadata = namedtuple('Metadata', ['title', 'paragraphs', 'date', 'sources'])
+
+EXTRACTED_FIELDS = ('title', 'content', 'date')
+
+# Tipos schema.org de una entrada de blog
+ARTICLE_TYPES = frozenset({
+    'Article', 'BlogPosting', 'NewsArticle', 'TechArticle', 'Report',
+    'ScholarlyArticle', 'SocialMediaPosting', 'LiveBlogPosting', 'HowTo', 'Recipe'
+})
+# Metaetiquetas (property/name) por campo, en orden de preferencia
+META_TITLE = ('og:title', 'twitter:title')
+META_DATE = ('article:published_time', 'og:article:published_time', 'datepublished',
+             'date', 'dc.date.issued', 'dc.date', 'parsely-pub-date', 'sailthru.date')
+# Un articleBody más corto suele ser un resumen: el contenido se busca con selectores
+MIN_ARTICLE_BODY_CHARS = 200
+
+# Elementos que cortan párrafo; el resto (a, strong, em, span...) se une al texto que lo rodea
+BLOCK_TAGS = frozenset({
+    'p', 'div', 'section', 'article', 'header', 'footer', 'aside', 'main', 'nav',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'blockquote', 'pre', 'figure', 'figcaption', 'table', 'tr', 'td', 'th', 'br', 'hr'
+})
+# Elementos sin texto legible
+SKIPPED_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'iframe', 'form', 'button'})
+
+_COMBINATOR_RE = re.compile(r'\s*[>+~]\s*|\s+')
+_TAG_NAME_RE = re.compile(r'^[a-zA-Z][\w-]*')
+_ATTR_NAME_RE = re.compile(r'\[\s*([\w-]+)')
+_BRACKETS_RE = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+_CLASS_RE = re.compile(r'\.([\w-]+)')
+_ID_RE = re.compile(r'#([\w-]+)')
+
+
+def _subject(selector: str) -> str:
+    return _COMBINATOR_RE.split(selector.strip())[-1]
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str):
+    """Selector CSS compilado una vez por proceso"""
+    return soupsieve.compile(selector)
+
+
+@lru_cache(maxsize=None)
+def subject_tag(selector: str):
+    """Etiqueta del elemento que selecciona el selector ('article > div' -> 'div'), o None si puede ser cualquiera"""
+    match = _TAG_NAME_RE.match(_subject(selector))
+    return match.group().lower() if match else None
+
+
+@lru_cache(maxsize=None)
+def subject_filter(selector: str):
+    """Clases, id y atributos que exige el elemento seleccionado ('div.post-content' -> {'post-content'}).
+
+    Es un filtro previo barato: solo los elementos que lo pasan se comparan con soupsieve.
+    """
+    subject = _subject(selector)
+    attributes = frozenset(name.lower() for name in _ATTR_NAME_RE.findall(subject))
+    simple = _BRACKETS_RE.sub('', subject)  # Sin valores de atributos ni argumentos de pseudoclases
+    classes = frozenset(_CLASS_RE.findall(simple))
+    ids = _ID_RE.findall(simple)
+    return classes, (ids[0] if ids else None), attributes
+
+
+def _passes(element: Tag, requirements) -> bool:
+    classes, element_id, attributes = requirements
+    attrs = element.attrs
+    if classes and not classes.issubset(attrs.get('class') or ()):
+        return False
+    if element_id and attrs.get('id') != element_id:
+        return False
+    return all(name in attrs for name in attributes)
+
+
+def _clean(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def element_paragraphs(element: Tag) -> List[str]:
+    """Párrafos de texto limpio de un contenedor, cortando en los elementos de bloque"""
+    paragraphs, current = [], []
+
+    def flush():
+        if text := _clean(''.join(current)):
+            paragraphs.append(text)
+        current.clear()
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, NavigableString):
+                if type(child) is NavigableString:  # Sin comentarios, CDATA ni doctype
+                    current.append(str(child))
+            elif child.name in SKIPPED_TAGS:
+                continue
+            elif child.name in BLOCK_TAGS:
+                flush()
+                walk(child)
+                flush()
+            else:
+                walk(child)
+
+    walk(element)
+    flush()
+    return paragraphs
+
+
+def _date_text(element: Tag) -> str:
+    """Fecha de un elemento: atributo datetime/content (time, meta) o su texto"""
+    return (element.get('datetime') or element.get('content') or element.get_text()).strip()
+
+
+class ArticleExtractor:
+    """Extracción de título, contenido y fecha en un único recorrido del DOM.
+
+    Cada campo tiene una cascada de selectores por prioridad. Los selectores se
+    indexan por la etiqueta del elemento que seleccionan, así que cada nodo solo
+    se compara con los que pueden casar con él, y solo con los de mejor
+    prioridad que el mejor encontrado hasta ese momento. Del contenido se
+    conservan únicamente los contenedores más externos del selector ganador, de
+    modo que el texto de los anidados no se repite.
+    """
+
+    def __init__(self, selectors: Dict[str, List[str]]):
+        self.by_tag = defaultdict(list)
+        self.any_tag = []
+        for field in EXTRACTED_FIELDS:
+            for priority, selector in enumerate(selectors.get(field, ())):
+                entry = (field, priority, selector, subject_filter(selector), compile_selector(selector))
+                tag = subject_tag(selector)
+                (self.by_tag[tag] if tag else self.any_tag).append(entry)
+        self._candidates = {}  # etiqueta -> selectores que pueden casar con ella
+
+    def extract(self, soup: BeautifulSoup) -> Extraction:
+        best = {}  # campo -> (prioridad, selector, [elementos])
+        content_ids = set()
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            candidates = self._candidates.get(element.name)
+            if candidates is None:
+                candidates = self._candidates[element.name] = self.by_tag.get(element.name, []) + self.any_tag
+            for field, priority, selector, requirements, matcher in candidates:
+                current = best.get(field)
+                if current and (priority > current[0] or (priority == current[0] and field != 'content')):
+                    continue
+                if not _passes(element, requirements) or not matcher.match(element):
+                    continue
+                if field == 'content':
+                    if current and priority == current[0]:
+                        # Solo contenedores externos: los anidados ya están dentro del texto
+                        if any(id(parent) in content_ids for parent in element.parents):
+                            continue
+                        current[2].append(element)
+                        content_ids.add(id(element))
+                        continue
+                    content_ids = {id(element)}
+                best[field] = (priority, selector, [element])
+
+        title = _clean(best['title'][2][0].get_text()) if 'title' in best else None
+        paragraphs = [paragraph for element in best['content'][2]
+                      for paragraph in element_paragraphs(element)] if 'content' in best else []
+        date = _date_text(best['date'][2][0]) if 'date' in best else None
+        return Extraction(title, paragraphs, date, {field: value[1] for field, value in best.items()})
+
+
+def _is_metadata(tag: Tag) -> bool:
+    """Elementos con metadatos: JSON-LD, <meta> y microdatos (itemprop)"""
+    return ((tag.name == 'script' and (tag.get('type') or '').strip().lower() == 'application/ld+json')
+            or tag.name == 'meta' or tag.has_attr('itemprop'))
+
+
+def _json_ld_articles(data):
+    """Objetos de tipo artículo dentro de un bloque JSON-LD (listas y @graph incluidos)"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_articles(item)
+    elif isinstance(data, dict):
+        types = data.get('@type')
+        types = types if isinstance(types, list) else [types]
+        if ARTICLE_TYPES.intersection(t for t in types if isinstance(t, str)):
+            yield data
+        if '@graph' in data:
+            yield from _json_ld_articles(data['@graph'])
+
+
+def _text_paragraphs(text: str) -> List[str]:
+    """Párrafos de un articleBody, que puede venir como texto plano o como HTML"""
+    if '<' in text and '>' in text:
+        return element_paragraphs(make_soup(text))
+    return [paragraph for paragraph in (_clean(line) for line in text.splitlines()) if paragraph]
+
+
+def structured_metadata(soup: BeautifulSoup) -> Metadata:
+    """Título, fecha y cuerpo desde JSON-LD, microdatos u OpenGraph, en ese orden.
+
+    Un único find_all recoge los elementos candidatos; los campos que falten se
+    dejan en None para que los resuelva la cascada de selectores.
+    """
+    found = {}  # campo -> (valor, fuente)
+
+    def offer(field, value, source):
+        if field not in found and value:
+            found[field] = (value, source)
+
+    metas, microdata = {}, []
+    for element in soup.find_all(_is_metadata):
+        if element.name == 'script':
+            try:
+                data = json.loads(element.string or '', strict=False)
+            except ValueError:
+                continue
+            for article in _json_ld_articles(data):
+                headline = article.get('headline') or article.get('name')
+                offer('title', _clean(headline) if isinstance(headline, str) else None, 'json-ld')
+                published = article.get('datePublished') or article.get('dateCreated')
+                offer('date', published if isinstance(published, str) else None, 'json-ld')
+                body = article.get('articleBody')
+                if isinstance(body, str) and len(body) >= MIN_ARTICLE_BODY_CHARS:
+                    offer('content', _text_paragraphs(body), 'json-ld')
+        elif element.name == 'meta' and not element.has_attr('itemprop'):
+            key = (element.get('property') or element.get('name') or '').strip().lower()
+            if key and element.get('content'):
+                metas.setdefault(key, element['content'])
+        else:
+            microdata.append(element)
+
+    for element in microdata:
+        prop = (element.get('itemprop') or '').strip()
+        if prop == 'headline':
+            offer('title', _clean(element.get('content') or element.get_text()), 'microdata')
+        elif prop in ('datePublished', 'dateCreated'):
+            offer('date', _date_text(element), 'microdata')
+        elif prop == 'articleBody' and element.name != 'meta':
+            paragraphs = element_paragraphs(element)
+            if sum(len(paragraph) for paragraph in paragraphs) >= MIN_ARTICLE_BODY_CHARS:
+                offer('content', paragraphs, 'microdata')
+
+    for key in META_TITLE:
+        offer('title', _clean(metas.get(key, '')), 'opengraph')
+    for key in META_DATE:
+        offer('date', metas.get(key, '').strip(), 'opengraph')
+
+    return Metadata(*(found.get(field, (None,))[0] for field in EXTRACTED_FIELDS),
+                    {field: source for field, (value, source) in found.items()})
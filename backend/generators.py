@@ -1,20 +1,170 @@
 import os
+import re
+import shutil
 import logging
+import tempfile
+import multiprocessing
+from collections import deque
+from itertools import islice
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pypdf import PdfReader, PdfWriter
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas as pdf_canvas
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import mm
-from backend.config import EDUCATIONAL_STRUCTURE
+from backend.config import EDUCATIONAL_STRUCTURE, GENERATOR_CONFIG
+from backend.progress import ProgressTracker
+from backend.utils import logging_setup, init_process_logging
 
 logger = logging.getLogger(__name__)
 
+# Secciones de la estructura organizada -> claves de EDUCATIONAL_STRUCTURE['chapter_sections']
+SECTION_KEYS = {'theory': 'teoría', 'practice': 'práctica', 'case_study': 'caso_real'}
+
+
+_LINE_RE = re.compile(r'[^\n]+')
+
+
+def iter_paragraphs(text, max_chars=1500):
+    """Trocear el texto de un artículo en párrafos de tamaño acotado, sin copiarlo entero.
+
+    El scraper une los bloques con saltos de línea; cada línea es un párrafo y
+    las que superan `max_chars` se cortan en el último final de frase (o espacio).
+    """
+    for match in _LINE_RE.finditer(text):
+        line = match.group().strip()
+        while len(line) > max_chars:
+            cut = line.rfind('. ', 0, max_chars) + 1
+            if cut < max_chars // 2:
+                cut = line.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            yield line[:cut].strip()
+            line = line[cut:].strip()
+        if line:
+            yield line
+
+
+class LazyFlowables:
+    """Secuencia perezosa de flowables para `doc.build`.
+
+    ReportLab consume la historia por la cabeza (`flowables[0]`, `del flowables[0]`,
+    reinserciones al partir párrafos); aquí se materializa solo una pequeña
+    ventana del iterador, así que la memoria no crece con el tamaño del libro.
+    """
+
+    LOOKAHEAD = 16  # Para que keepWithNext pueda agrupar títulos con lo que sigue
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._buffer = deque()
+
+    def _fill(self, size):
+        while len(self._buffer) < size:
+            try:
+                self._buffer.append(next(self._iterator))
+            except StopIteration:
+                break
+
+    def __len__(self):
+        self._fill(self.LOOKAHEAD)
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop or 0)
+            return list(islice(self._buffer, index.start, index.stop, index.step))
+        self._fill(index + 1)
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            # Solo se usa para reinsertar en cabeza: flowables[0:0] = partes
+            start, stop = index.start or 0, index.stop or 0
+            self._fill(stop)
+            for _ in range(stop - start):
+                self._buffer.popleft()
+            self._buffer.extendleft(reversed(list(value)))
+            return
+        self._fill(index + 1)
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop or 0)
+            for _ in range(len(range(*index.indices(len(self._buffer))))):
+                self._buffer.popleft()
+            return
+        self._fill(index + 1)
+        del self._buffer[index]
+
+    def insert(self, index, value):
+        self._fill(index)
+        self._buffer.insert(index, value)
+
+
+def _draw_page_number(canvas, doc, number=None):
+    """Número de página centrado en el pie"""
+    canvas.saveState()
+    canvas.setFont('Helvetica', 9)
+    canvas.drawCentredString(A4[0] / 2, 10*mm, str(number or doc.page))
+    canvas.restoreState()
+
+
+def _render_part(filename, title, sections):
+    """Renderizar la portada (title=None) o un capítulo como PDF independiente.
+
+    Se ejecuta en un proceso del pool: los flowables se crean aquí porque no
+    se pueden serializar. Devuelve el número de páginas, o None si falló.
+    """
+    generator = BookGenerator(filename)
+    try:
+        # Cada parte es un documento propio: el salto final dejaría una página en blanco
+        if title is None:
+            elements = generator._create_cover()[:-1]
+        else:
+            elements = LazyFlowables(generator._iter_chapter(title, sections, page_break=False))
+        generator._new_document(filename).build(elements)
+        return len(PdfReader(filename).pages)
+    except Exception as e:
+        logger.error(f"Error en capítulo {title}: {str(e)}")
+        return None
+
+
 class BookGenerator:
-    def __init__(self, filename):
+    # Incrementar al cambiar maquetación o estilos: invalida la caché de libros
+    RENDER_VERSION = 3
+
+    def __init__(self, filename, render_mode=None, workers=None, toc=None, progress=None):
         self.filename = os.path.abspath(filename)
+        self.progress = progress  # Callback de eventos de avance (capítulo en maquetación, ETA)
         self.styles = self._create_styles()
+        self.render_mode = render_mode or GENERATOR_CONFIG['render_mode']
+        self.workers = workers or GENERATOR_CONFIG['render_workers'] or os.cpu_count() or 1
+        self.toc = GENERATOR_CONFIG['toc'] if toc is None else toc
+        self.max_paragraph_chars = GENERATOR_CONFIG['max_paragraph_chars']
         logger.info(f"Ruta completa del PDF: {self.filename}")
 
+    @classmethod
+    def render_signature(cls):
+        """Versión de maquetación + opciones que cambian el PDF (clave de la caché de libros)"""
+        toc = GENERATOR_CONFIG['toc'] and GENERATOR_CONFIG['render_mode'] == 'parallel'
+        return (f"{cls.RENDER_VERSION}:{GENERATOR_CONFIG['render_mode']}:toc={int(toc)}"
+                f":para={GENERATOR_CONFIG['max_paragraph_chars']}")
+
+    def _new_document(self, filename):
+        return SimpleDocTemplate(
+            filename,
+            pagesize=A4,
+            leftMargin=20*mm,
+            rightMargin=20*mm,
+            topMargin=20*mm,
+            bottomMargin=20*mm
+        )
+
     def _create_styles(self):
         """Configura estilos personalizados con validación robusta"""
         styles = getSampleStyleSheet()
@@ -52,29 +202,11 @@ class BookGenerator:
         try:
             logger.info(f"Iniciando generación de PDF con {len(structure)} capítulos")
             
-            doc = SimpleDocTemplate(
-                self.filename,
-                pagesize=A4,
-                leftMargin=20*mm,
-                rightMargin=20*mm,
-                topMargin=20*mm,
-                bottomMargin=20*mm
-            )
-            
-            elements = []
-            elements += self._create_cover()
-            
-            for chapter_title, sections in structure.items():
-                logger.debug(f"Procesando capítulo: {chapter_title}")
-                try:
-                    chapter_content = self._create_chapter(chapter_title, sections)
-                    elements += chapter_content
-                except Exception as e:
-                    logger.error(f"Error en capítulo {chapter_title}: {str(e)}")
-                    continue
+            if self.render_mode == 'parallel' and len(structure) > 1 and self.workers > 1:
+                self._build_parallel(structure)
+            else:
+                self._build_single(structure)
             
-            logger.info("Construyendo documento PDF...")
-            doc.build(elements)
             logger.info(f"✅ PDF generado exitosamente en: {self.filename}")
             return True
             
@@ -85,6 +217,122 @@ class BookGenerator:
                 logger.warning("Se eliminó archivo PDF incompleto")
             return False
 
+    def _build_single(self, structure):
+        """Todo el libro en un único doc.build, alimentado por un iterador perezoso"""
+        doc = self._new_document(self.filename)
+        logger.info("Construyendo documento PDF...")
+        doc.build(LazyFlowables(self._iter_book(structure)), onLaterPages=_draw_page_number)
+
+    def _iter_book(self, structure):
+        yield from self._create_cover()
+        
+        tracker = ProgressTracker(self.progress, 'chapters', len(structure), min_interval=0)
+        for index, (chapter_title, sections) in enumerate(structure.items()):
+            # doc.build consume el iterador a medida que maqueta: el capítulo anterior ya está hecho
+            tracker.advance(step=1 if index else 0, chapter=index + 1, title=chapter_title)
+            logger.debug(f"Procesando capítulo: {chapter_title}")
+            try:
+                yield from self._iter_chapter(chapter_title, sections)
+            except Exception as e:
+                logger.error(f"Error en capítulo {chapter_title}: {str(e)}")
+                continue
+        if structure:
+            tracker.advance()
+
+    def _build_parallel(self, structure):
+        """Maquetar portada y capítulos en un pool de procesos y unir las partes.
+
+        Los números de página se estampan después de unir, para que sean
+        continuos; el índice opcional se genera con las páginas reales de
+        inicio de cada capítulo.
+        """
+        work_dir = tempfile.mkdtemp(prefix='book_parts_', dir=os.path.dirname(self.filename))
+        try:
+            titles = list(structure)
+            part_files = [os.path.join(work_dir, f'part_{index:04d}.pdf') for index in range(len(titles) + 1)]
+            
+            logger.info(f"Maquetando {len(titles)} capítulos en {self.workers} procesos...")
+            tracker = ProgressTracker(self.progress, 'chapters', len(titles), min_interval=0)
+            # spawn: el proceso que maqueta (web o worker de trabajos) ya tiene hilos que un fork copiaría a medias
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(part_files)),
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=init_process_logging, initargs=logging_setup()) as executor:
+                futures = {
+                    executor.submit(_render_part, part_file, title, structure[title] if title else None): index
+                    for index, (part_file, title) in enumerate(zip(part_files, [None] + titles))
+                }
+                page_counts = [None] * len(part_files)
+                for future in as_completed(futures):
+                    index = futures[future]
+                    page_counts[index] = future.result()
+                    if index:
+                        tracker.advance(chapter=index, title=titles[index - 1])
+            
+            cover_file, cover_pages = part_files[0], page_counts[0]
+            if cover_pages is None:
+                raise RuntimeError("No se pudo generar la portada")
+            chapters = [(title, part_file, pages)
+                        for title, part_file, pages in zip(titles, part_files[1:], page_counts[1:])
+                        if pages]
+            
+            toc_file, toc_pages = None, 0
+            if self.toc:
+                toc_file = os.path.join(work_dir, 'toc.pdf')
+                toc_pages = self._render_toc(toc_file, chapters, cover_pages)
+            
+            logger.info("Uniendo partes del PDF...")
+            writer = PdfWriter()
+            for part_file in [cover_file] + ([toc_file] if toc_file else []) + [c[1] for c in chapters]:
+                writer.append(part_file)
+            self._stamp_page_numbers(writer, work_dir)
+            with open(self.filename, 'wb') as fh:
+                writer.write(fh)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _render_toc(self, filename, chapters, cover_pages):
+        """Índice con la página real de inicio de cada capítulo.
+
+        Su propia longitud desplaza los capítulos, así que se repite hasta que
+        el número de páginas del índice se estabiliza.
+        """
+        toc_pages = 1
+        for _ in range(3):
+            start = cover_pages + toc_pages + 1
+            rows = []
+            for title, _, pages in chapters:
+                rows.append([Paragraph(escape(title), self.styles['BodyText']), str(start)])
+                start += pages
+            table = Table(rows, colWidths=[150*mm, 20*mm], style=TableStyle([
+                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.HexColor("#CCCCCC")),
+            ]))
+            self._new_document(filename).build([
+                Paragraph("Índice", self.styles['Heading1']),
+                Spacer(1, 20),
+                table
+            ])
+            rendered = len(PdfReader(filename).pages)
+            if rendered == toc_pages:
+                break
+            toc_pages = rendered
+        return toc_pages
+
+    def _stamp_page_numbers(self, writer, work_dir):
+        """Superponer números de página continuos (la portada no se numera)"""
+        overlay_file = os.path.join(work_dir, 'numbers.pdf')
+        overlay = pdf_canvas.Canvas(overlay_file, pagesize=A4)
+        for number in range(1, len(writer.pages) + 1):
+            if number > 1:
+                _draw_page_number(overlay, None, number)
+            overlay.showPage()
+        overlay.save()
+        
+        numbers = PdfReader(overlay_file)
+        for page, number_page in zip(writer.pages[1:], numbers.pages[1:]):
+            page.merge_page(number_page)
+
     def _create_cover(self):
         """Diseño de portada profesional"""
         table_style = TableStyle([
@@ -107,7 +355,7 @@ class BookGenerator:
         """Tabla de objetivos de aprendizaje con validación"""
         try:
             table_data = []
-            for level in ['basic', 'intermediate', 'expert']:
+            for level in ['básico', 'intermedio', 'experto']:
                 config = EDUCATIONAL_STRUCTURE['learning_levels'][level]
                 table_data.append([
                     config['icon'],
@@ -128,59 +376,61 @@ class BookGenerator:
 
     def _create_chapter(self, title, sections):
         """Construye estructura de capítulo con validación mejorada"""
+        return list(self._iter_chapter(title, sections))
+
+    def _iter_chapter(self, title, sections, page_break=True):
+        """Flowables de un capítulo, generados bajo demanda"""
         required_sections = ['theory', 'practice', 'case_study']
         for section in required_sections:
             if section not in sections:
                 logger.warning(f"Capítulo '{title}' sin sección: {section}")
                 sections[section] = []
         
-        chapter_elements = [
-            Paragraph(title, self.styles['Heading1']),
-            Spacer(1, 20)
-        ]
+        yield Paragraph(escape(title), self.styles['Heading1'])
+        yield Spacer(1, 20)
         
         # Sección Teórica
-        chapter_elements += self._create_section(
-            EDUCATIONAL_STRUCTURE['chapter_sections']['theory']['title'],
+        yield from self._create_section(
+            EDUCATIONAL_STRUCTURE['chapter_sections'][SECTION_KEYS['theory']]['title'],
             sections['theory']
         )
         
         # Sección Práctica
-        chapter_elements += self._create_section(
-            EDUCATIONAL_STRUCTURE['chapter_sections']['practice']['title'],
+        yield from self._create_section(
+            EDUCATIONAL_STRUCTURE['chapter_sections'][SECTION_KEYS['practice']]['title'],
             sections['practice'],
             style='CustomBullet'
         )
         
         # Casos de Estudio
-        chapter_elements += self._create_section(
-            EDUCATIONAL_STRUCTURE['chapter_sections']['case_study']['title'],
+        yield from self._create_section(
+            EDUCATIONAL_STRUCTURE['chapter_sections'][SECTION_KEYS['case_study']]['title'],
             sections['case_study']
         )
         
         # Evaluación (opcional)
         if 'quizzes' in sections and sections['quizzes']:
-            chapter_elements += self._create_assessment(sections['quizzes'])
+            yield from self._create_assessment(sections['quizzes'])
         
-        return chapter_elements + [PageBreak()]
+        if page_break:
+            yield PageBreak()
 
     def _create_section(self, title, content, style='BodyText'):
-        """Crea sección con contenido validado"""
+        """Crea sección con contenido validado, un flowable por párrafo"""
         if not content:
             logger.warning(f"Sección '{title}' vacía")
-            return []
+            return
             
-        section_elements = [
-            Paragraph(title, self.styles['Heading2']),
-            Spacer(1, 10)
-        ]
+        yield Paragraph(title, self.styles['Heading2'])
+        yield Spacer(1, 10)
         
         for item in content:
             text = item.get('content', 'Contenido no disponible') if isinstance(item, dict) else str(item)
-            section_elements.append(Paragraph(f"• {text}", self.styles[style]))
-            section_elements.append(Spacer(1, 5))
-                
-        return section_elements
+            bullet = "• "
+            for paragraph in iter_paragraphs(text, self.max_paragraph_chars):
+                yield Paragraph(bullet + escape(paragraph), self.styles[style])
+                bullet = ""
+            yield Spacer(1, 5)
 
     def _create_assessment(self, quizzes):
         """Crea evaluación con preguntas validadas"""
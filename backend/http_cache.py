@@ -0,0 +1,162 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import namedtuple
+from typing import Optional
+
+from backend.config import HTTP_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CachedPage = namedtuple('CachedPage', ['url', 'body', 'encoding', 'etag', 'last_modified', 'stored_at'])
+
+
+class HTTPCache:
+    """Caché HTTP persistente en SQLite con TTL, revalidación condicional y expulsión LRU"""
+
+    def __init__(self, path: str, ttl: int = 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._evict_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._create_tables()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Una conexión por hilo: sqlite3 no comparte conexiones entre hilos
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=15)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_tables(self):
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    encoding TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_http_cache_accessed ON http_cache (accessed_at)')
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Buscar una respuesta en caché y marcarla como usada"""
+        try:
+            with self._conn() as conn:
+                row = conn.execute(
+                    'SELECT url, body, encoding, etag, last_modified, stored_at FROM http_cache WHERE url = ?',
+                    (url,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute('UPDATE http_cache SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            return CachedPage(*row)
+        except sqlite3.Error as e:
+            logger.error(f"Error leyendo caché HTTP para {url}: {str(e)}")
+            return None
+
+    def is_fresh(self, entry: CachedPage) -> bool:
+        return (time.time() - entry.stored_at) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedPage]) -> dict:
+        """Cabeceras If-None-Match / If-Modified-Since para revalidar una entrada"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidated(self, url: str, response=None):
+        """Registrar un 304: la entrada vuelve a ser fresca"""
+        now = time.time()
+        etag = response.headers.get('ETag') if response is not None else None
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    'UPDATE http_cache SET stored_at = ?, accessed_at = ?, etag = COALESCE(?, etag) WHERE url = ?',
+                    (now, now, etag, url)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error revalidando caché HTTP para {url}: {str(e)}")
+
+    def store(self, url: str, response):
+        """Guardar una respuesta 200 de requests"""
+        if response.status_code != 200:
+            return
+        body = response.content
+        now = time.time()
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    """INSERT OR REPLACE INTO http_cache
+                       (url, body, encoding, etag, last_modified, stored_at, accessed_at, size)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (url, body, response.encoding or response.apparent_encoding,
+                     response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                     now, now, len(body))
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error guardando caché HTTP para {url}: {str(e)}")
+            return
+        self._evict()
+
+    def _evict(self):
+        """Expulsar las entradas menos usadas recientemente hasta volver al límite de tamaño"""
+        with self._evict_lock:
+            try:
+                with self._conn() as conn:
+                    total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+                    if total <= self.max_bytes:
+                        return
+                    target = int(self.max_bytes * 0.9)
+                    evicted = 0
+                    for url, size in conn.execute(
+                        'SELECT url, size FROM http_cache ORDER BY accessed_at ASC'
+                    ).fetchall():
+                        if total <= target:
+                            break
+                        conn.execute('DELETE FROM http_cache WHERE url = ?', (url,))
+                        total -= size
+                        evicted += 1
+                logger.info(f"🧹 Caché HTTP: {evicted} entradas expulsadas (LRU)")
+            except sqlite3.Error as e:
+                logger.error(f"Error expulsando entradas de la caché HTTP: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._conn() as conn:
+            entries, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache').fetchone()
+        return {'entries': entries, 'bytes': total, 'max_bytes': self.max_bytes, 'ttl': self.ttl}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Caché compartida del proceso, o None si está desactivada"""
+    global _shared_cache
+    if not HTTP_CACHE_CONFIG['enabled']:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache(
+                HTTP_CACHE_CONFIG['path'],
+                ttl=HTTP_CACHE_CONFIG['ttl'],
+                max_bytes=HTTP_CACHE_CONFIG['max_bytes']
+            )
+        return _shared_cache
@@ -0,0 +1,293 @@
+import os
+import time
+import shutil
+import logging
+import threading
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin flock, cada proceso barre por su cuenta
+    fcntl = None
+
+from backend.config import JANITOR_CONFIG
+from backend.metrics import JANITOR_REMOVED_FILES, JANITOR_RECLAIMED_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Un artefacto puede ocupar varios archivos (base SQLite + -wal/-shm, trabajo .json + .events)
+Artifact = namedtuple('Artifact', ['kind', 'key', 'paths', 'size', 'last_used'])
+
+SQLITE_SUFFIXES = ('-wal', '-shm', '-journal')
+# Directorios de trabajo del render paralelo (BookGenerator._build_parallel)
+PARTS_DIR_PREFIX = 'book_parts_'
+# Tipos que compiten por el presupuesto de disco
+BUDGETED_KINDS = ('pdf', 'session_db')
+
+
+def _group(entries, key_of):
+    """Agrupar archivos (DirEntry) en artefactos: tamaño total y último uso más reciente"""
+    groups = defaultdict(list)
+    for entry in entries:
+        groups[key_of(entry)].append(entry)
+    for key, members in groups.items():
+        stats = []
+        for entry in members:
+            try:
+                stats.append((Path(entry.path), entry.stat()))
+            except FileNotFoundError:
+                continue
+        if stats:
+            yield key, [path for path, _ in stats], sum(st.st_size for _, st in stats), max(st.st_mtime for _, st in stats)
+
+
+def _scandir(directory, dirs=False):
+    """Archivos de `directory` (o sus subdirectorios, con dirs=True)"""
+    try:
+        with os.scandir(directory) as entries:
+            if dirs:
+                return [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+            return [entry for entry in entries if entry.is_file(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
+
+
+def _tree_usage(path):
+    """Tamaño total y modificación más reciente de un directorio y su contenido"""
+    size, last_used = 0, os.stat(path).st_mtime
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            size += stat.st_size
+            last_used = max(last_used, stat.st_mtime)
+    return size, last_used
+
+
+def _delete(path: Path) -> int:
+    """Borrar un archivo o directorio; devuelve los bytes liberados"""
+    if path.is_dir():
+        size, _ = _tree_usage(path)
+        shutil.rmtree(path)
+        return size
+    size = path.stat().st_size
+    path.unlink()
+    return size
+
+
+class Janitor:
+    """Mantenimiento en segundo plano de los archivos que genera la aplicación.
+
+    Cada `interval` segundos recorre los directorios y mantiene un índice de
+    artefactos (PDFs, bases de sesión, estados de trabajos, temporales) con su
+    tamaño y último uso (mtime: BookCache lo actualiza en cada acierto). Borra
+    lo que supera su TTL y, si los PDFs y las bases de sesión superan el
+    presupuesto de disco, lo usado hace más tiempo. Nada de esto ocurre
+    durante las peticiones; entre procesos se coordina con un flock.
+    """
+
+    def __init__(self, books_dir, book_cache_dir, db_dir, jobs_dir, corpus_db_name='corpus.db',
+                 pdf_ttl=None, session_db_ttl=None, job_ttl=None, temp_ttl=None,
+                 disk_budget=None, interval=None):
+        self.books_dir = Path(books_dir)
+        self.book_cache_dir = Path(book_cache_dir)
+        self.db_dir = Path(db_dir)
+        self.jobs_dir = Path(jobs_dir)
+        self.corpus_db_name = corpus_db_name
+        self.ttl = {
+            'pdf': JANITOR_CONFIG['pdf_ttl'] if pdf_ttl is None else pdf_ttl,
+            'session_db': JANITOR_CONFIG['session_db_ttl'] if session_db_ttl is None else session_db_ttl,
+            'job': JANITOR_CONFIG['job_ttl'] if job_ttl is None else job_ttl,
+            'temp': JANITOR_CONFIG['temp_ttl'] if temp_ttl is None else temp_ttl,
+        }
+        self.disk_budget = JANITOR_CONFIG['disk_budget'] if disk_budget is None else disk_budget
+        self.interval = JANITOR_CONFIG['interval'] if interval is None else interval
+        self.index: Dict[str, Artifact] = {}
+        self.last_report: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def scan(self) -> Dict[str, Artifact]:
+        """Reconstruir el índice de artefactos a partir del disco"""
+        index = {}
+
+        def add(kind, key, paths, size, last_used):
+            index[f'{kind}:{key}'] = Artifact(kind, key, paths, size, last_used)
+
+        # PDFs: libros de la caché y PDFs sueltos de versiones anteriores
+        for directory in (self.book_cache_dir, self.books_dir):
+            for entry in _scandir(directory):
+                if entry.name.endswith('.tmp.pdf'):
+                    add('temp', *next(_group([entry], lambda e: e.path)))
+                elif entry.name.endswith('.pdf'):
+                    add('pdf', *next(_group([entry], lambda e: e.path)))
+            # Partes de un render paralelo que se interrumpió
+            for entry in _scandir(directory, dirs=True):
+                if entry.name.startswith(PARTS_DIR_PREFIX):
+                    try:
+                        add('temp', entry.path, [Path(entry.path)], *_tree_usage(entry.path))
+                    except FileNotFoundError:
+                        continue
+
+        # Bases SQLite de sesión (el corpus compartido nunca se toca)
+        databases = []
+        for entry in _scandir(self.db_dir):
+            base = entry.name
+            for suffix in SQLITE_SUFFIXES:
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            if base.endswith('.db') and base != self.corpus_db_name:
+                databases.append(entry)
+        for group in _group(databases, lambda e: e.path.rsplit('.db', 1)[0] + '.db'):
+            add('session_db', *group)
+
+        # Estados de trabajos (.json + .events) y escrituras a medias (.tmp)
+        job_files, temps = [], []
+        for entry in _scandir(self.jobs_dir):
+            if entry.name.endswith('.tmp'):
+                temps.append(entry)
+            elif entry.name.endswith(('.json', '.events')):
+                job_files.append(entry)
+        for group in _group(job_files, lambda e: e.name.split('.', 1)[0]):
+            add('job', *group)
+        for entry in temps:
+            add('temp', *next(_group([entry], lambda e: e.path)))
+
+        with self._lock:
+            self.index = index
+        return index
+
+    def sweep(self) -> dict:
+        """Un barrido completo: TTL por tipo y presupuesto de disco LRU. Devuelve el informe"""
+        started = time.monotonic()
+        with self._exclusive() as acquired:
+            if not acquired:
+                logger.debug("Otro proceso está haciendo el mantenimiento; se omite este barrido")
+                return {'skipped': True}
+
+            index = self.scan()
+            now = time.time()
+            removed = []
+
+            for artifact in index.values():
+                if now - artifact.last_used > self.ttl[artifact.kind]:
+                    removed.append((artifact, 'ttl'))
+
+            expired = {artifact.key for artifact, _ in removed}
+            budgeted = sorted((artifact for artifact in index.values()
+                               if artifact.kind in BUDGETED_KINDS and artifact.key not in expired),
+                              key=lambda artifact: artifact.last_used)
+            total = sum(artifact.size for artifact in budgeted)
+            for artifact in budgeted:
+                if total <= self.disk_budget:
+                    break
+                removed.append((artifact, 'budget'))
+                total -= artifact.size
+
+            report = self._remove(removed)
+            report.update({
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+                'duration_s': round(time.monotonic() - started, 4),
+                'budgeted_bytes': total,
+                'disk_budget': self.disk_budget,
+            })
+
+        purged_jobs = [artifact.key for artifact, _ in removed if artifact.kind == 'job']
+        if purged_jobs:
+            report['unlinked_job_articles'] = self._unlink_jobs(purged_jobs)
+        self.last_report = report
+        if report['files']:
+            by_kind = ", ".join(f"{kind}: {count}" for kind, count in sorted(report['removed'].items()))
+            logger.info(f"🧹 Mantenimiento: {report['files']} archivos borrados, "
+                        f"{report['reclaimed_bytes'] / (1024 * 1024):.1f} MB liberados ({by_kind})")
+        return report
+
+    def _remove(self, removed: List[tuple]) -> dict:
+        report = {'removed': defaultdict(int), 'reclaimed_by_kind': defaultdict(int),
+                  'reasons': defaultdict(int), 'files': 0, 'reclaimed_bytes': 0}
+        with self._lock:
+            for artifact, reason in removed:
+                freed = 0
+                for path in artifact.paths:
+                    try:
+                        size = _delete(path)
+                    except FileNotFoundError:
+                        continue  # Ya lo borró otro proceso
+                    except OSError as e:
+                        logger.error(f"No se pudo borrar {path}: {str(e)}")
+                        continue
+                    freed += size
+                    report['files'] += 1
+                self.index.pop(f'{artifact.kind}:{artifact.key}', None)
+                report['removed'][artifact.kind] += 1
+                report['reasons'][reason] += 1
+                report['reclaimed_by_kind'][artifact.kind] += freed
+                report['reclaimed_bytes'] += freed
+                JANITOR_REMOVED_FILES.inc(kind=artifact.kind, reason=reason)
+                JANITOR_RECLAIMED_BYTES.inc(freed, kind=artifact.kind)
+        for key in ('removed', 'reclaimed_by_kind', 'reasons'):
+            report[key] = dict(report[key])
+        return report
+
+    def _unlink_jobs(self, job_ids) -> int:
+        """Quitar del corpus los enlaces de los trabajos purgados"""
+        corpus = self.db_dir / self.corpus_db_name
+        if not corpus.exists():
+            return 0
+        from backend.database import DBManager
+        with DBManager(str(corpus)) as db:
+            return db.unlink_jobs(job_ids)
+
+    @contextmanager
+    def _exclusive(self):
+        """Solo un proceso barre a la vez (los workers de gunicorn comparten directorios)"""
+        if fcntl is None:
+            yield True
+            return
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.jobs_dir / '.janitor.lock', 'w') as fh:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def start(self):
+        """Arrancar el hilo de mantenimiento (idempotente)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='janitor', daemon=True)
+        self._thread.start()
+        logger.info(f"🧹 Mantenimiento en segundo plano cada {self.interval} s")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Error en el mantenimiento: {str(e)}", exc_info=True)
+            self._stop.wait(self.interval)
+
+    def stats(self) -> dict:
+        with self._lock:
+            artifacts = list(self.index.values())
+        summary = defaultdict(lambda: {'count': 0, 'bytes': 0})
+        for artifact in artifacts:
+            summary[artifact.kind]['count'] += 1
+            summary[artifact.kind]['bytes'] += artifact.size
+        return {'artifacts': dict(summary), 'last_sweep': self.last_report}
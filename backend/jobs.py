@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import uuid
+import logging
+import threading
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from backend.utils import logging_setup, init_process_logging
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ('queued', 'scraping', 'organizing', 'rendering', 'done', 'failed')
+# Campos del trabajo que acompañan a los eventos de cambio de estado
+STATE_EVENT_FIELDS = ('state', 'download_url', 'error')
+_JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class JobStore:
+    """Estado de los trabajos en disco (un JSON por trabajo).
+
+    Al vivir en el sistema de archivos, cualquier worker de gunicorn o proceso
+    del pool puede leer y actualizar el estado sin un broker externo.
+    """
+
+    def __init__(self, jobs_dir):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # El lock no se puede serializar hacia el pool de procesos
+        return {'jobs_dir': self.jobs_dir}
+
+    def __setstate__(self, state):
+        self.jobs_dir = state['jobs_dir']
+        self._lock = threading.Lock()
+
+    def _path(self, job_id):
+        if not _JOB_ID_RE.match(job_id or ''):
+            raise ValueError(f"ID de trabajo inválido: {job_id}")
+        return self.jobs_dir / f'{job_id}.json'
+
+    def create(self, **fields):
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        job = {'id': job_id, 'state': 'queued', 'created_at': now, 'updated_at': now}
+        job.update(fields)
+        self._write(job)
+        self.add_event(job_id, 'state', state='queued')
+        return job
+
+    def get(self, job_id):
+        try:
+            path = self._path(job_id)
+        except ValueError:
+            return None
+        try:
+            with open(path, encoding='utf-8') as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error leyendo trabajo {job_id}: {str(e)}")
+            return None
+
+    def update(self, job_id, **fields):
+        if 'state' in fields and fields['state'] not in JOB_STATES:
+            raise ValueError(f"Estado de trabajo inválido: {fields['state']}")
+        with self._lock:
+            job = self.get(job_id) or {'id': job_id}
+            job.update(fields)
+            job['updated_at'] = datetime.now().isoformat()
+            if 'state' in fields:
+                # El evento va antes que el estado: quien vea el trabajo terminado ya tiene todos sus eventos
+                self.add_event(job_id, 'state', **{key: fields[key] for key in STATE_EVENT_FIELDS if key in fields})
+            self._write(job)
+        return job
+
+    def _events_path(self, job_id):
+        return self._path(job_id).with_suffix('.events')
+
+    def add_event(self, job_id, kind, **data):
+        """Añadir un evento de progreso al registro del trabajo (una línea JSON por evento).
+
+        Se escribe con O_APPEND en una sola llamada, así que hilos y procesos
+        distintos pueden añadir eventos a la vez sin mezclar líneas.
+        """
+        event = {'type': kind, 'time': datetime.now().isoformat(), **data}
+        line = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+        fd = os.open(self._events_path(job_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def events(self, job_id, after=0):
+        """Eventos posteriores a `after` como pares (id, evento).
+
+        El id de cada evento es el desplazamiento en bytes tras su línea: sirve
+        directamente como Last-Event-ID y permite continuar sin releer el archivo.
+        """
+        try:
+            path = self._events_path(job_id)
+            with open(path, 'rb') as fh:
+                fh.seek(max(0, int(after)))
+                offset = fh.tell()
+                for line in fh:
+                    if not line.endswith(b'\n'):
+                        break  # Línea a medio escribir: se entregará en la siguiente lectura
+                    offset += len(line)
+                    try:
+                        yield offset, json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except (ValueError, FileNotFoundError):
+            return
+
+    def _write(self, job):
+        path = self._path(job['id'])
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(job, fh, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class JobQueue:
+    """Pool local de workers (hilos o procesos) que ejecuta los trabajos"""
+
+    def __init__(self, store, max_workers=2, mode='thread'):
+        self.store = store
+        self.max_workers = max(1, int(max_workers))
+        self.mode = mode
+        if mode == 'process':
+            # spawn: el proceso web ya tiene hilos (janitor, pools) que un fork copiaría a medias
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=init_process_logging, initargs=logging_setup())
+        elif mode == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+        else:
+            raise ValueError(f"Modo de pool no soportado: {mode}")
+        logger.info(f"Cola de trabajos iniciada ({mode}, {self.max_workers} workers)")
+
+    def submit(self, job_id, func, *args):
+        """Encolar un trabajo ya registrado. `func` recibe (store, job_id, *args)"""
+        future = self.executor.submit(func, self.store, job_id, *args)
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        return future
+
+    def _on_done(self, job_id, future):
+        # Red de seguridad: si el trabajo revienta sin registrar el fallo
+        exc = future.exception()
+        if exc is not None:
+            logger.error(f"Trabajo {job_id} falló: {str(exc)}")
+            self.store.update(job_id, state='failed', error='Error interno del servidor')
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
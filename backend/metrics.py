@@ -0,0 +1,216 @@
+import time
+import bisect
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional, Sequence
+
+from backend.config import METRICS_CONFIG
+
+# Cubetas por defecto (segundos) para latencias de red y de procesado
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 20_000_000, 100_000_000)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500)
+
+_NULL_TIMER = nullcontext()
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, '')) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=''):
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, key)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Contador monótono con etiquetas"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if not METRICS_CONFIG['enabled']:
+            return
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {value:g}'
+
+
+class Histogram:
+    """Histograma acumulado al estilo Prometheus (cubetas, suma y número de observaciones)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # etiquetas -> [conteos por cubeta..., suma, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if not METRICS_CONFIG['enabled']:
+            return
+        key = _label_key(self.labelnames, labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if position < len(self.buckets):
+                series[position] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def time(self, **labels):
+        """Context manager que observa la duración del bloque (nulo si las métricas están desactivadas)"""
+        if not METRICS_CONFIG['enabled']:
+            return _NULL_TIMER
+        return self._timer(labels)
+
+    @contextmanager
+    def _timer(self, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound:g}"')
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            yield f'{self.name}_bucket{labels} {values[-1]}'
+            yield f'{self.name}_sum{_format_labels(self.labelnames, key)} {values[-2]:g}'
+            yield f'{self.name}_count{_format_labels(self.labelnames, key)} {values[-1]}'
+
+
+class MetricsRegistry:
+    """Métricas del proceso, expuestas en formato de texto de Prometheus.
+
+    Cada proceso (worker de gunicorn, pool de procesos) tiene su propio registro;
+    el desglose por trabajo se guarda además en el JobStore, que sí es compartido.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class JobTimings:
+    """Desglose de tiempos de un trabajo (segundos acumulados por etapa y contadores).
+
+    Es barato y seguro entre hilos; el pipeline lo guarda en el estado del trabajo.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = METRICS_CONFIG['enabled'] if enabled is None else enabled
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def add(self, key: str, amount: float = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._values[key] += amount
+
+    def measure(self, key: str, histogram: Optional[Histogram] = None, **labels):
+        """Acumular la duración del bloque en `key` y, si se indica, observarla en un histograma"""
+        if not self.enabled:
+            return histogram.time(**labels) if histogram is not None else _NULL_TIMER
+        return self._measure(key, histogram, labels)
+
+    @contextmanager
+    def _measure(self, key, histogram, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add(key, elapsed)
+            if histogram is not None:
+                histogram.observe(elapsed, **labels)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            # Claves *_s: segundos; el resto son contadores
+            return {key: round(value, 4) if key.endswith('_s') else int(value)
+                    for key, value in sorted(self._values.items())}
+
+
+REGISTRY = MetricsRegistry()
+
+FETCH_SECONDS = REGISTRY.histogram(
+    'booking_fetch_seconds', 'Latencia de descarga de páginas por estrategia', ['strategy'])
+FETCH_BYTES = REGISTRY.counter(
+    'booking_fetch_bytes_total', 'Bytes descargados por estrategia', ['strategy'])
+FETCH_PAGES = REGISTRY.counter(
+    'booking_fetch_pages_total', 'Páginas descargadas por estrategia y resultado', ['strategy', 'outcome'])
+HTTP_CACHE_RESULTS = REGISTRY.counter(
+    'booking_http_cache_total', 'Consultas a la caché HTTP por resultado (fresh, revalidated, miss)', ['result'])
+PARSE_SECONDS = REGISTRY.histogram(
+    'booking_parse_seconds', 'Tiempo de parseo HTML y de extracción de artículos', ['step'])
+DB_WRITE_SECONDS = REGISTRY.histogram(
+    'booking_db_write_seconds', 'Duración de cada guardado en bloque de artículos')
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram(
+    'booking_rate_limit_wait_seconds', 'Espera impuesta por el limitador de peticiones por host')
+THROTTLED_RESPONSES = REGISTRY.counter(
+    'booking_throttled_responses_total', 'Respuestas 429/503 que obligaron a reducir el ritmo', ['status'])
+STAGE_SECONDS = REGISTRY.histogram(
+    'booking_stage_seconds', 'Duración de cada etapa del pipeline', ['stage'])
+JOBS = REGISTRY.counter(
+    'booking_jobs_total', 'Trabajos terminados por resultado (done, cached, failed)', ['outcome'])
+ARTICLES_PER_JOB = REGISTRY.histogram(
+    'booking_articles_per_job', 'Artículos incluidos en cada libro', buckets=COUNT_BUCKETS)
+PDF_BYTES = REGISTRY.histogram(
+    'booking_pdf_bytes', 'Tamaño de los PDF generados', buckets=SIZE_BUCKETS)
+JANITOR_REMOVED_FILES = REGISTRY.counter(
+    'booking_janitor_removed_files_total', 'Archivos borrados por el mantenimiento por tipo y motivo', ['kind', 'reason'])
+JANITOR_RECLAIMED_BYTES = REGISTRY.counter(
+    'booking_janitor_reclaimed_bytes_total', 'Bytes liberados por el mantenimiento por tipo', ['kind'])
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
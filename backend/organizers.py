@@ -1,11 +1,29 @@
 import logging
+import math
 from collections import defaultdict
 
+from backend.config import ORGANIZER_CONFIG, SPANISH_STOP_WORDS
+
 logger = logging.getLogger(__name__)
 
+def _field(article, name):
+    """Leer un campo de un artículo, sea dict o fila/objeto ORM"""
+    if isinstance(article, dict):
+        return article.get(name)
+    return getattr(article, name, None)
+
 class ContentOrganizer:
-    def __init__(self, articles_data):
+    """Reparte los artículos en capítulos y secciones.
+
+    `articles_data` puede ser una lista o un iterador de un solo uso (p. ej.
+    DBManager.iter_job_articles): se recorre una única vez y el libro guarda
+    referencias a los textos leídos, sin copiarlos.
+    """
+
+    def __init__(self, articles_data, mode=None):
         self.articles_data = articles_data
+        self.mode = mode or ORGANIZER_CONFIG['mode']
+        self.chapter_order = []
     
     def structure_content(self):
         try:
@@ -16,25 +34,25 @@ class ContentOrganizer:
                 'quizzes': []
             })
             
+            # Única pasada por los artículos: solo se conserva lo que usa el libro
+            items, categories, stored = [], [], []
             for article in self.articles_data:
-                chapter_key = article['chapter'] if article['chapter'] else "General"
-                category = article['category'].lower() if article['category'] else 'theory'
-                
+                items.append({
+                    'title': _field(article, 'title'),
+                    'content': _field(article, 'content')
+                })
+                categories.append(_field(article, 'category'))
+                stored.append(_field(article, 'chapter'))
+            chapter_keys = self._assign_chapters(items, stored)
+            
+            for item, category, chapter_key in zip(items, categories, chapter_keys):
+                category = category.lower() if category else 'theory'
                 if category == 'teoría':
-                    chapters[chapter_key]['theory'].append({
-                        'title': article['title'],
-                        'content': article['content']
-                    })
+                    chapters[chapter_key]['theory'].append(item)
                 elif category == 'práctica':
-                    chapters[chapter_key]['practice'].append({
-                        'title': article['title'],
-                        'content': article['content']
-                    })
+                    chapters[chapter_key]['practice'].append(item)
                 else:
-                    chapters[chapter_key]['case_study'].append({
-                        'title': article['title'],
-                        'content': article['content']
-                    })
+                    chapters[chapter_key]['case_study'].append(item)
             
             # Generar quizzes básicos
             for chapter_key, content in chapters.items():
@@ -43,8 +61,74 @@ class ContentOrganizer:
                     'answer_hint': "Revisa las secciones correspondientes"
                 } for _ in range(3)]
             
-            return dict(chapters)
+            # Capítulos en orden de aparición, o por tamaño si se agruparon por tema
+            order = sorted(chapters, key=lambda key: self.chapter_order.index(key)
+                           if key in self.chapter_order else len(self.chapter_order))
+            return {key: chapters[key] for key in order}
             
         except Exception as e:
             logger.error(f"Error organizando contenido: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
+
+    def _assign_chapters(self, items, stored):
+        """Capítulo de cada artículo: el guardado, o un tema detectado por clustering"""
+        cluster = self.mode == 'cluster' or (self.mode == 'auto' and not any(stored))
+        if cluster and len(items) >= ORGANIZER_CONFIG['min_articles_to_cluster']:
+            try:
+                return self._cluster_chapters(items)
+            except ValueError as e:
+                # Textos sin vocabulario distintivo (p. ej. todos casi iguales)
+                logger.warning(f"No se pudieron agrupar los artículos por tema: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error agrupando artículos por tema: {str(e)}")
+        return [chapter or "General" for chapter in stored]
+
+    def _cluster_chapters(self, items):
+        """Agrupar artículos por tema (TF-IDF disperso + MiniBatchKMeans).
+
+        El número de capítulos crece como sqrt(n/2) hasta `max_chapters`, y cada
+        capítulo se nombra con los términos de mayor peso de su centroide.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        # Textos generados al vuelo: el vectorizador los recorre una vez y no quedan copias
+        texts = (f"{item['title'] or ''}\n{item['content'] or ''}" for item in items)
+        vectorizer = TfidfVectorizer(
+            stop_words=SPANISH_STOP_WORDS,
+            sublinear_tf=True,
+            max_features=20000,
+            max_df=0.7,
+            min_df=2 if len(items) >= 50 else 1,
+            token_pattern=r'(?u)\b[^\W\d_]{3,}\b'
+        )
+        matrix = vectorizer.fit_transform(texts)
+        
+        n_clusters = int(round(math.sqrt(len(items) / 2)))
+        n_clusters = max(2, min(n_clusters, ORGANIZER_CONFIG['max_chapters'], matrix.shape[0]))
+        model = MiniBatchKMeans(n_clusters=n_clusters, random_state=0, n_init=3,
+                                batch_size=min(1024, len(items)))
+        labels = model.fit_predict(matrix)
+        
+        terms = vectorizer.get_feature_names_out()
+        top = ORGANIZER_CONFIG['terms_per_chapter_title']
+        names = {}
+        for cluster_id, centroid in enumerate(model.cluster_centers_):
+            words = [terms[index] for index in centroid.argsort()[::-1][:top] if centroid[index] > 0]
+            if len(words) > 1:
+                # "y" pasa a "e" ante palabras que empiezan por sonido i ("plagas e insectos")
+                conjunction = "e" if words[-1].startswith(('i', 'hi')) and not words[-1].startswith('hie') else "y"
+                name = ", ".join(words[:-1]) + f" {conjunction} {words[-1]}"
+            else:
+                name = "".join(words)
+            names[cluster_id] = name.capitalize() or "General"
+        
+        # Capítulos ordenados por tamaño: el tema principal primero
+        sizes = defaultdict(int)
+        for label in labels:
+            sizes[label] += 1
+        order = {label: position for position, label in enumerate(sorted(sizes, key=sizes.get, reverse=True))}
+        numbered = {label: f"{order[label] + 1}. {names[label]}" for label in sizes}
+        self.chapter_order = [numbered[label] for label in sorted(sizes, key=order.get)]
+        logger.info(f"📑 {len(sizes)} capítulos detectados por tema")
+        return [numbered[label] for label in labels]
@@ -0,0 +1,43 @@
+import logging
+import importlib.util
+from functools import lru_cache
+
+from bs4 import BeautifulSoup
+
+from backend.config import PARSER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Backends de BeautifulSoup de más rápido a más lento, con el módulo que necesitan
+PARSER_BACKENDS = {
+    'lxml': 'lxml',
+    'html5lib': 'html5lib',
+    'html.parser': None,  # Incluido en la librería estándar, siempre disponible
+}
+
+
+def available_parsers():
+    """Backends instalados en este entorno"""
+    return [name for name, module in PARSER_BACKENDS.items()
+            if module is None or importlib.util.find_spec(module) is not None]
+
+
+@lru_cache(maxsize=None)
+def resolve_parser(name=None):
+    """Backend a usar: el configurado si está instalado, si no html.parser.
+
+    'auto' elige lxml cuando está disponible (parser en C, varias veces más rápido).
+    """
+    name = name or PARSER_CONFIG['backend']
+    available = available_parsers()
+    if name == 'auto':
+        return 'lxml' if 'lxml' in available else 'html.parser'
+    if name not in available:
+        logger.warning(f"Parser HTML '{name}' no disponible, usando html.parser")
+        return 'html.parser'
+    return name
+
+
+def make_soup(markup, parser=None):
+    """Construir un BeautifulSoup con el backend configurado para el despliegue"""
+    return BeautifulSoup(markup, resolve_parser(parser))
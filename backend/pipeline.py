@@ -0,0 +1,84 @@
+import logging
+from functools import partial
+
+from backend.database import DBManager
+from backend.scraper import ContentScraper
+from backend.organizers import ContentOrganizer
+from backend.generators import BookGenerator
+from backend.metrics import JobTimings, STAGE_SECONDS, JOBS, ARTICLES_PER_JOB, PDF_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+def _finish(store, job_id, timings, outcome, **fields):
+    """Registrar el final del trabajo con su desglose de tiempos"""
+    JOBS.inc(outcome=outcome)
+    breakdown = timings.as_dict()
+    if breakdown:
+        fields['timings'] = breakdown
+    store.update(job_id, **fields)
+
+
+def run_generation(store, job_id, blog_url, db_path, book_cache, download_prefix):
+    """Pipeline completo scraping → organización → PDF, ejecutado en el pool de trabajos"""
+    timings = JobTimings()
+    progress = partial(store.add_event, job_id)  # Eventos de avance para /jobs/<id>/events
+    try:
+        store.update(job_id, state='scraping')
+        with DBManager(str(db_path)) as db:
+            scraper = ContentScraper(db, timings=timings, progress=progress)
+
+            logger.info(f"🚀 Iniciando scraping en: {blog_url}")
+            with timings.measure('scraping_s', STAGE_SECONDS, stage='scraping'):
+                scraped = scraper.scrape(blog_url)
+            if not scraped:
+                logger.error("❌ Error durante el scraping. No se pudo obtener contenido.")
+                _finish(store, job_id, timings, 'failed', state='failed',
+                        error='No se encontraron artículos en el blog o el scraping falló.')
+                return False
+
+            db.link_job_articles(job_id, scraper.article_ids)
+            article_count = db.count_job_articles(job_id)
+            if not article_count:
+                logger.warning("⚠️ No se encontraron artículos en el blog.")
+                _finish(store, job_id, timings, 'failed', state='failed',
+                        error='No se encontraron artículos en el blog proporcionado')
+                return False
+            ARTICLES_PER_JOB.observe(article_count)
+            timings.add('articles', article_count)
+
+            store.update(job_id, state='organizing')
+            with timings.measure('organizing_s', STAGE_SECONDS, stage='organizing'):
+                # Filas con las columnas justas, leídas por lotes en una sola pasada
+                organizer = ContentOrganizer(db.iter_job_articles(job_id))
+                book_structure = organizer.structure_content()
+
+            # Mismo conjunto de artículos y misma configuración: reutilizar el PDF
+            book_key = book_cache.key_for(book_structure)
+            if cached := book_cache.lookup(book_key):
+                _finish(store, job_id, timings, 'cached', state='done',
+                        download_url=f"{download_prefix}/{cached.name}")
+                return True
+
+            store.update(job_id, state='rendering')
+            temp_file = book_cache.temp_path_for(book_key)
+            generator = BookGenerator(str(temp_file), progress=progress)
+            with timings.measure('rendering_s', STAGE_SECONDS, stage='rendering'):
+                rendered = generator.generate_book(book_structure)
+            if rendered:
+                PDF_BYTES.observe(temp_file.stat().st_size)
+                timings.add('pdf_bytes', temp_file.stat().st_size)
+                output_file = book_cache.commit(book_key, temp_file)
+                logger.info(f"✅ Libro generado exitosamente: {output_file}")
+                _finish(store, job_id, timings, 'done', state='done',
+                        download_url=f"{download_prefix}/{output_file.name}")
+                return True
+
+        logger.error("❌ Error generando el libro PDF.")
+        _finish(store, job_id, timings, 'failed', state='failed', error='Error generando el libro PDF')
+        return False
+
+    except Exception as e:
+        logger.error(f"Error en generación: {str(e)}", exc_info=True)
+        _finish(store, job_id, timings, 'failed', state='failed', error='Error interno del servidor')
+        return False
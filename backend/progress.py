@@ -0,0 +1,66 @@
+import time
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Callback de progreso: report(tipo_de_evento, **datos)
+ProgressCallback = Callable[..., None]
+
+
+def report_progress(callback: Optional[ProgressCallback], kind: str, **data):
+    """Enviar un evento de progreso; un fallo al notificar nunca interrumpe el trabajo"""
+    if callback is None:
+        return
+    try:
+        callback(kind, **data)
+    except Exception as e:
+        logger.debug(f"No se pudo registrar el progreso ({kind}): {str(e)}")
+
+
+class ProgressTracker:
+    """Avance de una etapa (artículos, capítulos) con estimación del tiempo restante.
+
+    Los eventos se limitan a uno cada `min_interval` segundos, salvo el último,
+    para que una etapa con miles de elementos no inunde el registro de eventos.
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback], kind: str, total: int,
+                 min_interval: float = 0.5, **fields):
+        self.callback = callback
+        self.kind = kind
+        self.total = total
+        self.min_interval = min_interval
+        self.fields = fields
+        self.counts = {}
+        self.done = 0
+        self.started = time.monotonic()
+        self._last_emit = 0.0
+
+    def eta(self) -> Optional[float]:
+        """Segundos restantes al ritmo medio observado hasta ahora"""
+        if not self.done or self.done >= self.total:
+            return 0.0 if self.done >= self.total else None
+        elapsed = time.monotonic() - self.started
+        return round(elapsed / self.done * (self.total - self.done), 1)
+
+    def advance(self, step: int = 1, counts: Optional[dict] = None, **fields):
+        """Contar `step` elementos terminados.
+
+        `counts` se suma a los contadores acumulados ({'parsed': 1}); `fields`
+        sustituye los campos de posición (chapter=3, title=...).
+        """
+        self.done += step
+        for key, value in (counts or {}).items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        self.fields.update(fields)
+        now = time.monotonic()
+        if self.done >= self.total or now - self._last_emit >= self.min_interval:
+            self.emit()
+
+    def emit(self):
+        if self.callback is None:
+            return
+        self._last_emit = time.monotonic()
+        report_progress(self.callback, self.kind, done=self.done, total=self.total,
+                        eta_s=self.eta(), **self.fields, **self.counts)
@@ -0,0 +1,209 @@
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from backend.config import RATE_LIMIT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Respuestas con las que el servidor pide que bajemos el ritmo
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos de una cabecera Retry-After (número de segundos o fecha HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def parse_crawl_delay(robots_txt: Optional[bytes], user_agent: str = '*') -> Optional[float]:
+    """Crawl-delay de robots.txt para nuestro User-Agent (o el grupo '*').
+
+    Se lee a mano porque RobotFileParser solo acepta valores enteros ("Crawl-delay: 0.5"
+    se ignoraría); los grupos se eligen igual que él, por el nombre del User-Agent.
+    """
+    if not robots_txt:
+        return None
+    agent = user_agent.split('/')[0].lower()
+    delays = {}  # User-agent del grupo -> Crawl-delay
+    group, in_rules = [], False
+    for line in robots_txt.decode('utf-8', errors='replace').splitlines():
+        key, _, value = line.split('#', 1)[0].partition(':')
+        key, value = key.strip().lower(), value.strip()
+        if key == 'user-agent':
+            if in_rules:
+                group, in_rules = [], False
+            group.append(value.lower())
+        elif key:
+            in_rules = True
+            if key == 'crawl-delay':
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for name in group:
+                    delays.setdefault(name, delay)
+    delay = next((delays[name] for name in delays if name != '*' and name in agent), delays.get('*'))
+    return delay if delay and delay > 0 else None
+
+
+class HostBucket:
+    """Cubo de tokens de un host con ritmo adaptativo (AIMD).
+
+    Cada respuesta sana suma `increase` peticiones/s hasta `max_rate` (o hasta
+    el ritmo que marque Crawl-delay); un 429/503 divide el ritmo por la mitad y
+    bloquea el host con una espera exponencial o la indicada en Retry-After.
+    """
+
+    def __init__(self, rate: float, max_rate: float, crawl_delay: Optional[float] = None):
+        self.crawl_delay = crawl_delay
+        self.max_rate = min(max_rate, 1 / crawl_delay) if crawl_delay else max_rate
+        self.rate = min(rate, self.max_rate)
+        self.burst = RATE_LIMIT_CONFIG['burst']
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0  # Respuestas de throttling consecutivas
+        self.loaded = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Reservar un token; devuelve los segundos que hay que esperar para usarlo"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1  # Negativo = reservado a cuenta de los próximos tokens
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def success(self):
+        self.failures = 0
+        self.rate = min(self.max_rate, self.rate + RATE_LIMIT_CONFIG['increase'])
+
+    def throttled(self, retry_after: Optional[float]) -> float:
+        """Aplicar el retroceso; devuelve los segundos que el host queda bloqueado"""
+        now = time.monotonic()
+        self._refill(now)
+        self.failures += 1
+        self.rate = max(RATE_LIMIT_CONFIG['min_rate'], self.rate * RATE_LIMIT_CONFIG['decrease'])
+        backoff = min(RATE_LIMIT_CONFIG['max_backoff'],
+                      RATE_LIMIT_CONFIG['backoff_base'] * 2 ** (self.failures - 1))
+        if retry_after is not None:
+            backoff = min(RATE_LIMIT_CONFIG['max_backoff'], max(backoff, retry_after))
+        self.blocked_until = max(self.blocked_until, now + backoff)
+        self.tokens = min(self.tokens, 0.0)  # Sin ráfaga al desbloquearse
+        return backoff
+
+
+class RateLimiter:
+    """Limitador de peticiones por host compartido por todos los scrapers del proceso.
+
+    El ritmo inicial de cada host sale de su Crawl-delay (robots.txt, leído una
+    vez por host y refrescado cada `robots_ttl` segundos) o de `default_rate`.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._buckets: Dict[str, HostBucket] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _bucket(self, url: str, robots_loader: Optional[Callable[[str], Optional[float]]]) -> HostBucket:
+        host = self.host(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket and time.monotonic() - bucket.loaded < RATE_LIMIT_CONFIG['robots_ttl']:
+                return bucket
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        # robots.txt se descarga fuera del lock global: un host lento no frena a los demás
+        with host_lock:
+            with self._lock:
+                current = self._buckets.get(host)
+            if current and time.monotonic() - current.loaded < RATE_LIMIT_CONFIG['robots_ttl']:
+                return current
+            crawl_delay = None
+            if robots_loader is not None:
+                try:
+                    crawl_delay = robots_loader(url)
+                except Exception as e:
+                    logger.debug(f"No se pudo leer robots.txt de {host}: {str(e)}")
+            bucket = HostBucket(current.rate if current else RATE_LIMIT_CONFIG['default_rate'],
+                                RATE_LIMIT_CONFIG['max_rate'], crawl_delay)
+            if current:
+                bucket.blocked_until, bucket.failures = current.blocked_until, current.failures
+            if crawl_delay:
+                logger.info(f"🤖 Crawl-delay de {host}: {crawl_delay:g} s")
+            with self._lock:
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str, robots_loader: Optional[Callable[[str], Optional[float]]] = None) -> float:
+        """Esperar turno para pedir `url`; devuelve los segundos esperados.
+
+        `robots_loader(url)` devuelve el Crawl-delay del host de `url` la primera vez que se ve.
+        """
+        if not self.enabled:
+            return 0.0
+        bucket = self._bucket(url, robots_loader)
+        with self._lock:
+            wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def feedback(self, url: str, status: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Ajustar el ritmo según la respuesta; devuelve el retroceso aplicado, o None si fue sana"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(self.host(url))
+            if bucket is None:
+                return None
+            if status not in THROTTLE_STATUSES:
+                if status < 500:
+                    bucket.success()
+                return None
+            backoff = bucket.throttled(parse_retry_after(retry_after))
+            rate = bucket.rate
+        logger.warning(f"🐢 {self.host(url)} respondió {status}: pausa de {backoff:.1f} s, "
+                       f"ritmo {rate:.2f} pet/s")
+        return backoff
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {host: {'rate': round(bucket.rate, 3), 'crawl_delay': bucket.crawl_delay,
+                           'failures': bucket.failures}
+                    for host, bucket in self._buckets.items()}
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Limitador compartido del proceso"""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(enabled=RATE_LIMIT_CONFIG['enabled'])
+        return _shared_limiter
@@ -4,25 +4,78 @@ from urllib.parse import urljoin, urlparse
 from datetime import datetime
 import logging
 from tqdm import tqdm
-import random
-import time
-from typing import List, Optional
-from selenium import webdriver
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-from backend.config import SELECTORS
-from backend.database import DBManager
+from backend.config import SELECTORS, SCRAPER_CONFIG, DEDUP_CONFIG
+from backend.database import DBManager, PLACEHOLDER_CONTENT
+from backend.http_cache import HTTPCache, get_http_cache
+from backend.domain_memory import DomainMemory, get_domain_memory
+from backend.browser_pool import BrowserPool, get_browser_pool
+from backend.rate_limit import RateLimiter, get_rate_limiter, parse_crawl_delay, THROTTLE_STATUSES
+from backend.utils import normalize_url, content_hash, parse_date
+from backend.parsing import make_soup
+from backend.discovery import ArticleDiscovery
+from backend.classifiers import classify_articles
+from backend.progress import ProgressCallback, ProgressTracker, report_progress
+from backend.metrics import (JobTimings, FETCH_SECONDS, FETCH_BYTES, FETCH_PAGES, HTTP_CACHE_RESULTS,
+                             PARSE_SECONDS, DB_WRITE_SECONDS, RATE_LIMIT_WAIT_SECONDS, THROTTLED_RESPONSES)
+from backend.dedup import Deduplicator
+from backend.extraction import ArticleExtractor, EXTRACTED_FIELDS, structured_metadata
 
 logger = logging.getLogger(__name__)
 
+FALLBACK_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Safari/605.1.15"
+
+FIELD_LABELS = {'title': 'Título', 'content': 'Contenido', 'date': 'Fecha'}
+
+# Estrategias de descarga en orden de coste
+FETCH_STRATEGIES = ('requests', 'requests_alt_ua', 'selenium')
+
 class ContentScraper:
-    def __init__(self, db_manager: DBManager, max_articles: int = 50):
+    def __init__(self, db_manager: DBManager, max_articles: int = 50,
+                 max_workers: Optional[int] = None, max_per_host: Optional[int] = None,
+                 http_cache: Optional[HTTPCache] = None,
+                 domain_memory: Optional[DomainMemory] = None,
+                 browser_pool: Optional[BrowserPool] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 timings: Optional[JobTimings] = None,
+                 progress: Optional[ProgressCallback] = None):
         self.db = db_manager
         self.max_articles = max_articles
+        self.max_workers = max(1, max_workers or SCRAPER_CONFIG['max_workers'])
+        self.max_per_host = max(1, max_per_host or SCRAPER_CONFIG['max_per_host'])
+        self.max_retries = SCRAPER_CONFIG['max_retries']
+        self.revalidate = SCRAPER_CONFIG['revalidate_without_lastmod']
         self.session = requests.Session()
-        self.driver = None  # Para Selenium
+        self.cache = http_cache if http_cache is not None else get_http_cache()
+        self.domains = domain_memory if domain_memory is not None else get_domain_memory()
+        self.browsers = browser_pool if browser_pool is not None else get_browser_pool()
+        self.limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.timings = timings if timings is not None else JobTimings()  # Desglose de tiempos del trabajo
+        self.progress = progress  # Eventos de avance para el cliente (SSE)
+        self._pages = {}  # Páginas de listado ya descargadas en este crawl
+        self.article_ids = []  # Artículos del corpus que forman este libro
+        self.discovered = {}  # URL -> lastmod de los artículos hallados en sitemaps/feeds
+        self._crawl_updates = {}  # URL normalizada -> cambios del estado de crawl del blog
+        self.dedup = None  # Deduplicador del crawl en curso
+        self._dedup_seed = {}  # Artículos guardados del blog con los que se compara lo nuevo: {url: id}
+        self._dedup_seeded = False
+        self._domain = ''  # Dominio del blog en curso
+        self.discovery = ArticleDiscovery(self._fetch_document, max_articles=max_articles)
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(self.max_per_host))
+        self._host_slots_lock = threading.Lock()
+        
+        # Pool de conexiones dimensionado para las descargas concurrentes
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
         # Configurar User-Agent realista
         self.session.headers = {
@@ -30,71 +83,180 @@ class ContentScraper:
             "Accept-Language": "es-ES,es;q=0.9",
         }
 
-    def _init_selenium(self):
-        """Inicializar Selenium como fallback"""
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Semáforo que limita las peticiones simultáneas por host"""
+        host = urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            return self._host_slots[host]
 
-    def _get_page(self, url: str) -> Optional[BeautifulSoup]:
-        """Obtener página con 3 estrategias diferentes"""
+    def _crawl_delay(self, url: str) -> Optional[float]:
+        """Crawl-delay del robots.txt del host (sin pasar por el limitador, que lo está pidiendo)"""
+        robots_url = '{0.scheme}://{0.netloc}/robots.txt'.format(urlparse(url))
+        return parse_crawl_delay(self._http_fetch(robots_url, strategy='document', throttle=False)[0],
+                                 self.session.headers.get('User-Agent', '*'))
+
+    def _throttle(self, url: str):
+        """Esperar el turno del host según el limitador compartido del proceso"""
+        waited = self.limiter.acquire(url, self._crawl_delay)
+        if waited > 0:
+            self.timings.add('rate_wait_s', waited)
+            RATE_LIMIT_WAIT_SECONDS.observe(waited)
+
+    def _http_fetch(self, url: str, headers: Optional[dict] = None, use_cache: bool = True,
+                    strategy: str = 'requests', throttle: bool = True) -> Tuple[bytes, Optional[str]]:
+        """GET con caché en disco y revalidación condicional (ETag / Last-Modified).
+
+        Las peticiones reales pasan por el limitador del host; ante 429/503 se
+        reintentan tras el retroceso que marque el limitador (o Retry-After).
+        Devuelve el cuerpo en bytes y su codificación.
+        """
+        entry = self.cache.lookup(url) if (self.cache and use_cache) else None
+        if entry and self.cache.is_fresh(entry):
+            logger.debug(f"💾 Caché HTTP (fresca): {url}")
+            HTTP_CACHE_RESULTS.inc(result='fresh')
+            return entry.body, entry.encoding
+        
+        request_headers = dict(headers or {})
+        request_headers.update(HTTPCache.conditional_headers(entry))
+        for _ in range(self.max_retries + 1):
+            if throttle:
+                self._throttle(url)  # Cortesía solo para peticiones reales
+            with self.timings.measure('fetch_s', FETCH_SECONDS, strategy=strategy):
+                response = self.session.get(url, timeout=15, headers=request_headers or None)
+            if response.status_code not in THROTTLE_STATUSES:
+                self.limiter.feedback(url, response.status_code)
+                break
+            THROTTLED_RESPONSES.inc(status=response.status_code)
+            self.timings.add('throttled_responses')
+            backoff = self.limiter.feedback(url, response.status_code, response.headers.get('Retry-After'))
+            if backoff is None or not throttle:
+                break  # Sin limitador (o pidiendo robots.txt) no se reintenta a ciegas
+        if response.status_code == 304 and entry:
+            logger.debug(f"💾 Caché HTTP (304): {url}")
+            HTTP_CACHE_RESULTS.inc(result='revalidated')
+            self.cache.revalidated(url, response)
+            return entry.body, entry.encoding
+        
+        if self.cache and use_cache:
+            HTTP_CACHE_RESULTS.inc(result='miss')
+        FETCH_BYTES.inc(len(response.content), strategy=strategy)
+        self.timings.add('bytes_downloaded', len(response.content))
+        response.raise_for_status()
+        if self.cache and use_cache:
+            self.cache.store(url, response)
+        return response.content, response.encoding or response.apparent_encoding
+
+    def _http_get(self, url: str, headers: Optional[dict] = None, use_cache: bool = True,
+                  strategy: str = 'requests') -> str:
+        body, encoding = self._http_fetch(url, headers=headers, use_cache=use_cache, strategy=strategy)
+        return body.decode(encoding or 'utf-8', errors='replace')
+
+    def _fetch_document(self, url: str) -> Optional[bytes]:
+        """Descargar un documento auxiliar (robots.txt, sitemap, feed); None si no existe"""
         try:
-            # Intento 1: Requests estándar
-            time.sleep(random.uniform(1, 3))
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            if len(soup.find_all(SELECTORS['articles'][0])) > 0:
-                return soup
-                
-            # Intento 2: Requests con User-Agent diferente
-            self.session.headers["User-Agent"] = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Safari/605.1.15"
-            response = self.session.get(url, timeout=15)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            if len(soup.find_all(SELECTORS['articles'][0])) > 0:
-                return soup
-                
-            # Intento 3: Selenium para JavaScript
-            if not self.driver:
-                self._init_selenium()
-                
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS['articles'][0]))
-            )
-            return BeautifulSoup(self.driver.page_source, 'html.parser')
-            
+            with self._host_slot(url):
+                return self._http_fetch(url, strategy='document')[0]
         except Exception as e:
-            logger.error(f"Error obteniendo {url}: {str(e)}")
+            logger.debug(f"No se pudo obtener {url}: {str(e)}")
+            return None
+
+    def _fetch_html(self, url: str, strategy: str) -> str:
+        """Descargar el HTML de una URL con una estrategia concreta"""
+        if strategy == 'requests':
+            return self._http_get(url)
+        if strategy == 'requests_alt_ua':
+            # User-Agent por petición: la sesión es compartida entre hilos
+            return self._http_get(url, headers={"User-Agent": FALLBACK_USER_AGENT}, use_cache=False,
+                                  strategy=strategy)
+        
+        # Selenium para JavaScript, con un navegador prestado por el pool del proceso
+        with self.browsers.lease() as driver:
+            self._throttle(url)
+            with self.timings.measure('fetch_s', FETCH_SECONDS, strategy=strategy):
+                driver.get(url)
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS['articles'][0]))
+                )
+                html = driver.page_source
+        FETCH_BYTES.inc(len(html), strategy=strategy)
+        self.timings.add('bytes_downloaded', len(html))
+        return html
+
+    def _get_page(self, url: str) -> Optional[BeautifulSoup]:
+        """Obtener página empezando por la estrategia que ya funcionó en este dominio"""
+        domain = urlparse(url).netloc.lower()
+        preferred = self.domains.get(domain, 'fetch_strategy')
+        strategies = sorted(FETCH_STRATEGIES, key=lambda strategy: strategy != preferred)
+        
+        with self._host_slot(url):
+            for strategy in strategies:
+                # Un fallo de una estrategia (timeout de Selenium, sin driver...) no impide probar las demás
+                try:
+                    html = self._fetch_html(url, strategy)
+                    with self.timings.measure('parse_s', PARSE_SECONDS, step='html'):
+                        soup = make_soup(html)
+                except Exception as e:
+                    FETCH_PAGES.inc(strategy=strategy, outcome='error')
+                    logger.warning(f"Estrategia '{strategy}' falló para {url}: {str(e)}")
+                    continue
+                self.timings.add('pages_fetched')
+                if len(soup.find_all(SELECTORS['articles'][0])) > 0:
+                    FETCH_PAGES.inc(strategy=strategy, outcome='ok')
+                    if strategy != preferred:
+                        logger.info(f"🧠 Estrategia '{strategy}' memorizada para {domain}")
+                        self.domains.set(domain, 'fetch_strategy', strategy)
+                    return soup
+                FETCH_PAGES.inc(strategy=strategy, outcome='invalid')
+            logger.error(f"Error obteniendo {url}: ninguna estrategia devolvió contenido válido")
             return None
 
+    def _get_listing_page(self, url: str) -> Optional[BeautifulSoup]:
+        """Páginas de listado: se reutilizan si ya se descargaron en este crawl"""
+        key = normalize_url(url)
+        if key not in self._pages:
+            self._pages[key] = self._get_page(url)
+        return self._pages[key]
+
+    def _selectors(self, domain: str, kind: str) -> List[str]:
+        """Cascada de SELECTORS empezando por el selector aprendido para el dominio"""
+        learned = self.domains.get(domain, 'selectors', {}).get(kind)
+        if learned in SELECTORS[kind]:
+            return [learned] + [selector for selector in SELECTORS[kind] if selector != learned]
+        return SELECTORS[kind]
+
+    def _learn_selector(self, domain: str, kind: str, selector: str):
+        """Memorizar el selector ganador; si deja de funcionar se reaprende en la cascada"""
+        self.domains.set_item(domain, 'selectors', kind, selector)
+
     def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extraer enlaces con múltiples estrategias"""
         links = []
+        domain = urlparse(base_url).netloc.lower()
+        link_selectors = self._selectors(domain, 'article_link')
         
         # Probar múltiples selectores para encontrar artículos
-        for selector in SELECTORS['articles']:
+        for selector in self._selectors(domain, 'articles'):
             articles = soup.select(selector)
             logger.info(f"🔍 Probando selector de artículos: '{selector}' - Encontrados: {len(articles)}")
+            winning_link_selector = None
             for article in articles:
                 link = None
-                for link_selector in SELECTORS['article_link']:
+                for link_selector in link_selectors:
                     elem = article.select_one(link_selector)
                     if elem and (href := elem.get('href')):
                         link = urljoin(base_url, href)
+                        winning_link_selector = winning_link_selector or link_selector
                         break
                 if link and link not in links:
                     links.append(link)
             if links:
+                self._learn_selector(domain, 'articles', selector)
+                self._learn_selector(domain, 'article_link', winning_link_selector)
                 break  # Detener si se encuentran enlaces válidos
         
         # Si no se encuentran enlaces, probar selectores genéricos
         if not links:
-            for link_selector in SELECTORS['article_link']:
+            for link_selector in link_selectors:
                 generic_links = [urljoin(base_url, a['href']) for a in soup.select(link_selector)]
                 logger.info(f"🔍 Probando selector de enlaces genéricos: '{link_selector}' - Encontrados: {len(generic_links)}")
                 links.extend(generic_links)
@@ -103,50 +265,144 @@ class ContentScraper:
         
         return list(dict.fromkeys(links))[:self.max_articles]
 
+    def _extract_fields(self, soup: BeautifulSoup, domain: str) -> dict:
+        """Título, contenido (párrafos) y fecha: metadatos estructurados y, para lo que falte, selectores"""
+        # 1. Metadatos estructurados (JSON-LD, microdatos, OpenGraph)
+        metadata = structured_metadata(soup)
+        if metadata.sources:
+            logger.info("🏷️ Metadatos estructurados: " + ", ".join(
+                f"{FIELD_LABELS[field]} ({source})" for field, source in metadata.sources.items()))
+        found = {'title': metadata.title, 'content': metadata.paragraphs, 'date': metadata.date}
+        
+        # 2. Los campos que falten, con la cascada de selectores en un solo recorrido del DOM
+        missing = [field for field in EXTRACTED_FIELDS if not found[field]]
+        if missing:
+            extractor = ArticleExtractor({field: self._selectors(domain, field) for field in missing})
+            extraction = extractor.extract(soup)
+            for field, selector in extraction.selectors.items():
+                self._learn_selector(domain, field, selector)
+                logger.info(f"✅ {FIELD_LABELS[field]}: selector '{selector}'")
+            found['title'] = found['title'] or extraction.title
+            found['content'] = found['content'] or extraction.paragraphs
+            found['date'] = found['date'] or extraction.date
+        return found
+
     def _parse_article(self, url: str) -> Optional[dict]:
         """Parsear un artículo con múltiples estrategias"""
         try:
             soup = self._get_page(url)
             if not soup:
                 return None
+            domain = urlparse(url).netloc.lower()
 
-            # Probar múltiples selectores para el título
-            title = None
-            for selector in SELECTORS['title']:
-                if elem := soup.select_one(selector):
-                    title = elem.text.strip()
-                    logger.info(f"✅ Título encontrado con selector '{selector}': {title}")
-                    break
-
-            # Probar múltiples selectores para el contenido
-            content = None
-            for selector in SELECTORS['content']:
-                if elems := soup.select(selector):
-                    content = "\n".join([e.text.strip() for e in elems])
-                    logger.info(f"✅ Contenido encontrado con selector '{selector}'")
-                    break
-
-            # Probar múltiples selectores para la fecha
-            date = None
-            for selector in SELECTORS['date']:
-                if elem := soup.select_one(selector):
-                    date_str = elem.text.strip()
-                    date = self._parse_date(date_str)
-                    logger.info(f"✅ Fecha encontrada con selector '{selector}': {date}")
-                    break
+            with self.timings.measure('extract_s', PARSE_SECONDS, step='extract'):
+                found = self._extract_fields(soup, domain)
+            
+            title = found['title']
+            content = "\n".join(found['content'] or [])
+            date = parse_date(found['date'])
 
             return {
                 'title': title or "Título no encontrado",
-                'content': content or "Contenido no disponible",
+                'content': content or PLACEHOLDER_CONTENT,
                 'url': url,
-                'date': date,
-                'category': self._detect_category(content or ""),
-                'level': self._detect_difficulty(content or "")
+                'date': date
             }
         except Exception as e:
             logger.error(f"Error procesando {url}: {str(e)}")
             return None
 
+    def _fetch_article(self, url: str) -> Optional[dict]:
+        """Descargar y parsear un artículo desde un hilo del pool"""
+        return self._parse_article(url)
+
+    def _flush_articles(self, buffer: List[dict]) -> int:
+        """Guardar en bloque los artículos pendientes y vaciar el buffer"""
+        if not buffer:
+            return 0
+        with self.timings.measure('dedup_s'):
+            self._seed_dedup()
+            articles, duplicates = self.dedup.process(buffer) if self.dedup else (list(buffer), {})
+        with self.timings.measure('classify_s'):
+            classify_articles(articles)  # Categoría y nivel del lote en una pasada vectorizada
+        with self.timings.measure('db_write_s', DB_WRITE_SECONDS):
+            ids = self.db.bulk_upsert_articles(articles)
+        now = datetime.now()
+        saved = 0
+        for article_data, article_id in zip(articles, ids):
+            if article_id is None:
+                continue
+            self.article_ids.append(article_id)
+            self._crawl_updates.setdefault(normalize_url(article_data['url']), {}).update({
+                'article_id': article_id,
+                'last_fetched': now
+            })
+            saved += 1
+        self.timings.add('articles_saved', saved)
+        
+        # Las URLs duplicadas apuntan al artículo conservado: no se vuelven a descargar
+        for url, original in duplicates.items():
+            key = normalize_url(original)
+            if article_id := self._crawl_updates.get(key, {}).get('article_id') or self._dedup_seed.get(key):
+                self._crawl_updates.setdefault(normalize_url(url), {})['article_id'] = article_id
+        buffer.clear()
+        return saved
+
+    def _seed_dedup(self):
+        """Cargar en el deduplicador los artículos ya guardados del blog y los párrafos
+        repetitivos conocidos del dominio (una vez por crawl, y solo si hay algo nuevo que guardar)"""
+        if not self.dedup or self._dedup_seeded:
+            return
+        self._dedup_seeded = True
+        rows = list(self.db.iter_articles(self._dedup_seed.values()))
+        self.dedup.seed((row.url, row.title, row.content) for row in rows)
+        self._dedup_seed = {row.url: row.id for row in rows}
+        domains = {urlparse(row.url).netloc.lower() for row in rows}
+        if self._domain:
+            domains.add(self._domain)
+        for domain in domains:
+            self.dedup.learn_boilerplate(domain, self.domains.get(domain, 'boilerplate', []))
+        if rows:
+            logger.info(f"♻️ Deduplicación frente a {len(rows)} artículos ya guardados del blog")
+
+    def _crawl_listing(self, base_url: str, soup: BeautifulSoup, known: Optional[set] = None) -> List[str]:
+        """Descubrir artículos recorriendo las páginas de listado (heurísticas de SELECTORS['next_page']).
+
+        En un re-crawl se deja de paginar en cuanto una página solo trae URLs ya conocidas.
+        """
+        known = known or set()
+        article_urls = []
+        next_page = base_url
+        max_depth = 5  # Límite de páginas
+        
+        with tqdm(desc="🔍 Buscando artículos", unit="pág") as pbar:
+            while next_page and len(article_urls) < self.max_articles and max_depth > 0:
+                current_soup = self._get_listing_page(next_page) or soup
+                new_links = self._extract_links(current_soup, base_url)
+                article_urls.extend(new_links)
+                if known and all(normalize_url(link) in known for link in new_links):
+                    logger.info("⏭️ Página de listado sin artículos nuevos, fin de la paginación")
+                    break
+                
+                # Paginación inteligente
+                next_page = None
+                for selector in SELECTORS['next_page']:
+                    if elem := current_soup.select_one(selector):
+                        next_page = urljoin(base_url, elem.get('href', ''))
+                        break
+                
+                max_depth -= 1
+                pbar.update(1)
+        return article_urls
+
+    def _has_changed(self, url: str, crawl_state: dict) -> Optional[bool]:
+        """¿Cambió el artículo desde el último crawl? None si no hay lastmod con el que saberlo"""
+        lastmod = self.discovered.get(url)
+        entry = crawl_state.get(normalize_url(url))
+        if lastmod is None or entry is None or entry.lastmod is None:
+            return None
+        return lastmod > entry.lastmod
+
     def scrape(self, base_url: str) -> bool:
         """Flujo principal de scraping mejorado"""
         parsed_url = urlparse(base_url)
@@ -156,57 +412,130 @@ class ContentScraper:
             logger.info("🔍 Verificando estructura del sitio web...")
             logger.info(f"Usando selectores: {SELECTORS}")
             
-            soup = self._get_page(base_url)
-            if not soup:
-                logger.error("❌ No se pudo obtener la página inicial")
-                return False
+            self._pages.clear()
+            self._crawl_updates.clear()
+            self.dedup = Deduplicator() if DEDUP_CONFIG['enabled'] else None
+            crawl_state = self.db.get_crawl_state(base_url)
+            self._domain = parsed_url.netloc.lower()
+            self._dedup_seed = {url: entry.article_id for url, entry in crawl_state.items() if entry.article_id}
+            self._dedup_seeded = False
+            
+            # 1. Sitemaps y feeds: todo el listado en una o dos peticiones
+            discovered = self.discovery.discover(base_url, lambda: self._get_listing_page(base_url))
+            self.discovered = {entry.url: entry.lastmod for entry in discovered}
+            article_urls = list(self.discovered)
+            
+            # 2. Si no hay sitemap ni feed, recorrer la paginación HTML
+            if not article_urls:
+                soup = self._get_listing_page(base_url)
+                if not soup:
+                    logger.error("❌ No se pudo obtener la página inicial")
+                    return False
+                article_urls = self._crawl_listing(base_url, soup, known=set(crawl_state))
 
-            article_urls = []
-            next_page = base_url
-            max_depth = 5  # Límite de páginas
+            # Los artículos ya presentes en el corpus compartido se reutilizan sin descargarlos,
+            # salvo que el sitemap/feed indique que cambiaron desde el último crawl. Sin lastmod
+            # se revalidan: GET condicional (caché HTTP) y comparación del hash del contenido
+            article_urls = list({normalize_url(url): url for url in article_urls}.values())
+            now = datetime.now()
+            for url in article_urls:
+                self._crawl_updates[normalize_url(url)] = {'last_seen': now, 'lastmod': self.discovered.get(url)}
             
-            with tqdm(desc="🔍 Buscando artículos", unit="pág") as pbar:
-                while next_page and len(article_urls) < self.max_articles and max_depth > 0:
-                    current_soup = self._get_page(next_page) or soup
-                    new_links = self._extract_links(current_soup, base_url)
-                    article_urls.extend(new_links)
-                    
-                    # Paginación inteligente
-                    next_page = None
-                    for selector in SELECTORS['next_page']:
-                        if elem := current_soup.select_one(selector):
-                            next_page = urljoin(base_url, elem.get('href', ''))
-                            break
-                    
-                    max_depth -= 1
-                    pbar.update(1)
-                    time.sleep(random.uniform(1, 2))
-
-            # Procesamiento paralelo básico
             success_count = 0
             with tqdm(total=len(article_urls), desc="📥 Procesando artículos") as pbar:
+                existing = self.db.existing_article_ids(article_urls)
+                # URLs descartadas como casi duplicadas en crawls anteriores: su estado
+                # apunta al artículo que se conservó, que es el que se reutiliza
                 for url in article_urls:
-                    if self.db.article_exists(url):
+                    entry = crawl_state.get(normalize_url(url))
+                    if url not in existing and entry is not None and entry.article_id:
+                        existing[url] = entry.article_id
+                status = {url: self._has_changed(url, crawl_state) for url in existing}
+                changed = {url for url, has_changed in status.items() if has_changed}
+                revalidated = {url for url, has_changed in status.items() if has_changed is None} if self.revalidate else set()
+                if changed:
+                    logger.info(f"🔄 {len(changed)} artículos modificados desde el último crawl")
+                if revalidated:
+                    logger.info(f"🔎 {len(revalidated)} artículos sin lastmod: se comprobará si cambiaron")
+                refetched = changed | revalidated
+                reused = {url: article_id for url, article_id in existing.items() if url not in refetched}
+                self.article_ids.extend(reused.values())
+                for url, article_id in reused.items():
+                    self._crawl_updates[normalize_url(url)]['article_id'] = article_id
+                pbar.update(len(reused))
+                pending_urls = [url for url in article_urls if url not in reused]
+                report_progress(self.progress, 'discovered', pages=len(article_urls), reused=len(reused),
+                                pending=len(pending_urls), source='sitemap' if self.discovered else 'listing')
+                tracker = ProgressTracker(self.progress, 'articles', len(pending_urls))
+                
+                # Descarga concurrente; el guardado se hace en este hilo por bloques
+                # (la sesión de BD no es thread-safe)
+                buffer = []
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = [executor.submit(self._fetch_article, url) for url in pending_urls]
+                    # En el orden del listado, no en el de llegada: article_ids y los
+                    # bloques guardados no dependen de la latencia de cada descarga
+                    for future in futures:
+                        article_data = future.result()
+                        tracker.advance(counts={'parsed': 1 if article_data else 0, 'skipped': 0 if article_data else 1})
+                        if article_data:
+                            url = article_data['url']
+                            key = normalize_url(url)
+                            raw_hash = content_hash(article_data['content'])
+                            previous = crawl_state.get(key)
+                            if url in revalidated and previous and previous.content_hash == raw_hash:
+                                # Mismo contenido que en el último crawl: se conserva el artículo guardado
+                                self.article_ids.append(existing[url])
+                                self._crawl_updates[key].update({'article_id': existing[url], 'last_fetched': now})
+                                pbar.update(1)
+                                continue
+                            # Hash de lo descargado (antes de la deduplicación) para la próxima revalidación
+                            self._crawl_updates.setdefault(key, {})['content_hash'] = raw_hash
+                            logger.info(f"📥 Procesando artículo: {article_data['title']}")
+                            buffer.append(article_data)
+                            if len(buffer) >= self.db.chunk_size:
+                                success_count += self._flush_articles(buffer)
                         pbar.update(1)
-                        continue
-                    
-                    article_data = self._parse_article(url)
-                    if article_data:
-                        logger.info(f"📥 Procesando artículo: {article_data['title']}")
-                        if self.db.save_article(article_data):
-                            success_count += 1
-                    pbar.update(1)
-                    time.sleep(random.uniform(0.5, 1.5))
+                success_count += self._flush_articles(buffer)
+            
+            # Si un artículo modificado no se pudo volver a descargar, se usa la versión guardada
+            for url in refetched:
+                if 'article_id' not in self._crawl_updates[normalize_url(url)]:
+                    self.article_ids.append(existing[url])
+            
+            # Artículos de crawls anteriores que esta vez no aparecieron en el listado
+            seen = set(self._crawl_updates)
+            previous = sorted(
+                (entry for url, entry in crawl_state.items() if url not in seen and entry.article_id),
+                key=lambda entry: entry.lastmod or entry.last_seen or datetime.min, reverse=True
+            )
+            # Las URLs descartadas como duplicadas comparten el artículo conservado
+            self.article_ids = list(dict.fromkeys(self.article_ids))
+            room = max(0, self.max_articles - len(self.article_ids))
+            known = set(self.article_ids)
+            self.article_ids.extend([article_id for article_id in dict.fromkeys(entry.article_id for entry in previous)
+                                     if article_id not in known][:room])
+            
+            self.db.update_crawl_state(base_url, [
+                {'url': url, **changes} for url, changes in self._crawl_updates.items()
+            ])
 
             if not article_urls:
                 logger.warning("⚠️ No se encontraron artículos en el sitio web.")
 
-            logger.info(f"✅ Artículos nuevos guardados: {success_count}/{len(article_urls)}")
-            return success_count > 0
+            if self.dedup and (self.dedup.duplicates or self.dedup.stripped_paragraphs):
+                logger.info(f"♻️ Deduplicación: {self.dedup.duplicates} artículos duplicados, "
+                            f"{self.dedup.stripped_paragraphs} párrafos repetitivos eliminados")
+            if self.dedup:
+                # Los párrafos repetitivos ya no están en lo guardado: se recuerdan para los próximos crawls
+                for domain, fingerprints in self.dedup.boilerplate().items():
+                    self.domains.set(domain, 'boilerplate', fingerprints)
+            report_progress(self.progress, 'scraped', saved=success_count, articles=len(self.article_ids),
+                            duplicates=self.dedup.duplicates if self.dedup else 0)
+            logger.info(f"✅ Artículos nuevos o actualizados: {success_count}/{len(article_urls)} "
+                        f"(reutilizados del corpus: {len(self.article_ids) - success_count})")
+            return len(self.article_ids) > 0
 
         except Exception as e:
             logger.error(f"🔥 Error crítico: {str(e)}", exc_info=True)
-            return False
-        finally:
-            if self.driver:
-                self.driver.quit()
\ No newline at end of file
+            return False
\ No newline at end of file
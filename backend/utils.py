@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from dateutil import parser as date_parser
+
+# Parámetros de seguimiento que no cambian el contenido de la página
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|_ga)$', re.IGNORECASE)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Forma canónica de una URL para deduplicar artículos entre peticiones"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'http'
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f'{host}:{parts.port}'
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def content_hash(text: str) -> str:
+    """Hash SHA-256 del texto normalizado (espacios colapsados)"""
+    normalized = ' '.join((text or '').split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def logging_setup() -> tuple:
+    """Nivel, formato y archivos de log de este proceso, para `init_process_logging` en un hijo"""
+    root = logging.getLogger()
+    formatter = next((handler.formatter for handler in root.handlers if handler.formatter), None)
+    fmt = getattr(formatter, '_fmt', None) or logging.BASIC_FORMAT
+    files = [handler.baseFilename for handler in root.handlers if isinstance(handler, logging.FileHandler)]
+    return root.level, fmt, getattr(formatter, 'datefmt', None), files
+
+
+def init_process_logging(level, fmt, datefmt, files):
+    """Inicializador de procesos hijos: con spawn no heredan la configuración de logging del padre"""
+    handlers = [logging.StreamHandler()] + [logging.FileHandler(path) for path in files]
+    logging.basicConfig(level=level, format=fmt, datefmt=datefmt, handlers=handlers, force=True)
+
+
+# Meses en español (y abreviaturas) para fechas como "20 de enero de 2024"
+SPANISH_MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6, 'jul': 7, 'ago': 8,
+    'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dic': 12,
+}
+_SPANISH_DATE_RE = re.compile(
+    r'(\d{1,2})\.?\s+(?:de\s+)?([a-záéíóú]+)\.?,?\s+(?:de\s+|del\s+)?(\d{4})', re.IGNORECASE
+)
+_NUMERIC_DATE_RE = re.compile(r'\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})\b')
+_YEAR_RE = re.compile(r'\b\d{4}\b')
+_YEAR_FIRST_RE = re.compile(r'^\d{4}\D')
+
+
+def _naive_utc(parsed: datetime) -> datetime:
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Fecha de publicación en cualquiera de los formatos habituales, en UTC sin zona.
+
+    ISO 8601 (JSON-LD, atributos datetime), RFC 822 (feeds), "20 de enero de 2024",
+    "20/01/2024" (día primero) y, como último recurso, dateutil. Memoizada: en un
+    blog las mismas cadenas se repiten en cada página.
+    """
+    if not value:
+        return None
+    value = ' '.join(value.split())
+    try:
+        return _naive_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except ValueError:
+        pass
+    try:
+        return _naive_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        if match := _SPANISH_DATE_RE.search(value):
+            day, month, year = match.groups()
+            if month.lower() in SPANISH_MONTHS:
+                return datetime(int(year), SPANISH_MONTHS[month.lower()], int(day))
+        if match := _NUMERIC_DATE_RE.search(value):
+            day, month, year = match.groups()
+            return datetime(int(year), int(month), int(day))
+    except ValueError:
+        pass
+    if not _YEAR_RE.search(value):
+        return None  # "hace 3 días", "ayer": dateutil inventaría la fecha
+    # "2024/01/05" y los ISO que fromisoformat no acepta (Python < 3.11) van año-mes-día
+    year_first = bool(_YEAR_FIRST_RE.match(value))
+    try:
+        return _naive_utc(date_parser.parse(value, yearfirst=year_first, dayfirst=not year_first, fuzzy=True))
+    except (ValueError, OverflowError, TypeError):
+        return None
@@ -0,0 +1,77 @@
+"""Comparar los backends de parser HTML sobre las páginas de ejemplo.
+
+Uso:
+    python benchmarks/bench_parsers.py [--repeat 20] [--json resultados.json]
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+from backend.config import SELECTORS
+from backend.parsing import available_parsers, make_soup
+from backend.extraction import ArticleExtractor, EXTRACTED_FIELDS, structured_metadata
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+
+def select_like_scraper(soup):
+    """Las búsquedas que hace el scraper sobre un artículo"""
+    soup.find_all(SELECTORS['articles'][0])
+    metadata = structured_metadata(soup)
+    missing = [field for field, value in zip(EXTRACTED_FIELDS, metadata) if not value]
+    if missing:
+        ArticleExtractor({field: SELECTORS[field] for field in missing}).extract(soup)
+
+
+def run(repeat):
+    results = []
+    fixtures = sorted(FIXTURES_DIR.glob('*.html'))
+    for fixture in fixtures:
+        markup = fixture.read_text(encoding='utf-8')
+        for parser in available_parsers():
+            select_like_scraper(make_soup(markup, parser))  # Calentamiento
+            parse_timings, select_timings = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                soup = make_soup(markup, parser)
+                parsed = time.perf_counter()
+                select_like_scraper(soup)
+                parse_timings.append(parsed - start)
+                select_timings.append(time.perf_counter() - parsed)
+            results.append({
+                'fixture': fixture.name,
+                'bytes': len(markup.encode('utf-8')),
+                'parser': parser,
+                'parse_ms': statistics.median(parse_timings) * 1000,
+                'select_ms': statistics.median(select_timings) * 1000,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', help='Guardar los resultados en este archivo')
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"{'fixture':<28} {'KB':>6} {'parser':<12} {'parseo ms':>10} {'selectores ms':>14} {'parseo vs html.parser':>22}")
+    baseline = {r['fixture']: r['parse_ms'] for r in results if r['parser'] == 'html.parser'}
+    for r in results:
+        speedup = baseline[r['fixture']] / r['parse_ms']
+        print(f"{r['fixture']:<28} {r['bytes'] / 1024:>6.1f} {r['parser']:<12} "
+              f"{r['parse_ms']:>10.2f} {r['select_ms']:>14.2f} {speedup:>21.2f}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
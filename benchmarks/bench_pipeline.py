@@ -0,0 +1,264 @@
+"""Medir el pipeline completo (/generate: scraping → organización → PDF) contra un blog sintético local.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--posts 60] [--style wordpress] [--runs 3] [--warm]
+                                        [--env RENDER_MODE=parallel] [--json resultados.json]
+                                        [--compare base.json]
+
+El limitador de peticiones por host está desactivado salvo que se pida con
+--env RATE_LIMIT_ENABLED=1 (útil junto a --max-rps / --crawl-delay del blog).
+
+Cada ejecución arranca en un proceso nuevo con directorios temporales propios
+(corpus, caché HTTP, memoria de dominios, libros), así que todas parten en frío.
+Con --warm se repite la petición en el mismo proceso para medir las cachés.
+El blog se sirve desde otro proceso para no mezclar su CPU ni su memoria con
+las del pipeline.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage
+    resource = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import fake_blog
+
+# Estados del trabajo que delimitan cada etapa
+STAGES = ('scraping', 'organizing', 'rendering')
+POLL_INTERVAL = 0.01
+# Métricas comparables entre ejecuciones y si "más es mejor"
+METRICS = {
+    'total_s': False, 'scraping_s': False, 'organizing_s': False, 'rendering_s': False,
+    'pages_per_sec': True, 'peak_rss_mb': False, 'pdf_bytes': False,
+}
+
+
+def _serve_blog(options, handler_options, counters, ready):
+    """Proceso del blog sintético"""
+    blog = fake_blog.FakeBlog(**options)
+    fake_blog.serve(blog, counters=counters, **handler_options)
+    ready.put(blog.base_url)
+    while True:
+        time.sleep(3600)
+
+
+def _peak_rss_mb(who):
+    if resource is None:
+        return None
+    return resource.getrusage(who).ru_maxrss / 1024  # KB en Linux
+
+
+def _measure(client, store, blog_url, counters):
+    """Una petición a /generate seguida hasta el final, con el momento en que empieza cada etapa"""
+    requests_before, bytes_before = counters['requests'].value, counters['bytes'].value
+    throttled_before, not_modified_before = counters['throttled'].value, counters['not_modified'].value
+    start = time.perf_counter()
+    response = client.post('/generate', json={'url': blog_url})
+    if response.status_code != 202:
+        return {'state': 'failed', 'error': f"HTTP {response.status_code}: {response.get_json()}"}
+    job_id = response.get_json()['job_id']
+
+    seen = {}
+    job = store.get(job_id)
+    while job['state'] not in ('done', 'failed'):
+        seen.setdefault(job['state'], time.perf_counter())
+        time.sleep(POLL_INTERVAL)
+        job = store.get(job_id)
+    end = time.perf_counter()
+
+    # Duración de cada etapa: hasta el comienzo de la siguiente que se observó
+    marks = [(state, seen[state]) for state in STAGES if state in seen] + [('done', end)]
+    stages = {f'{state}_s': None for state in STAGES}
+    for (state, began), (_, finished) in zip(marks, marks[1:]):
+        stages[f'{state}_s'] = round(finished - began, 4)
+
+    pages = counters['requests'].value - requests_before
+    scraping = stages['scraping_s']
+    return {
+        'state': job['state'],
+        'error': job.get('error'),
+        'job_id': job_id,
+        'download_url': job.get('download_url'),
+        'total_s': round(end - start, 4),
+        **stages,
+        'pages_fetched': pages,
+        'bytes_fetched': counters['bytes'].value - bytes_before,
+        'throttled': counters['throttled'].value - throttled_before,  # Respuestas 429 del blog
+        'not_modified': counters['not_modified'].value - not_modified_before,  # 304 (con --validators)
+        'pages_per_sec': round(pages / scraping, 2) if scraping and pages else None,
+        'breakdown': job.get('timings'),  # Desglose interno del pipeline (si METRICS_ENABLED)
+    }
+
+
+def _run_pipeline(blog_url, env, warm, counters, results):
+    """Proceso de una ejecución: importa la app con directorios temporales y mide /generate"""
+    workdir = Path(tempfile.mkdtemp(prefix='bench_pipeline_'))
+    os.environ.update({
+        'HTTP_CACHE_PATH': str(workdir / 'http_cache.db'),
+        'DOMAIN_MEMORY_PATH': str(workdir / 'domains.json'),
+        'RATE_LIMIT_ENABLED': '0',  # Servidor local: se mide el código, no la cortesía
+        'JOB_EXECUTOR': 'thread',
+        'TQDM_DISABLE': '1',
+        **env,
+    })
+    application = None
+    try:
+        import logging
+        import app as application
+        from backend.database import DBManager
+
+        logging.disable(logging.CRITICAL if not env.get('BENCH_VERBOSE') else logging.NOTSET)
+        flask_app = application.app
+        flask_app.config.update({
+            'DATABASE_DIR': str(workdir / 'user_dbs'),
+            'UPLOAD_FOLDER': str(workdir / 'books'),
+            'JOBS_DIR': str(workdir / 'job_states'),
+        })
+        baseline_rss = _peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+        client = flask_app.test_client()
+        store = application.get_job_queue().store
+
+        runs = []
+        for phase in (('cold', 'warm') if warm else ('cold',)):
+            run = _measure(client, store, blog_url, counters)
+            run['phase'] = phase
+            if run['state'] == 'done':
+                name = run['download_url'].rsplit('/', 1)[-1]
+                pdf = workdir / 'books' / flask_app.config['BOOK_CACHE_SUBDIR'] / name
+                run['pdf_bytes'] = pdf.stat().st_size if pdf.exists() else None
+                db_path = Path(flask_app.config['DATABASE_DIR']) / flask_app.config['CORPUS_DB_NAME']
+                with DBManager(str(db_path)) as db:
+                    run['articles'] = db.count_job_articles(run['job_id'])
+            run['peak_rss_mb'] = _peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+            run['children_peak_rss_mb'] = _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None
+            run['baseline_rss_mb'] = baseline_rss
+            runs.append(run)
+        results.put(runs)
+    except Exception as e:
+        results.put([{'state': 'failed', 'error': f"{type(e).__name__}: {e}"}])
+    finally:
+        if application is not None:
+            application.get_job_queue().shutdown()  # Con JOB_EXECUTOR=process, libera el pool
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(runs):
+    """Mediana de cada métrica por fase (cold / warm)"""
+    summary = {}
+    for phase in sorted({run.get('phase') for run in runs if run.get('phase')}):
+        done = [run for run in runs if run.get('phase') == phase and run['state'] == 'done']
+        summary[phase] = {
+            metric: round(statistics.median(values), 4) if (values := [run[metric] for run in done
+                                                                        if run.get(metric) is not None]) else None
+            for metric in METRICS
+        }
+        summary[phase]['runs_ok'] = len(done)
+    return summary
+
+
+def compare(current, baseline_path):
+    """Tabla de diferencias con un archivo de resultados anterior"""
+    with open(baseline_path, encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    print(f"\nComparación con {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    print(f"{'fase':<6} {'métrica':<16} {'antes':>12} {'ahora':>12} {'cambio':>9}")
+    for phase, metrics in current['summary'].items():
+        for metric, higher_is_better in METRICS.items():
+            old = baseline.get('summary', {}).get(phase, {}).get(metric)
+            new = metrics.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            better = change > 0 if higher_is_better else change < 0
+            flag = '✅' if better and abs(change) >= 5 else ('⚠️' if abs(change) >= 5 else '')
+            print(f"{phase:<6} {metric:<16} {old:>12.3f} {new:>12.3f} {change:>+8.1f}% {flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    fake_blog.add_arguments(parser)
+    parser.add_argument('--runs', type=int, default=1, help='Ejecuciones en frío (cada una en un proceso nuevo)')
+    parser.add_argument('--warm', action='store_true', help='Repetir la petición con las cachés ya llenas')
+    parser.add_argument('--env', action='append', default=[], metavar='CLAVE=VALOR',
+                        help='Variables de configuración para el pipeline (p. ej. RENDER_MODE=parallel)')
+    parser.add_argument('--json', help='Guardar los resultados en este archivo')
+    parser.add_argument('--compare', help='Resultados anteriores con los que comparar')
+    args = parser.parse_args()
+
+    env = dict(item.split('=', 1) for item in args.env)
+    context = multiprocessing.get_context('spawn')
+    counters = {name: context.Value('q', 0) for name in ('requests', 'bytes', 'throttled', 'not_modified')}
+    ready = context.Queue()
+    server = context.Process(target=_serve_blog, daemon=True, args=(
+        fake_blog.blog_options(args), fake_blog.handler_options(args), counters, ready))
+    server.start()
+    blog_url = ready.get(timeout=30) + '/'
+
+    runs = []
+    try:
+        for number in range(args.runs):
+            results = context.Queue()
+            worker = context.Process(target=_run_pipeline, args=(blog_url, env, args.warm, counters, results))
+            worker.start()
+            for run in results.get():
+                run['run'] = number + 1
+                runs.append(run)
+                print(f"#{run['run']} {run.get('phase', '-'):<5} {run['state']:<7} "
+                      f"total {run.get('total_s') or 0:7.2f}s  "
+                      + '  '.join(f"{stage} {run.get(f'{stage}_s') or 0:6.2f}s" for stage in STAGES)
+                      + f"  {run.get('pages_per_sec') or 0:7.1f} pág/s  RSS {run.get('peak_rss_mb') or 0:6.1f} MB"
+                      + f"  PDF {(run.get('pdf_bytes') or 0) / 1024:8.1f} KB  artículos {run.get('articles', '-')}"
+                      + (f"  429: {run['throttled']}" if run.get('throttled') else '')
+                      + (f"  304: {run['not_modified']}" if run.get('not_modified') else '')
+                      + (f"  error: {run['error']}" if run.get('error') else ''))
+            worker.join()
+    finally:
+        server.terminate()
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'blog': {**fake_blog.blog_options(args), **fake_blog.handler_options(args)},
+            'env': env,
+        },
+        'runs': runs,
+        'summary': summarize(runs),
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+    if args.compare:
+        compare(report, args.compare)
+    return 0 if runs and all(run['state'] == 'done' for run in runs) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
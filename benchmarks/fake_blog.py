@@ -0,0 +1,311 @@
+"""Blog sintético servido en local para medir el pipeline sin tocar sitios reales.
+
+Uso:
+    python benchmarks/fake_blog.py [--posts 60] [--style wordpress] [--port 8001]
+"""
+import json
+import time
+import hashlib
+import random
+import argparse
+import threading
+from html import escape
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STYLES = ('wordpress', 'nested', 'jsonld')
+
+# Vocabulario por tema, para que el organizador encuentre capítulos reconocibles
+TOPICS = {
+    'riego': ['riego', 'goteo', 'agua', 'humedad', 'aspersor', 'manguera', 'caudal', 'programador',
+              'evaporación', 'sustrato', 'drenaje', 'regadera'],
+    'plagas': ['plagas', 'pulgón', 'insectos', 'hongos', 'oídio', 'mosca', 'trampas', 'neem',
+               'mariquitas', 'cochinilla', 'tratamiento', 'larvas'],
+    'compost': ['compost', 'compostera', 'restos', 'lombrices', 'humus', 'fermentación', 'abono',
+                'nitrógeno', 'carbono', 'materia', 'orgánica', 'volteo'],
+    'semillas': ['semillas', 'semillero', 'germinación', 'siembra', 'plántulas', 'trasplante',
+                 'variedades', 'bandejas', 'temperatura', 'luz', 'repicado', 'vivero'],
+    'poda': ['poda', 'tijeras', 'ramas', 'brotes', 'frutales', 'yemas', 'formación', 'chupones',
+             'cicatrizante', 'invierno', 'floración', 'injerto'],
+}
+FILLER = ('el', 'la', 'de', 'en', 'con', 'para', 'que', 'una', 'los', 'las', 'cada', 'huerto', 'planta',
+          'plantas', 'cultivo', 'cultivos', 'hoja', 'hojas', 'raíz', 'raíces', 'tierra', 'maceta',
+          'balcón', 'terraza', 'semana', 'mes', 'conviene', 'mejor', 'siempre', 'nunca', 'suele',
+          'ayuda', 'evitar', 'revisar', 'mantener', 'primavera', 'verano', 'otoño')
+MONTHS = ('enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+          'septiembre', 'octubre', 'noviembre', 'diciembre')
+# Párrafos que se repiten en todas las páginas (el deduplicador debería quitarlos)
+BOILERPLATE = ('Suscríbete a nuestro boletín y recibe cada semana los consejos del huerto.',
+               'Compartir en redes sociales')
+
+
+class FakeBlog:
+    """Generador determinista de las páginas de un blog sintético.
+
+    Todas las variantes incluyen un <article>, que el scraper exige para dar
+    una página por válida sin recurrir a Selenium.
+    """
+
+    def __init__(self, posts=60, style='wordpress', per_page=10, paragraphs=8,
+                 large_every=0, large_paragraphs=300, duplicate_every=0, sitemap=True, crawl_delay=0, seed=0):
+        if style not in STYLES:
+            raise ValueError(f"Estilo desconocido: {style} (disponibles: {', '.join(STYLES)})")
+        self.posts = posts
+        self.style = style
+        self.per_page = max(1, per_page)
+        self.paragraphs = paragraphs
+        self.large_every = large_every
+        self.large_paragraphs = large_paragraphs
+        self.duplicate_every = duplicate_every
+        self.sitemap = sitemap
+        self.crawl_delay = crawl_delay
+        self.seed = seed
+        self.base_url = ''
+
+    def slug(self, index):
+        return f"/2024/post-{index:05d}/"
+
+    def date(self, index):
+        return datetime(2024, 1, 1) + timedelta(hours=7 * index)
+
+    def topic(self, index):
+        return list(TOPICS)[index % len(TOPICS)]
+
+    def title(self, index):
+        words = TOPICS[self.topic(index)]
+        return f"Guía de {words[index % len(words)]} y {words[(index * 7 + 3) % len(words)]} ({index})"
+
+    def body(self, index):
+        """Párrafos del artículo; los duplicados reutilizan el texto del anterior"""
+        source = index - 1 if self.duplicate_every and index and index % self.duplicate_every == 0 else index
+        rng = random.Random(self.seed * 1_000_003 + source)
+        words = TOPICS[self.topic(source)]
+        count = self.large_paragraphs if self.large_every and source % self.large_every == 0 else self.paragraphs
+        paragraphs = []
+        for _ in range(count):
+            sentences = []
+            for _ in range(rng.randint(3, 6)):
+                sentence = [rng.choice(words) if rng.random() < 0.3 else rng.choice(FILLER)
+                            for _ in range(rng.randint(10, 20))]
+                sentences.append(' '.join(sentence).capitalize() + '.')
+            paragraphs.append(' '.join(sentences))
+        return paragraphs
+
+    # Páginas
+
+    def listing(self, page):
+        first = (page - 1) * self.per_page
+        if first >= self.posts and page > 1:
+            return None
+        indexes = range(first, min(first + self.per_page, self.posts))
+        if self.style == 'nested':
+            items = ''.join(f'<article><div class="post-item"><div class="post-header"><a href="{self.slug(i)}">'
+                            f'{escape(self.title(i))}</a></div></div></article>' for i in indexes)
+        else:
+            items = ''.join(f'<article class="post"><h2 class="entry-title"><a rel="bookmark" href="{self.slug(i)}">'
+                            f'{escape(self.title(i))}</a></h2></article>' for i in indexes)
+        next_link = f'<a class="next" href="/page/{page + 1}/">Siguiente</a>' if first + self.per_page < self.posts else ''
+        return self._layout('Blog sintético', f'<main>{items}</main><nav>{next_link}</nav>')
+
+    def post(self, index):
+        title, date, paragraphs = self.title(index), self.date(index), self.body(index)
+        text = ''.join(f'<p>{escape(paragraph)}</p>' for paragraph in paragraphs)
+        boilerplate = ''.join(f'<p>{escape(line)}</p>' for line in BOILERPLATE)
+        if self.style == 'wordpress':
+            content = (f'<article class="post"><header><h1 class="entry-title">{escape(title)}</h1>'
+                       f'<time class="entry-date" datetime="{date.isoformat()}">{date:%d/%m/%Y}</time></header>'
+                       f'<div class="entry-content">{text}{boilerplate}</div></article>')
+            return self._layout(title, content)
+        if self.style == 'nested':
+            # Contenedores anidados que casan varias veces con los selectores genéricos
+            content = (f'<article><div class="post"><div class="post-header"><h1>{escape(title)}</h1>'
+                       f'<span class="post-date">{date.day} {MONTHS[date.month - 1]} {date.year}</span></div>'
+                       f'<div class="post-content"><div class="post-body"><div class="rich-text">{text}</div></div>'
+                       f'{boilerplate}</div></div></article>')
+            return self._layout(title, content)
+        data = {'@context': 'https://schema.org', '@type': 'BlogPosting', 'headline': title,
+                'datePublished': date.isoformat(), 'articleBody': '\n'.join(paragraphs)}
+        head = f'<script type="application/ld+json">{json.dumps(data, ensure_ascii=False)}</script>'
+        return self._layout(title, f'<article class="app-root"><h1>{escape(title)}</h1>{text}</article>', head)
+
+    def robots(self):
+        lines = ['User-agent: *', 'Allow: /']
+        if self.crawl_delay:
+            lines.append(f'Crawl-delay: {self.crawl_delay:g}')
+        if self.sitemap:
+            lines.append(f'Sitemap: {self.base_url}/sitemap.xml')
+        return '\n'.join(lines) + '\n'
+
+    def sitemap_xml(self):
+        urls = ''.join(f'<url><loc>{self.base_url}{self.slug(i)}</loc><lastmod>{self.date(i).date().isoformat()}</lastmod></url>'
+                       for i in range(self.posts))
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+    def _layout(self, title, body, head=''):
+        sidebar = '<aside class="sidebar"><h3>Categorías</h3><ul>' + ''.join(
+            f'<li><a href="/categoria/{topic}/">{topic}</a></li>' for topic in TOPICS) + '</ul></aside>'
+        return (f'<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>{escape(title)}</title>{head}</head>'
+                f'<body>{body}{sidebar}<footer><p>© 2024 Blog sintético</p></footer></body></html>')
+
+    def route(self, path):
+        """(contenido, tipo, índice del post o None) de una ruta; None si no existe"""
+        path = path.split('?', 1)[0]
+        if path in ('/', '/blog/', '/page/1/'):
+            return self.listing(1), 'text/html', None
+        if path.startswith('/page/'):
+            try:
+                page = int(path.strip('/').split('/')[-1])
+            except ValueError:
+                return None
+            content = self.listing(page)
+            return (content, 'text/html', None) if content else None
+        if path == '/robots.txt':
+            return self.robots(), 'text/plain', None
+        if path == '/sitemap.xml' and self.sitemap:
+            return self.sitemap_xml(), 'application/xml', None
+        if path.startswith('/2024/post-'):
+            try:
+                index = int(path.strip('/').rsplit('-', 1)[-1])
+            except ValueError:
+                return None
+            if 0 <= index < self.posts:
+                return self.post(index), 'text/html', index
+        return None
+
+
+def make_handler(blog, latency_ms=0, slow_every=0, slow_ms=0, max_rps=0, validators=False, counters=None):
+    """Handler HTTP con latencia base, respuestas lentas cada N posts, límite de
+    peticiones por segundo (429 + Retry-After al superarlo), ETag/Last-Modified
+    opcionales (304 a las peticiones condicionales) y contadores opcionales"""
+    recent = deque()  # Instantes de las peticiones del último segundo
+    recent_lock = threading.Lock()
+
+    def over_limit():
+        if not max_rps:
+            return False
+        now = time.monotonic()
+        with recent_lock:
+            while recent and now - recent[0] >= 1:
+                recent.popleft()
+            if len(recent) >= max_rps:
+                return True
+            recent.append(now)
+            return False
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if over_limit():
+                self.send_response(429)
+                self.send_header('Retry-After', '1')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                if counters is not None and 'throttled' in counters:
+                    with counters['throttled'].get_lock():
+                        counters['throttled'].value += 1
+                return
+            routed = blog.route(self.path)
+            delay = latency_ms
+            if routed and routed[2] is not None and slow_every and routed[2] % slow_every == 0:
+                delay += slow_ms
+            if delay:
+                time.sleep(delay / 1000)
+            if routed is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = routed[0].encode('utf-8')
+            headers = {}
+            if validators:
+                headers['ETag'] = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                if routed[2] is not None:
+                    headers['Last-Modified'] = format_datetime(blog.date(routed[2]).replace(tzinfo=timezone.utc), usegmt=True)
+                if self.headers.get('If-None-Match') == headers['ETag']:
+                    if counters is not None and 'not_modified' in counters:
+                        with counters['not_modified'].get_lock():
+                            counters['not_modified'].value += 1
+                    self.send_response(304)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+            self.send_response(200)
+            self.send_header('Content-Type', f'{routed[1]}; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            if counters is not None:
+                with counters['requests'].get_lock():
+                    counters['requests'].value += 1
+                with counters['bytes'].get_lock():
+                    counters['bytes'].value += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(blog, host='127.0.0.1', port=0, **handler_options):
+    """Arrancar el servidor en un hilo; devuelve el servidor (base_url ya asignada al blog)"""
+    server = ThreadingHTTPServer((host, port), make_handler(blog, **handler_options))
+    server.daemon_threads = True
+    blog.base_url = f'http://{host}:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_arguments(parser):
+    """Opciones del blog sintético, compartidas con el benchmark del pipeline"""
+    parser.add_argument('--posts', type=int, default=60)
+    parser.add_argument('--style', choices=STYLES, default='wordpress')
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--paragraphs', type=int, default=8, help='Párrafos por artículo')
+    parser.add_argument('--large-every', type=int, default=0, help='Un artículo grande cada N (0 = ninguno)')
+    parser.add_argument('--large-paragraphs', type=int, default=300)
+    parser.add_argument('--duplicate-every', type=int, default=0, help='Un artículo duplicado cada N (0 = ninguno)')
+    parser.add_argument('--no-sitemap', dest='sitemap', action='store_false', help='Forzar el recorrido de la paginación')
+    parser.add_argument('--latency-ms', type=int, default=0, help='Latencia de todas las respuestas')
+    parser.add_argument('--slow-every', type=int, default=0, help='Un post lento cada N (0 = ninguno)')
+    parser.add_argument('--slow-ms', type=int, default=1000)
+    parser.add_argument('--crawl-delay', type=float, default=0, help='Crawl-delay anunciado en robots.txt')
+    parser.add_argument('--max-rps', type=int, default=0, help='Responder 429 por encima de N peticiones/s (0 = sin límite)')
+    parser.add_argument('--validators', action='store_true', help='Enviar ETag/Last-Modified y responder 304')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def blog_options(args):
+    return {key: getattr(args, key) for key in ('posts', 'style', 'per_page', 'paragraphs', 'large_every',
+                                                 'large_paragraphs', 'duplicate_every', 'sitemap', 'crawl_delay',
+                                                 'seed')}
+
+
+def handler_options(args):
+    return {key: getattr(args, key) for key in ('latency_ms', 'slow_every', 'slow_ms', 'max_rps', 'validators')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--port', type=int, default=8001)
+    args = parser.parse_args()
+
+    blog = FakeBlog(**blog_options(args))
+    server = serve(blog, port=args.port, **handler_options(args))
+    print(f"Blog sintético ({args.style}, {args.posts} artículos) en {blog.base_url}/ — Ctrl+C para salir")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -15,13 +15,52 @@ document.addEventListener('DOMContentLoaded', () => {
 
             const blogUrl = document.getElementById('blog-url').value;
 
-            // Simular progreso inicial antes de la solicitud
-            let progress = 0;
-            const interval = setInterval(() => {
-                progress += 10;
-                progressBar.style.width = `${progress}%`;
-                if (progress >= 90) clearInterval(interval); // Detener en 90% hasta que termine la solicitud
-            }, 500);
+            // Progreso aproximado según el estado del trabajo
+            const stateProgress = {
+                queued: 10,
+                scraping: 35,
+                organizing: 65,
+                rendering: 85,
+                done: 100,
+                failed: 100,
+            };
+            const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+            const formatEta = (seconds) => (seconds ? ` — quedan ~${Math.ceil(seconds)} s` : '');
+
+            // Progreso detallado dentro de cada etapa a partir de los eventos del servidor
+            const followEvents = (eventsUrl) => new Promise((resolve) => {
+                const source = new EventSource(eventsUrl);
+                const finish = () => {
+                    source.close();
+                    resolve();
+                };
+                source.addEventListener('state', (event) => {
+                    const data = JSON.parse(event.data);
+                    progressBar.style.width = `${stateProgress[data.state] || 0}%`;
+                    if (data.state === 'done' || data.state === 'failed') finish();
+                });
+                source.addEventListener('discovered', (event) => {
+                    const data = JSON.parse(event.data);
+                    responseMessage.textContent = `${data.pages} artículos encontrados (${data.reused} ya descargados)`;
+                });
+                source.addEventListener('articles', (event) => {
+                    const data = JSON.parse(event.data);
+                    const share = data.total ? data.done / data.total : 1;
+                    progressBar.style.width = `${stateProgress.scraping + share * (stateProgress.organizing - stateProgress.scraping)}%`;
+                    responseMessage.textContent = `Descargando artículos: ${data.done}/${data.total}${formatEta(data.eta_s)}`;
+                });
+                source.addEventListener('chapters', (event) => {
+                    const data = JSON.parse(event.data);
+                    const share = data.total ? data.done / data.total : 1;
+                    progressBar.style.width = `${stateProgress.rendering + share * (stateProgress.done - stateProgress.rendering)}%`;
+                    responseMessage.textContent = `Maquetando capítulo ${data.chapter || data.done}/${data.total}${formatEta(data.eta_s)}`;
+                });
+                source.addEventListener('end', finish);
+                // Sin 'end' el navegador reconecta solo tras `retry`; solo se abandona si el trabajo no existe
+                source.onerror = () => {
+                    if (source.readyState === EventSource.CLOSED) finish();
+                };
+            });
 
             try {
                 const response = await fetch('/generate', {
@@ -32,9 +71,29 @@ document.addEventListener('DOMContentLoaded', () => {
                     body: JSON.stringify({ url: blogUrl }),
                 });
 
-                const result = await response.json();
+                let result = await response.json();
+
+                if (!response.ok) {
+                    responseMessage.textContent = result.error || 'Error al generar el libro.';
+                    return;
+                }
+
+                // Seguir el trabajo: eventos de progreso (SSE) o, si no hay soporte, consultas periódicas
+                const statusUrl = result.status_url;
+                if (window.EventSource && result.events_url) {
+                    await followEvents(result.events_url);
+                    const statusResponse = await fetch(statusUrl);
+                    result = await statusResponse.json();
+                }
+                while (result.state !== 'done' && result.state !== 'failed') {
+                    progressBar.style.width = `${stateProgress[result.state] || 0}%`;
+                    await sleep(2000);
+                    const statusResponse = await fetch(statusUrl);
+                    result = await statusResponse.json();
+                    if (!statusResponse.ok) break;
+                }
 
-                if (response.ok) {
+                if (result.state === 'done') {
                     progressBar.style.width = '100%'; // Completar progreso
                     responseMessage.innerHTML = `
                         <p>Libro generado con éxito. <a href="${result.download_url}" target="_blank">Descargar aquí</a></p>
@@ -46,7 +105,6 @@ document.addEventListener('DOMContentLoaded', () => {
                 responseMessage.textContent = 'Error al conectar con el servidor.';
                 console.error('Error:', error);
             } finally {
-                clearInterval(interval); // Asegurarse de detener el progreso simulado
                 progressBar.style.width = '100%'; // Completar progreso visualmente
                 setTimeout(() => {
                     progressContainer.classList.add('hidden'); // Ocultar barra de progreso después de un tiempo
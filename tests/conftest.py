@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Importar `backend` desde la raíz del repositorio y el blog sintético de los benchmarks
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
@@ -0,0 +1,24 @@
+from backend.database import DBManager, PLACEHOLDER_CONTENT
+
+TEXT = 'El acolchado conserva la humedad del suelo durante el verano.'
+
+
+def _save(db, url, title='Acolchado', content=TEXT):
+    return db.save_article({'url': url, 'title': title, 'content': content})
+
+
+def test_identical_content_is_shared_only_within_the_same_site(tmp_path):
+    with DBManager(str(tmp_path / 'corpus.db')) as db:
+        original = _save(db, 'https://huerto.test/acolchado/')
+        assert _save(db, 'https://huerto.test/?p=42', title='Copia') == original
+        assert _save(db, 'https://jardin.test/acolchado/', title='Otro blog') != original
+        assert db.count_articles() == 2
+
+
+def test_pages_without_content_are_never_merged(tmp_path):
+    with DBManager(str(tmp_path / 'corpus.db')) as db:
+        ids = [_save(db, f'https://huerto.test/fallo-{index}/', title=f'Fallo {index}', content=PLACEHOLDER_CONTENT)
+               for index in range(3)]
+        assert len(set(ids)) == 3
+        titles = {row.url: row.title for row in db.get_all_articles()}
+        assert titles['https://huerto.test/fallo-2'] == 'Fallo 2'
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import fake_blog
+from backend.config import DEDUP_CONFIG
+from backend.dedup import Deduplicator, MinHasher, hamming, simhash
+
+BLOG = fake_blog.FakeBlog(paragraphs=6)
+FOOTER = 'Suscríbete a nuestro boletín y recibe cada semana los consejos del huerto. © 2024'
+
+
+def _article(index, url=None, extra=()):
+    return {'url': url or f'https://blog.test/post-{index}/', 'title': BLOG.title(index),
+            'content': '\n'.join(BLOG.body(index) + list(extra))}
+
+
+def test_simhash_ignores_numbers_and_separates_unrelated_paragraphs():
+    assert simhash('© 2023 Blog del huerto. Todos los derechos reservados.') == \
+        simhash('© 2024 Blog del huerto. Todos los derechos reservados.')
+    first, second = BLOG.body(0)[0], BLOG.body(1)[0]
+    assert hamming(simhash(first), simhash(second)) > DEDUP_CONFIG['simhash_distance']
+
+
+def test_minhash_estimates_jaccard_similarity():
+    hasher = MinHasher(num_perm=256, shingle_size=1)
+    words = [f'palabra{i}' for i in range(200)]
+    a = hasher.signature(' '.join(words[:150]))
+    b = hasher.signature(' '.join(words[50:]))  # Jaccard real: 100 / 200 = 0.5
+    assert np.mean(a == b) == pytest.approx(0.5, abs=0.1)
+    assert np.array_equal(a, hasher.signature(' '.join(words[:150])))
+
+
+def test_near_duplicates_are_dropped_and_the_clean_url_is_kept():
+    dedup = Deduplicator()
+    copy = _article(1, url='https://blog.test/post-1/?utm_source=boletin')
+    copy['content'] = copy['content'].replace('.', ',', 1)  # Un cambio mínimo
+    kept, duplicates = dedup.process([copy, _article(1), _article(2)])
+
+    assert [article['url'] for article in kept] == ['https://blog.test/post-1/', 'https://blog.test/post-2/']
+    assert duplicates == {copy['url']: 'https://blog.test/post-1/'}
+
+    # Los lotes siguientes se comparan con lo ya visto
+    kept, duplicates = dedup.process([_article(1, url='https://blog.test/copia/')])
+    assert kept == [] and list(duplicates.values()) == ['https://blog.test/post-1/']
+
+
+def test_articles_sharing_part_of_their_text_are_kept():
+    half = _article(3)
+    half['content'] = '\n'.join(BLOG.body(3)[:3] + BLOG.body(4)[:3])
+    kept, duplicates = Deduplicator().process([_article(3), half])
+    assert len(kept) == 2 and duplicates == {}
+
+
+def test_boilerplate_needs_enough_pages():
+    articles = [_article(index, extra=[FOOTER]) for index in range(DEDUP_CONFIG['boilerplate_min_pages'] - 1)]
+    Deduplicator().process(articles)
+    assert all(FOOTER in article['content'] for article in articles)
+
+    articles = [_article(index, extra=[FOOTER]) for index in range(DEDUP_CONFIG['boilerplate_min_pages'])]
+    dedup = Deduplicator()
+    dedup.process(articles)
+    assert not any(FOOTER in article['content'] for article in articles)
+    assert dedup.stripped_paragraphs == len(articles)
+    assert list(dedup.boilerplate()) == ['blog.test']
+
+
+def test_seeded_state_applies_to_later_crawls():
+    first = Deduplicator()
+    first.process([_article(index, extra=[FOOTER]) for index in range(4)])
+    stored = [(f'https://blog.test/post-{index}/', BLOG.title(index), '\n'.join(BLOG.body(index)))
+              for index in range(4)]
+
+    dedup = Deduplicator()
+    dedup.seed(stored)
+    dedup.learn_boilerplate('blog.test', first.boilerplate()['blog.test'])
+    edited = _article(2, extra=['Párrafo nuevo tras editar el artículo.'])
+    new = _article(9, extra=[FOOTER.replace('2024', '2025')])
+    kept, duplicates = dedup.process([edited, new, _article(1, url='https://blog.test/copia/')])
+
+    assert [article['url'] for article in kept] == [edited['url'], new['url']]  # Una edición no es un duplicado
+    assert duplicates == {'https://blog.test/copia/': 'https://blog.test/post-1/'}
+    assert FOOTER.split('©')[0].strip() not in new['content']
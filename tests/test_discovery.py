@@ -0,0 +1,82 @@
+from backend.discovery import ArticleDiscovery, is_article_url, iter_sitemap
+
+ORIGIN = 'https://blog.test'
+
+
+def _urlset(*paths):
+    entries = ''.join(f'<url><loc>{ORIGIN}{path}</loc><lastmod>2024-01-0{index + 1}</lastmod></url>'
+                      for index, path in enumerate(paths))
+    return f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'.encode()
+
+
+def _index(*paths):
+    entries = ''.join(f'<sitemap><loc>{ORIGIN}{path}</loc></sitemap>' for path in paths)
+    return f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'.encode()
+
+
+def _discover(documents, base_url=ORIGIN + '/'):
+    discovery = ArticleDiscovery(documents.get, max_articles=50)
+    return sorted(entry.url for entry in discovery.discover(base_url))
+
+
+def test_flat_sitemap_skips_archives_and_static_pages():
+    documents = {
+        f'{ORIGIN}/robots.txt': None,
+        f'{ORIGIN}/sitemap.xml': _urlset('/', '/como-regar-tomates/', '/about', '/contacto/', '/tag/riego/',
+                                         '/category/huerto/', '/author/ana/', '/page/2/', '/2024/01/poda/',
+                                         '/wp-content/uploads/foto.jpg'),
+    }
+    assert _discover(documents) == [f'{ORIGIN}/2024/01/poda/', f'{ORIGIN}/como-regar-tomates/']
+
+
+def test_sitemap_index_prefers_post_sitemaps():
+    documents = {
+        f'{ORIGIN}/robots.txt': f'Sitemap: {ORIGIN}/sitemap_index.xml\n'.encode(),
+        f'{ORIGIN}/sitemap_index.xml': _index('/post-sitemap.xml', '/post-sitemap2.xml', '/landing-sitemap.xml'),
+        f'{ORIGIN}/post-sitemap.xml': _urlset('/post-uno/'),
+        f'{ORIGIN}/post-sitemap2.xml': _urlset('/post-dos/'),
+        f'{ORIGIN}/landing-sitemap.xml': _urlset('/oferta/'),
+    }
+    assert _discover(documents) == [f'{ORIGIN}/post-dos/', f'{ORIGIN}/post-uno/']
+
+
+def test_iter_sitemap_reports_entries_in_order():
+    entries = list(iter_sitemap(_urlset('/a/', '/b/')))
+    assert [(kind, loc) for kind, loc, _ in entries] == [('url', f'{ORIGIN}/a/'), ('url', f'{ORIGIN}/b/')]
+    assert entries[0][2].day == 1
+
+
+def test_is_article_url():
+    assert is_article_url(f'{ORIGIN}/blog/mi-primer-huerto/')
+    assert not is_article_url(f'{ORIGIN}/blog/etiqueta/huerto/')
+    assert not is_article_url(f'{ORIGIN}/aviso-legal/')
+
+
+def test_image_entries_do_not_replace_the_page_url():
+    document = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+        f'<url><loc>{ORIGIN}/como-regar-tomates/</loc><lastmod>2024-01-02</lastmod>'
+        f'<image:image><image:loc>{ORIGIN}/wp-content/uploads/tomates.jpg</image:loc></image:image></url>'
+        f'<url><loc>{ORIGIN}/poda/</loc></url>'
+        '</urlset>'
+    ).encode()
+    assert [loc for _, loc, _ in iter_sitemap(document)] == [f'{ORIGIN}/como-regar-tomates/', f'{ORIGIN}/poda/']
+    assert _discover({f'{ORIGIN}/robots.txt': None, f'{ORIGIN}/sitemap.xml': document}) == [
+        f'{ORIGIN}/como-regar-tomates/', f'{ORIGIN}/poda/']
+
+
+def test_skipped_sitemaps_match_the_file_name_only():
+    origin = 'https://cottagegarden.test'
+    documents = {
+        f'{origin}/robots.txt': f'Sitemap: {origin}/sitemap_index.xml\n'.encode(),
+        f'{origin}/sitemap_index.xml': (
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            + ''.join(f'<sitemap><loc>{origin}{path}</loc></sitemap>'
+                      for path in ('/post-sitemap.xml', '/post_tag-sitemap.xml', '/page-sitemap.xml'))
+            + '</sitemapindex>').encode(),
+        f'{origin}/post-sitemap.xml': _urlset('/post-uno/').replace(ORIGIN.encode(), origin.encode()),
+        f'{origin}/post_tag-sitemap.xml': _urlset('/riego/').replace(ORIGIN.encode(), origin.encode()),
+        f'{origin}/page-sitemap.xml': _urlset('/tienda-online/').replace(ORIGIN.encode(), origin.encode()),
+    }
+    assert _discover(documents, base_url=origin + '/') == [f'{origin}/post-uno/']
@@ -0,0 +1,88 @@
+import json
+
+from backend.extraction import ArticleExtractor, element_paragraphs, structured_metadata
+from backend.parsing import make_soup
+
+SELECTORS = {
+    'title': ['h1.entry-title', 'h1'],
+    'content': ['div.entry-content', 'div.post-content', 'article'],
+    'date': ['time[datetime]', 'span.post-date'],
+}
+
+
+def _extract(html):
+    return ArticleExtractor(SELECTORS).extract(make_soup(html))
+
+
+def test_nested_containers_do_not_repeat_their_text():
+    extraction = _extract(
+        '<article><h1>Riego por goteo</h1>'
+        '<div class="entry-content"><p>Primero.</p>'
+        '<div class="entry-content"><p>Anidado.</p><div class="entry-content"><p>Más adentro.</p></div></div>'
+        '<p>Último.</p></div>'
+        '<div class="entry-content"><p>Segundo bloque.</p></div></article>'
+    )
+    assert extraction.paragraphs == ['Primero.', 'Anidado.', 'Más adentro.', 'Último.', 'Segundo bloque.']
+    assert extraction.selectors['content'] == 'div.entry-content'
+
+
+def test_better_selector_wins_even_if_it_comes_later():
+    extraction = _extract(
+        '<article><span class="post-date">3 de marzo de 2024</span><h1>Genérico</h1>'
+        '<div class="post-content"><p>Resumen.</p></div>'
+        '<h1 class="entry-title">Poda de frutales</h1><time datetime="2024-03-05">5 mar</time>'
+        '<div class="entry-content"><p>Texto completo.</p></div></article>'
+    )
+    assert extraction.title == 'Poda de frutales'
+    assert extraction.paragraphs == ['Texto completo.']
+    assert extraction.date == '2024-03-05'
+    assert extraction.selectors == {'title': 'h1.entry-title', 'content': 'div.entry-content',
+                                    'date': 'time[datetime]'}
+
+
+def test_element_paragraphs_splits_on_blocks_and_joins_inline_text():
+    soup = make_soup(
+        '<div><p>Riega <strong>temprano</strong>, <a href="#">antes</a> del calor.</p>'
+        '<script>var x = 1;</script><ul><li>Uno</li><li>Dos</li></ul>Texto suelto<br>tras salto'
+        '<!-- comentario --></div>'
+    )
+    assert element_paragraphs(soup.div) == ['Riega temprano, antes del calor.', 'Uno', 'Dos',
+                                            'Texto suelto', 'tras salto']
+
+
+def test_missing_fields_are_left_empty():
+    extraction = _extract('<div><p>Sin contenedor conocido</p></div>')
+    assert extraction == (None, [], None, {})
+
+
+BODY = 'El compost maduro huele a tierra de bosque. ' * 10
+
+
+def test_json_ld_is_preferred_over_microdata_and_opengraph():
+    data = {'@context': 'https://schema.org', '@graph': [
+        {'@type': 'WebPage', 'name': 'Portada'},
+        {'@type': ['BlogPosting'], 'headline': '  Compost   casero ', 'datePublished': '2024-02-01',
+         'articleBody': f'<p>{BODY}</p><p>Segundo párrafo.</p>'},
+    ]}
+    metadata = structured_metadata(make_soup(
+        f'<head><meta property="og:title" content="Título OG">'
+        f'<script type="application/ld+json">{json.dumps(data)}</script></head>'
+        '<body><h1 itemprop="headline">Título microdatos</h1></body>'
+    ))
+    assert metadata.title == 'Compost casero'
+    assert metadata.date == '2024-02-01'
+    assert metadata.paragraphs == [BODY.strip(), 'Segundo párrafo.']
+    assert metadata.sources == {'title': 'json-ld', 'date': 'json-ld', 'content': 'json-ld'}
+
+
+def test_short_article_body_and_missing_fields_fall_back():
+    metadata = structured_metadata(make_soup(
+        '<head><script type="application/ld+json">{"@type": "Article", "articleBody": "Resumen corto"}</script>'
+        '<meta property="article:published_time" content="2024-02-03T08:00:00+01:00">'
+        '<meta name="twitter:title" content="Título Twitter"></head>'
+        '<body><time itemprop="datePublished" datetime="2024-02-02">2 feb</time></body>'
+    ))
+    assert metadata.title == 'Título Twitter'
+    assert metadata.date == '2024-02-02'
+    assert metadata.paragraphs is None
+    assert metadata.sources == {'title': 'opengraph', 'date': 'microdata'}
@@ -0,0 +1,23 @@
+from backend import generators
+from backend.generators import BookGenerator
+
+
+def test_parallel_render_with_toc_escapes_chapter_titles(tmp_path):
+    structure = {
+        title: {
+            'theory': [{'title': 'Artículo', 'content': 'Texto de prueba con <marcas> & símbolos. ' * 10}],
+            'practice': [], 'case_study': [], 'quizzes': []
+        }
+        for title in ('C++ & <templates>', 'Etiquetas <b>sin cerrar', 'Riego "por goteo"')
+    }
+    output = tmp_path / 'libro.pdf'
+    generator = BookGenerator(str(output), render_mode='parallel', workers=2, toc=True)
+
+    assert generator.generate_book(structure)
+    assert output.stat().st_size > 0
+
+
+def test_render_signature_changes_with_paragraph_size(monkeypatch):
+    signature = BookGenerator.render_signature()
+    monkeypatch.setitem(generators.GENERATOR_CONFIG, 'max_paragraph_chars', 400)
+    assert BookGenerator.render_signature() != signature
@@ -0,0 +1,72 @@
+import multiprocessing
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import fake_blog
+from backend.database import DBManager
+from backend.domain_memory import DomainMemory
+from backend.http_cache import HTTPCache
+from backend.rate_limit import RateLimiter
+from backend.scraper import ContentScraper
+
+
+@pytest.fixture
+def blog():
+    site = fake_blog.FakeBlog(posts=3, sitemap=False)
+    counters = {name: multiprocessing.Value('q', 0) for name in ('requests', 'bytes', 'not_modified')}
+    server = fake_blog.serve(site, validators=True, counters=counters)
+    site.counters = counters
+    yield site
+    server.shutdown()
+
+
+def _response(body=b'<html></html>', status=200, **headers):
+    return SimpleNamespace(status_code=status, content=body, encoding='utf-8', apparent_encoding='utf-8',
+                           headers=headers)
+
+
+def test_stale_entry_is_revalidated_with_a_conditional_get(tmp_path, blog):
+    cache = HTTPCache(str(tmp_path / 'http_cache.db'), ttl=0)
+    with DBManager(str(tmp_path / 'corpus.db')) as db:
+        scraper = ContentScraper(db, http_cache=cache, domain_memory=DomainMemory(str(tmp_path / 'domains.json')),
+                                 rate_limiter=RateLimiter(enabled=False))
+        url = blog.base_url + blog.slug(1)
+        body, _ = scraper._http_fetch(url)
+        stored = cache.lookup(url)
+        assert stored.etag and stored.last_modified == 'Mon, 01 Jan 2024 07:00:00 GMT'
+
+        again, _ = scraper._http_fetch(url)
+        assert again == body
+        assert blog.counters['not_modified'].value == 1
+        assert blog.counters['requests'].value == 1  # Solo la primera descarga trajo el cuerpo
+        assert cache.lookup(url).stored_at > stored.stored_at
+
+
+def test_conditional_headers_and_freshness(tmp_path):
+    cache = HTTPCache(str(tmp_path / 'http_cache.db'), ttl=60)
+    assert HTTPCache.conditional_headers(None) == {}
+    cache.store('http://blog.test/a', _response(ETag='"v1"', **{'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+    entry = cache.lookup('http://blog.test/a')
+    assert cache.is_fresh(entry)
+    assert HTTPCache.conditional_headers(entry) == {'If-None-Match': '"v1"',
+                                                    'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    cache.revalidated('http://blog.test/a', _response(status=304, ETag='"v2"'))
+    assert cache.lookup('http://blog.test/a').etag == '"v2"'
+
+    cache.store('http://blog.test/error', _response(status=500))
+    assert cache.lookup('http://blog.test/error') is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HTTPCache(str(tmp_path / 'http_cache.db'), ttl=60, max_bytes=250)
+    for name in ('a', 'b'):
+        cache.store(f'http://blog.test/{name}', _response(b'x' * 100))
+        time.sleep(0.01)
+    cache.lookup('http://blog.test/a')  # "a" pasa a ser la más reciente
+    cache.store('http://blog.test/c', _response(b'x' * 100))
+
+    assert cache.lookup('http://blog.test/b') is None
+    assert cache.lookup('http://blog.test/a') and cache.lookup('http://blog.test/c')
+    assert cache.stats()['bytes'] <= 250
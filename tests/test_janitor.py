@@ -0,0 +1,35 @@
+import os
+import time
+
+from backend.janitor import Janitor
+
+
+def _janitor(tmp_path):
+    return Janitor(books_dir=tmp_path / 'books', book_cache_dir=tmp_path / 'books' / 'cache',
+                   db_dir=tmp_path / 'dbs', jobs_dir=tmp_path / 'jobs',
+                   pdf_ttl=3600, session_db_ttl=3600, job_ttl=3600, temp_ttl=60,
+                   disk_budget=1024 * 1024 * 1024)
+
+
+def _age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_orphaned_parallel_render_parts_are_swept_after_temp_ttl(tmp_path):
+    cache_dir = tmp_path / 'books' / 'cache'
+    orphan = cache_dir / 'book_parts_abc123'
+    running = cache_dir / 'book_parts_def456'
+    for directory in (orphan, running):
+        directory.mkdir(parents=True)
+        (directory / 'chapter_0001.pdf').write_bytes(b'x' * 100)
+    _age(orphan / 'chapter_0001.pdf', 120)
+    _age(orphan, 120)
+
+    janitor = _janitor(tmp_path)
+    report = janitor.sweep()
+
+    assert not orphan.exists()
+    assert running.exists()
+    assert report['removed'] == {'temp': 1}
+    assert report['reclaimed_bytes'] == 100
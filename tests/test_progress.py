@@ -0,0 +1,40 @@
+from backend.jobs import JobStore
+from backend.generators import BookGenerator
+from backend.progress import ProgressTracker
+
+
+def _structure(chapters):
+    return {
+        f'Capítulo {number}': {
+            'theory': [{'title': f'Artículo {number}', 'content': 'Texto de prueba. ' * 20}],
+            'practice': [], 'case_study': [], 'quizzes': []
+        }
+        for number in range(1, chapters + 1)
+    }
+
+
+def test_counts_accumulate_and_fields_are_replaced():
+    events = []
+    tracker = ProgressTracker(lambda kind, **data: events.append(data), 'articles', 3, min_interval=0)
+    tracker.advance(counts={'parsed': 1}, title='a')
+    tracker.advance(counts={'skipped': 1}, title='b')
+    tracker.advance(counts={'parsed': 1}, title='c')
+
+    assert [event['title'] for event in events] == ['a', 'b', 'c']
+    assert events[-1]['parsed'] == 2
+    assert events[-1]['skipped'] == 1
+    assert events[-1]['done'] == 3
+
+
+def test_chapter_events_follow_the_chapter_position(tmp_path):
+    store = JobStore(tmp_path / 'jobs')
+    job = store.create(url='http://blog.test/')
+    progress = lambda kind, **data: store.add_event(job['id'], kind, **data)
+    generator = BookGenerator(str(tmp_path / 'libro.pdf'), render_mode='single', progress=progress)
+
+    assert generator.generate_book(_structure(4))
+
+    chapters = [event for _, event in store.events(job['id']) if event['type'] == 'chapters']
+    assert [event['chapter'] for event in chapters] == [1, 2, 3, 4, 4]
+    assert [event['done'] for event in chapters] == [0, 1, 2, 3, 4]
+    assert all(event['total'] == 4 for event in chapters)
@@ -0,0 +1,97 @@
+import pytest
+
+from backend import rate_limit
+from backend.rate_limit import HostBucket, RateLimiter, parse_crawl_delay, parse_retry_after
+
+CONFIG = {'default_rate': 1.0, 'max_rate': 5.0, 'min_rate': 0.05, 'burst': 2.0, 'increase': 0.2,
+          'decrease': 0.5, 'backoff_base': 2.0, 'max_backoff': 120.0, 'robots_ttl': 3600}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj manual: time.monotonic y time.sleep del limitador avanzan solo cuando el test lo pide"""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, 'RATE_LIMIT_CONFIG', CONFIG)
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(rate_limit.time, 'sleep', lambda seconds: now.__setitem__(0, now[0] + seconds))
+    return now
+
+
+def test_healthy_responses_raise_the_rate_additively_up_to_the_maximum(clock):
+    bucket = HostBucket(1.0, 5.0)
+    for _ in range(5):
+        bucket.success()
+    assert bucket.rate == pytest.approx(2.0)
+    for _ in range(100):
+        bucket.success()
+    assert bucket.rate == 5.0
+
+
+def test_throttling_halves_the_rate_and_backs_off_exponentially(clock):
+    bucket = HostBucket(4.0, 5.0)
+    assert bucket.throttled(None) == 2.0
+    assert bucket.rate == 2.0
+    assert bucket.throttled(None) == 4.0
+    assert bucket.rate == 1.0
+    assert bucket.reserve() == pytest.approx(4.0)  # Bloqueado hasta que pase el retroceso
+
+    # Retry-After manda si es mayor, acotado por max_backoff
+    assert bucket.throttled(30.0) == 30.0
+    assert bucket.throttled(600.0) == 120.0
+
+    # Una respuesta sana reinicia el retroceso y vuelve a subir el ritmo poco a poco
+    bucket.success()
+    assert bucket.failures == 0
+    assert bucket.rate == pytest.approx(0.25 + 0.2)
+    assert bucket.throttled(None) == 2.0
+
+
+def test_rate_never_drops_below_the_minimum(clock):
+    bucket = HostBucket(1.0, 5.0)
+    for _ in range(20):
+        bucket.throttled(None)
+    assert bucket.rate == CONFIG['min_rate']
+
+
+def test_crawl_delay_caps_the_rate(clock):
+    bucket = HostBucket(1.0, 5.0, crawl_delay=2)
+    assert bucket.rate == bucket.max_rate == 0.5
+    bucket.success()
+    assert bucket.rate == 0.5
+
+
+def test_limiter_spaces_requests_and_recovers_after_throttling(clock):
+    limiter = RateLimiter()
+    url = 'https://blog.test/post/'
+    waits = [limiter.acquire(url) for _ in range(3)]
+    assert waits == [0.0, pytest.approx(1.0), pytest.approx(1.0)]  # 1 pet/s inicial
+
+    assert limiter.feedback(url, 429, '3') == 3.0
+    assert limiter.stats()['blog.test']['rate'] == 0.5
+    assert limiter.acquire(url) == pytest.approx(3.0)
+
+    for _ in range(5):
+        assert limiter.feedback(url, 200) is None
+    assert limiter.stats()['blog.test'] == {'rate': 1.5, 'crawl_delay': None, 'failures': 0}
+
+
+def test_limiter_reads_crawl_delay_once_per_host(clock):
+    calls = []
+    limiter = RateLimiter()
+    loader = lambda url: calls.append(url) or 4.0
+    limiter.acquire('https://blog.test/a/', loader)
+    limiter.acquire('https://blog.test/b/', loader)
+    assert calls == ['https://blog.test/a/']
+    assert limiter.stats()['blog.test']['crawl_delay'] == 4.0
+
+
+def test_parse_retry_after_and_crawl_delay():
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0  # Fecha pasada
+    assert parse_retry_after('pronto') is None
+    assert parse_crawl_delay(b'User-agent: *\nCrawl-delay: 2.5\n') == 2.5
+    assert parse_crawl_delay(b'User-agent: *\nAllow: /\n') is None
+    robots = (b'User-agent: Googlebot\nUser-agent: Mozilla\nCrawl-delay: 0.5  # nosotros\n\n'
+              b'User-agent: *\nDisallow: /wp-admin/\nCrawl-delay: 10\n')
+    assert parse_crawl_delay(robots, 'Mozilla/5.0 (X11; Linux x86_64)') == 0.5
+    assert parse_crawl_delay(robots, 'otro-bot/1.0') == 10.0
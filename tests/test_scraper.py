@@ -0,0 +1,128 @@
+import pytest
+
+import fake_blog
+from backend.database import DBManager
+from backend.domain_memory import DomainMemory
+from backend.http_cache import HTTPCache
+from backend.rate_limit import RateLimiter
+from backend.scraper import ContentScraper
+
+
+@pytest.fixture
+def blog():
+    site = fake_blog.FakeBlog(posts=6, sitemap=False)  # Sin sitemap: no hay lastmod
+    server = fake_blog.serve(site)
+    yield site
+    server.shutdown()
+
+
+def _scrape(tmp_path, db, base_url):
+    scraper = ContentScraper(
+        db, max_workers=3,
+        http_cache=HTTPCache(str(tmp_path / 'http_cache.db'), ttl=0),
+        domain_memory=DomainMemory(str(tmp_path / 'domains.json')),
+        rate_limiter=RateLimiter(enabled=False),
+    )
+    assert scraper.scrape(base_url)
+    return scraper
+
+
+def _saved(db):
+    return {row.url: row.content for row in db.get_all_articles()}
+
+
+def test_recrawl_without_lastmod_detects_edited_articles(tmp_path, blog):
+    with DBManager(str(tmp_path / 'corpus.db')) as db:
+        first = _scrape(tmp_path, db, blog.base_url + '/')
+        before = _saved(db)
+        assert len(first.article_ids) == 6
+
+        # Sin cambios: se reutilizan los mismos artículos
+        second = _scrape(tmp_path, db, blog.base_url + '/')
+        assert sorted(second.article_ids) == sorted(first.article_ids)
+        assert _saved(db) == before
+
+        # Un artículo editado sin lastmod que lo anuncie
+        original_body = blog.body
+        blog.body = lambda index: original_body(index) + (['Párrafo añadido tras editar el artículo.']
+                                                          if index == 2 else [])
+        third = _scrape(tmp_path, db, blog.base_url + '/')
+        after = _saved(db)
+        assert sorted(third.article_ids) == sorted(first.article_ids)
+        edited = [url for url in after if after[url] != before[url]]
+        assert len(edited) == 1 and edited[0].endswith(blog.slug(2).rstrip('/'))
+        assert 'Párrafo añadido' in after[edited[0]]
+
+
+def test_uncached_fetch_does_not_overwrite_the_cache_entry(tmp_path, blog):
+    with DBManager(str(tmp_path / 'corpus.db')) as db:
+        cache = HTTPCache(str(tmp_path / 'http_cache.db'), ttl=0)
+        scraper = ContentScraper(db, http_cache=cache, domain_memory=DomainMemory(str(tmp_path / 'domains.json')),
+                                 rate_limiter=RateLimiter(enabled=False))
+        url = blog.base_url + blog.slug(0)
+        scraper._http_fetch(url)
+        stored = cache.lookup(url)
+
+        scraper._http_fetch(url, headers={'User-Agent': 'otro'}, use_cache=False, strategy='requests_alt_ua')
+        assert cache.lookup(url).stored_at == stored.stored_at
+
+
+def test_article_order_does_not_depend_on_download_latency(tmp_path):
+    orders = []
+    for name, options in (('rapido', {}), ('lento', {'slow_every': 2, 'slow_ms': 150})):
+        site = fake_blog.FakeBlog(posts=6, sitemap=False)
+        server = fake_blog.serve(site, **options)
+        try:
+            with DBManager(str(tmp_path / f'{name}.db')) as db:
+                scraper = _scrape(tmp_path / name, db, site.base_url + '/')
+                urls = {row.id: row.url.replace(site.base_url, '') for row in db.get_all_articles()}
+                orders.append([urls[article_id] for article_id in scraper.article_ids])
+        finally:
+            server.shutdown()
+
+    assert len(orders[0]) == 6
+    assert orders[0] == orders[1]
+
+
+def test_recrawl_keeps_near_duplicates_out_and_strips_known_boilerplate(tmp_path):
+    site = fake_blog.FakeBlog(posts=8, duplicate_every=5, sitemap=False)  # El post 5 copia el texto del 4
+    server = fake_blog.serve(site)
+    try:
+        with DBManager(str(tmp_path / 'corpus.db')) as db:
+            first = _scrape(tmp_path, db, site.base_url + '/')
+            assert db.count_articles() == 7
+            assert not any(line in content for content in _saved(db).values() for line in fake_blog.BOILERPLATE)
+
+            site.posts = 9  # Un artículo nuevo en el re-crawl
+            second = _scrape(tmp_path, db, site.base_url + '/')
+            saved = _saved(db)
+            assert db.count_articles() == 8
+            assert not any(url.endswith(site.slug(5).rstrip('/')) for url in saved)
+            assert set(first.article_ids) < set(second.article_ids)
+            assert len(second.article_ids) == len(set(second.article_ids)) == 8
+
+            new = next(content for url, content in saved.items() if url.endswith(site.slug(8).rstrip('/')))
+            assert not any(line in new for line in fake_blog.BOILERPLATE)
+    finally:
+        server.shutdown()
+
+
+class _BrokenBrowsers:
+    """Pool de navegadores sin driver disponible"""
+
+    def lease(self):
+        raise RuntimeError('chromedriver no encontrado')
+
+
+def test_failing_remembered_strategy_falls_back_to_the_others(tmp_path, blog):
+    with DBManager(str(tmp_path / 'corpus.db')) as db:
+        domains = DomainMemory(str(tmp_path / 'domains.json'))
+        domain = blog.base_url.split('://', 1)[1]
+        domains.set(domain, 'fetch_strategy', 'selenium')
+        scraper = ContentScraper(db, http_cache=HTTPCache(str(tmp_path / 'http_cache.db'), ttl=0),
+                                 domain_memory=domains, browser_pool=_BrokenBrowsers(),
+                                 rate_limiter=RateLimiter(enabled=False))
+
+        soup = scraper._get_page(blog.base_url + blog.slug(1))
+        assert soup is not None and soup.find('article')
+        assert domains.get(domain, 'fetch_strategy') == 'requests'
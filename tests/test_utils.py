@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import pytest
+
+from backend import utils
+from backend.utils import parse_date
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024/01/05', datetime(2024, 1, 5)),
+    ('2024.01.05', datetime(2024, 1, 5)),
+    ('05/01/2024', datetime(2024, 1, 5)),
+    ('5-1-2024', datetime(2024, 1, 5)),
+    ('2024-01-05T10:30:00+0000', datetime(2024, 1, 5, 10, 30)),
+    ('2024-01-05T10:30:00.123456789+0100', datetime(2024, 1, 5, 9, 30, 0, 123456)),
+    ('20 de enero de 2024', datetime(2024, 1, 20)),
+    ('Fri, 05 Jan 2024 10:30:00 GMT', datetime(2024, 1, 5, 10, 30)),
+])
+def test_parse_date_formats(value, expected):
+    assert parse_date(value) == expected
+
+
+def test_iso_offsets_without_fromisoformat_support(monkeypatch):
+    """En Python < 3.11 fromisoformat rechaza '+0000': dateutil no debe invertir día y mes"""
+    class OldDatetime(datetime):
+        @classmethod
+        def fromisoformat(cls, value):
+            raise ValueError(value)
+
+    monkeypatch.setattr(utils, 'datetime', OldDatetime)
+    parse_date.cache_clear()
+    try:
+        assert parse_date('2024-01-05T10:30:00+0000') == datetime(2024, 1, 5, 10, 30)
+        assert parse_date('2024/01/05') == datetime(2024, 1, 5)
+    finally:
+        parse_date.cache_clear()
+
+
+def test_relative_dates_are_not_invented():
+    assert parse_date('hace 3 días') is None